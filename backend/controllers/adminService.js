@@ -4,11 +4,9 @@
  */
 
 const Admin = require('../models/Admin');
-const { exec } = require('child_process');
 const path = require('path');
-const util = require('util');
 const fs = require('fs');
-const execPromise = util.promisify(exec);
+const { importWorker } = require('../utils/importWorker');
 
 /**
  * Create admin account
@@ -60,7 +58,7 @@ const loginAdmin = async (email, password) => {
  * @access Private (Admin only)
  * @param {Object} req - Express request object
  * @param {Object} req.file - Uploaded file (multer)
- * @param {string} req.file.originalname - Original filename (must be 'teams-stadiums.xlsx', 'stadium-distances.xlsx', or 'souvenirs.xlsx')
+ * @param {string} req.file.originalname - Original filename (must be 'teams-stadiums', 'stadium-distances', or 'souvenirs' with a .xlsx, .csv or .parquet extension)
  * @param {string} req.file.path - Temporary file path
  * @param {Object} res - Express response object
  * @returns {Object} JSON response with success status, message, and import count
@@ -93,58 +91,37 @@ const importFromExcel = async (req, res) => {
         
         // Determine import type from filename
         let importType;
-        let scriptName;
         
         if (filename.includes('teams-stadiums') || filename === 'teams-stadiums.xlsx') {
             importType = 'teams';
-            scriptName = 'import_teams.py';
         } else if (filename.includes('stadium-distances') || filename === 'stadium-distances.xlsx') {
             importType = 'distances';
-            scriptName = 'import_distances.py';
         } else if (filename.includes('souvenirs') || filename === 'souvenirs.xlsx') {
             importType = 'souvenirs';
-            scriptName = 'import_souvenirs.py';
         } else {
             // Clean up uploaded file
             fs.unlinkSync(uploadedFilePath);
             return res.status(400).json({
                 success: false,
-                message: 'Invalid filename. File must be named "teams-stadiums.xlsx", "stadium-distances.xlsx", or "souvenirs.xlsx"'
+                message: 'Invalid filename. File must be named "teams-stadiums", "stadium-distances", or "souvenirs" (.xlsx, .csv or .parquet)'
             });
         }
 
-        // Path to the Python script and virtual environment
+        // Copy uploaded file to scripts directory under a unique name so queued
+        // uploads of the same file never overwrite each other
         const scriptsDir = path.join(__dirname, '..', 'scripts');
-        const scriptPath = path.join(scriptsDir, scriptName);
-        const venvPython = path.join(scriptsDir, 'venv', 'bin', 'python3');
-        
-        // Check if venv Python exists, fallback to system python3
-        let pythonCommand = 'python3';
-        if (fs.existsSync(venvPython)) {
-            pythonCommand = `"${venvPython}"`;
-        }
-        
-        // Copy uploaded file to scripts directory (Python script expects it there)
-        targetFilePath = path.join(scriptsDir, filename);
+        targetFilePath = path.join(scriptsDir, `${path.basename(uploadedFilePath)}-${path.basename(filename)}`);
         fs.copyFileSync(uploadedFilePath, targetFilePath);
         
-        // Execute Python script with file path as argument
-        const command = `cd "${scriptsDir}" && ${pythonCommand} "${scriptPath}" "${targetFilePath}"`;
-        console.log('Executing command:', command);
-
-        // Pass environment variables to Python script
-        const env = {
-            ...process.env, // Include all existing environment variables
-            MONGODB_URI: process.env.MONGODB_URI || 'mongodb://localhost:27017/'
-        };
-
-        const { stdout, stderr } = await execPromise(
-            command,
-            { 
-                maxBuffer: 1024 * 1024 * 10, // 10MB buffer
-                env: env // Pass environment variables
-            }
-        );
+        // Run the import in the warm Python worker (queued behind earlier uploads).
+        // Souvenirs are synced in place so ids referenced by carts and purchases survive;
+        // re-uploading a distances file whose import failed continues from its checkpoint
+        console.log(`Queueing ${importType} import:`, targetFilePath);
+        const options = importType === 'souvenirs' ? { sync: true }
+            : importType === 'distances' ? { resume: true } : {};
+        const result = await importWorker.run(importType, targetFilePath, options);
+        const stdout = result.output;
+        const stderr = result.errors;
 
         // Clean up uploaded file
         if (fs.existsSync(uploadedFilePath)) {
@@ -156,6 +133,18 @@ const importFromExcel = async (req, res) => {
             fs.unlinkSync(targetFilePath);
         }
 
+        // The importer's summary record reports rows that failed to write even
+        // when the import itself ran to completion
+        const summary = result.summary;
+        if (!result.success || (summary && !summary.success)) {
+            console.error('Python import failed:', stderr || stdout);
+            return res.status(500).json({
+                success: false,
+                message: `Error importing ${importType} from Excel`,
+                error: stderr || stdout
+            });
+        }
+
         if (stderr && !stderr.includes('Warning') && stderr.trim()) {
             console.error('Python script stderr:', stderr);
             return res.status(500).json({
@@ -165,15 +154,21 @@ const importFromExcel = async (req, res) => {
             });
         }
 
-        // Extract count from stdout if available
-        const countMatch = stdout.match(/(\d+)\s+(teams|distances|records|souvenirs)/i);
-        const importedCount = countMatch ? parseInt(countMatch[1]) : null;
+        // Exact counts come from the importer's summary record; older output falls back to the text
+        let importedCount = null;
+        if (summary) {
+            importedCount = (summary.inserted || 0) + (summary.updated || 0);
+        } else {
+            const countMatch = stdout.match(/(\d+)\s+(teams|distances|records|souvenirs)/i);
+            importedCount = countMatch ? parseInt(countMatch[1]) : null;
+        }
 
         res.status(200).json({
             success: true,
             message: `Successfully imported ${importType} from Excel`,
             output: stdout,
             importedCount: importedCount,
+            summary: summary || null,
             type: importType
         });
     } catch (error) {
@@ -195,6 +190,14 @@ const importFromExcel = async (req, res) => {
             }
         }
         
+        if (error.code === 'IMPORT_QUEUE_FULL') {
+            return res.status(503).json({
+                success: false,
+                message: 'Too many imports in progress, please try again shortly',
+                error: error.message
+            });
+        }
+        
         console.error('Import error:', error);
         res.status(500).json({
             success: false,
@@ -5,6 +5,7 @@
 
 const Team = require('../models/Team');
 const { GraphService } = require('../models/Graph');
+const { PrecomputedPaths } = require('../utils/shortestPaths');
 const mongoose = require('mongoose');
 
 /**
@@ -19,6 +20,152 @@ const getTeamFromStadium = (stadiumName, teams) => {
     return team ? team.teamName : null;
 };
 
+/**
+ * Shortest paths for a route: the matrices precomputed by
+ * scripts/shortest_paths.py when they match the current teams and distances,
+ * otherwise a GraphService built from the live collections
+ * @param {Array<Object>} teams - Every team
+ * @param {Array<string>} sources - Teams the route will run Dijkstra from
+ * @returns {Promise<{runDijkstra: Function}>} Object answering runDijkstra(start, end)
+ * @private
+ */
+const loadShortestPaths = async (teams, sources) => {
+    const db = mongoose.connection.db;
+    const precomputed = await PrecomputedPaths.load(db, sources);
+    if (precomputed) {
+        return precomputed;
+    }
+
+    const distances = await db.collection('distances').find({}).toArray();
+    const graphEdges = distances.map(dist => {
+        const toTeam = getTeamFromStadium(dist.endingStadium, teams);
+        return {
+            from: dist.teamName,
+            to: toTeam,
+            distance: dist.distance
+        };
+    }).filter(edge => edge.to !== null);
+    return new GraphService(teams, graphEdges);
+};
+
+/**
+ * Looks up a trip precomputed by scripts/optimal_trips.py (Held-Karp)
+ * @param {Array<string>} teamNames - Teams the trip must visit
+ * @param {string} startTeam - Team the trip starts from
+ * @returns {Promise<Object|null>} Stored trip, or null when this set of teams was not precomputed
+ * @private
+ */
+const findOptimalTrip = (teamNames, startTeam) => {
+    const setKey = [...teamNames].sort().join('|');
+    return mongoose.connection.db
+        .collection('optimal_trips')
+        .findOne({ setKey, startTeam });
+};
+
+// Limits shared with scripts/optimal_trips.py, which re-solves every saved
+// itinerary after each import (MAX_ITINERARY_SIZE, MAX_SAVED_ITINERARIES)
+const MAX_ITINERARY_SIZE = 16;
+const MAX_SAVED_ITINERARIES = 50;
+// Saved itineraries not saved again within this many days expire
+const SAVED_ITINERARY_TTL_DAYS = 90;
+
+let itineraryIndexes = null;
+
+/**
+ * Stores a saved itinerary and trims the collection to the newest
+ * MAX_SAVED_ITINERARIES; runs after the response has been sent
+ * @param {Array<string>} teams - Sorted team names
+ * @param {string} [name] - Label chosen by the user
+ * @returns {Promise<void>}
+ * @private
+ */
+const storeItinerary = async (teams, name) => {
+    const itineraries = mongoose.connection.db.collection('saved_itineraries');
+    if (!itineraryIndexes) {
+        itineraryIndexes = Promise.all([
+            itineraries.createIndex({ setKey: 1 }, { unique: true }),
+            itineraries.createIndex({ savedAt: 1 }, { expireAfterSeconds: SAVED_ITINERARY_TTL_DAYS * 24 * 60 * 60 })
+        ]).catch(error => {
+            itineraryIndexes = null;
+            throw error;
+        });
+    }
+    await itineraryIndexes;
+
+    const update = { teams, savedAt: new Date() };
+    if (name) {
+        update.name = name;
+    }
+    await itineraries.updateOne({ setKey: teams.join('|') }, { $set: update }, { upsert: true });
+
+    const overflow = await itineraries
+        .find({}, { projection: { _id: 1 } })
+        .sort({ savedAt: -1 })
+        .skip(MAX_SAVED_ITINERARIES)
+        .toArray();
+    if (overflow.length > 0) {
+        await itineraries.deleteMany({ _id: { $in: overflow.map(doc => doc._id) } });
+    }
+};
+
+/**
+ * Save an itinerary
+ * Saves a set of teams so the optimal-trip precomputation solves it after the
+ * next import. The request is acknowledged before the write completes
+ * 
+ * @route POST /api/itineraries
+ * @param {Object} req - Express request object
+ * @param {Object} req.body - Request body
+ * @param {Array<string>} req.body.teamIds - IDs of the teams to visit
+ * @param {string} [req.body.name] - Label for the itinerary
+ * @param {Object} res - Express response object
+ * @returns {Object} JSON response with success status and the saved set of teams
+ * @example
+ * // Request: POST /api/itineraries
+ * // Body: { teamIds: ['id1', 'id2', 'id3'], name: 'Road trip' }
+ * // Response (202):
+ * {
+ *   success: true,
+ *   data: { setKey: 'Team1|Team2|Team3', teams: ['Team1', 'Team2', 'Team3'] }
+ * }
+ */
+const saveItinerary = async (req, res) => {
+    try {
+        const { teamIds, name } = req.body || {};
+        if (!Array.isArray(teamIds)) {
+            return res.status(400).json({
+                success: false,
+                error: 'Please provide the teams of the itinerary.'
+            });
+        }
+
+        const ids = teamIds.filter(id => mongoose.isValidObjectId(id));
+        const teams = await Team.find({ _id: { $in: ids } }, { teamName: 1 }).lean();
+        const teamNames = [...new Set(teams.map(team => team.teamName))].sort();
+        if (teamNames.length < 2 || teamNames.length > MAX_ITINERARY_SIZE) {
+            return res.status(400).json({
+                success: false,
+                error: `An itinerary needs between 2 and ${MAX_ITINERARY_SIZE} teams.`
+            });
+        }
+
+        res.status(202).json({
+            success: true,
+            data: { setKey: teamNames.join('|'), teams: teamNames }
+        });
+
+        storeItinerary(teamNames, typeof name === 'string' ? name.trim() : undefined).catch(error => {
+            console.error('Error saving itinerary:', error);
+        });
+    } catch (error) {
+        console.error('Save Itinerary Error:', error);
+        res.status(500).json({
+            success: false,
+            error: error.message
+        });
+    }
+};
+
 /**
  * Calculate custom route
  * Calculates optimal route between multiple teams using Dijkstra's algorithm
@@ -56,10 +203,6 @@ const calculateCustomRoute = async (req, res) => {
         }
 
         const teams = await Team.find({}).lean();
-        const distances = await mongoose.connection.db
-            .collection('distances')
-            .find({})
-            .toArray();
 
         // Build team lookup using Map
         const teamById = new Map();
@@ -67,18 +210,9 @@ const calculateCustomRoute = async (req, res) => {
             teamById.set(team._id.toString(), team);
         });
 
-        // Transform distances into edges format for GraphService
-        const graphEdges = distances.map(dist => {
-            const toTeam = getTeamFromStadium(dist.endingStadium, teams);
-            return {
-                from: dist.teamName,
-                to: toTeam,
-                distance: dist.distance
-            };
-        }).filter(edge => edge.to !== null);
-
-        // Create graph service
-        const graphService = new GraphService(teams, graphEdges);
+        // Every segment starts at a selected team
+        const sources = teamIds.map(id => teamById.get(id)?.teamName).filter(Boolean);
+        const graphService = await loadShortestPaths(teams, sources);
 
         let totalDistance = 0;
         const route = [];
@@ -134,25 +268,8 @@ const calculateCustomRoute = async (req, res) => {
 
                 totalDistance += segmentDistance;
 
-                // Build edges for this segment
-                for (let j = 0; j < path.length - 1; j++) {
-                    const fromTeam = path[j];
-                    const toTeam = path[j + 1];
-                    
-                    // Find the distance for this edge
-                    const edgeDistance = graphEdges.find(e => 
-                        (e.from === fromTeam && e.to === toTeam) ||
-                        (e.from === toTeam && e.to === fromTeam)
-                    )?.distance;
-
-                    if (edgeDistance) {
-                        routeEdges.push({
-                            from: fromTeam,
-                            to: toTeam,
-                            distance: edgeDistance
-                        });
-                    }
-                }
+                // Edges of this segment, with the distances Dijkstra used
+                routeEdges.push(...dijkstraResult.discoveryEdges);
 
             } catch (error) {
                 return res.status(400).json({
@@ -185,6 +302,8 @@ const calculateCustomRoute = async (req, res) => {
  * Calculate recursive route
  * Calculates a route visiting all teams starting from New England Patriots
  * Uses greedy approach: always visits the closest unvisited team
+ * Selections matching a precomputed set (division, conference, saved itinerary)
+ * return the exact optimal trip instead (algorithm 'HELD_KARP_PRECOMPUTED')
  * 
  * @route POST /api/recursive
  * @param {Object} req - Express request object
@@ -208,29 +327,6 @@ const calculateRecursiveRoute = async (req, res) => {
         const { teamIds } = req.body || {}; // Handle undefined req.body
         
         const teams = await Team.find({}).lean();
-        const distances = await mongoose.connection.db
-            .collection('distances')
-            .find({})
-            .toArray();
-
-        // Build team lookup using Map
-        const teamById = new Map();
-        teams.forEach(team => {
-            teamById.set(team._id.toString(), team);
-        });
-
-        // Transform distances into edges format for GraphService
-        const graphEdges = distances.map(dist => {
-            const toTeam = getTeamFromStadium(dist.endingStadium, teams);
-            return {
-                from: dist.teamName,
-                to: toTeam,
-                distance: dist.distance
-            };
-        }).filter(edge => edge.to !== null);
-
-        // Create graph service
-        const graphService = new GraphService(teams, graphEdges);
 
         // Filter teams if teamIds provided, otherwise use all teams
         const teamsToVisit = teamIds && teamIds.length > 0
@@ -248,6 +344,31 @@ const calculateRecursiveRoute = async (req, res) => {
         const startTeam = teamIds && teamIds.length > 0 && teamsToVisit.length > 0
             ? teamsToVisit[0].teamName
             : 'New England Patriots';
+
+        // Divisions, conferences and saved itineraries have an exact optimal trip
+        // precomputed after each distance import; serve it without touching the graph
+        if (teamIds && teamIds.length > 0) {
+            const optimalTrip = await findOptimalTrip(teamsToVisit.map(team => team.teamName), startTeam);
+            if (optimalTrip) {
+                return res.json({
+                    success: true,
+                    data: {
+                        algorithm: 'HELD_KARP_PRECOMPUTED',
+                        startTeam: startTeam,
+                        route: optimalTrip.route,
+                        edges: optimalTrip.edges,
+                        totalDistance: optimalTrip.totalDistance,
+                        teamCount: optimalTrip.route.length
+                    }
+                });
+            }
+        }
+
+        // Dijkstra runs from the start team and from each selected team reached
+        const graphService = await loadShortestPaths(
+            teams,
+            [startTeam, ...teamsToVisit.map(team => team.teamName)]
+        );
         
         // Track visited teams to avoid cycles
         const visited = new Set([startTeam]);
@@ -292,23 +413,13 @@ const calculateRecursiveRoute = async (req, res) => {
             // When teamIds is not provided (Optimal trip), this will include all teams
             const selectedTeamNames = new Set(teamsToVisit.map(t => t.teamName));
             
-            // Add ALL edges from the Dijkstra path (including through visited cities)
-            for (let i = 0; i < path.length - 1; i++) {
-                const fromTeam = path[i];
-                const toTeam = path[i + 1];
-                
-                // Find edge distance
-                const edgeDistance = graphEdges.find(e => 
-                    (e.from === fromTeam && e.to === toTeam) ||
-                    (e.from === toTeam && e.to === fromTeam)
-                )?.distance;
-
-                if (edgeDistance) {
-                    routeEdges.push({
-                        from: fromTeam,
-                        to: toTeam,
-                        distance: edgeDistance
-                    });
+            // Add ALL edges from the Dijkstra path (including through visited cities);
+            // each team's discovery edge is the one from its predecessor on the path
+            const edgeInto = new Map(dijkstraResult.discoveryEdges.map(edge => [edge.to, edge]));
+            for (let i = 1; i < path.length; i++) {
+                const edge = edgeInto.get(path[i]);
+                if (edge) {
+                    routeEdges.push(edge);
                 }
             }
             
@@ -357,5 +468,6 @@ const calculateRecursiveRoute = async (req, res) => {
 
 module.exports = {
     calculateCustomRoute,
-    calculateRecursiveRoute
+    calculateRecursiveRoute,
+    saveItinerary
 };
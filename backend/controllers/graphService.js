@@ -13,6 +13,7 @@
 
 const { GraphService } = require('../models/Graph');
 const Team = require('../models/Team');
+const { PrecomputedPaths } = require('../utils/shortestPaths');
 const mongoose = require('mongoose');
 
 /**
@@ -152,7 +153,8 @@ const runBFS = async (req, res) => {
 
 /**
  * Run Dijkstra's shortest path algorithm
- * Finds shortest paths from start team to all teams or specific end team
+ * Finds shortest paths from start team to all teams or specific end team,
+ * read from the matrices precomputed after each import when they are current
  * 
  * @route GET /api/dijkstra
  * @param {Object} req - Express request object
@@ -186,6 +188,20 @@ const runDijkstra = async (req, res) => {
             detailed = false
         } = req.query;
 
+        // Answer from the precomputed all-pairs matrices while they match the
+        // current teams and distances; the detailed view needs the live graph
+        const precomputed = detailed !== 'true'
+            ? await PrecomputedPaths.load(mongoose.connection.db, [startTeam])
+            : null;
+        if (precomputed) {
+            return res.json({
+                success: true,
+                algorithm: 'Dijkstra',
+                timestamp: new Date().toISOString(),
+                data: precomputed.runDijkstra(startTeam, endTeam)
+            });
+        }
+
         // Fetch teams and distances from database
         const teams = await Team.find({}).lean();
         const distances = await mongoose.connection.db
@@ -5,8 +5,16 @@
 
 const Purchase = require('../models/Purchase');
 const Team = require('../models/Team');
+const mongoose = require('mongoose');
 const { v4: uuidv4 } = require('uuid');
 
+// Maintained by scripts/purchase_rollups.py
+const ROLLUPS_COLLECTION = 'purchase_rollups';
+const ROLLUP_STATE_COLLECTION = 'purchase_rollup_state';
+// Reads that overlap a rollup run are retried this many times before
+// summarizeSession falls back to scanning the session's purchases
+const MAX_SNAPSHOT_ATTEMPTS = 3;
+
 /**
  * Generate or get session ID from request
  * Checks headers first, then body, then generates new UUID
@@ -387,6 +395,84 @@ const getPurchaseHistory = async (req, res) => {
   }
 };
 
+/**
+ * Read a session's rollup rows and the purchases completed after the watermark
+ * as one consistent snapshot
+ * The rollup state is read before and after; if a rollup run started or
+ * finished in between, the rows and the watermark may not match, so the read
+ * is retried. Returns null while a run is mid-write or has never finished
+ * 
+ * @param {string} sessionId - Session ID
+ * @returns {Promise<{rows: Array<Object>, recent: Array<Object>}|null>} Rollup rows and newer purchases
+ * @private
+ */
+const readRollupSnapshot = async (sessionId) => {
+  const db = mongoose.connection.db;
+  const states = db.collection(ROLLUP_STATE_COLLECTION);
+
+  for (let attempt = 0; attempt < MAX_SNAPSHOT_ATTEMPTS; attempt++) {
+    const state = await states.findOne({ _id: 'purchases' });
+    // A pending window means the job is mid-write (or rebuilding)
+    if (!state || !state.watermark || state.pending) {
+      return null;
+    }
+
+    const rows = await db.collection(ROLLUPS_COLLECTION)
+      .find({ sessionId, dimension: 'total' })
+      .toArray();
+    const recent = await Purchase.find({
+      sessionId,
+      status: 'completed',
+      purchaseDate: { $gt: state.watermark }
+    });
+
+    const after = await states.findOne({ _id: 'purchases' });
+    if (after && !after.pending && after.watermark &&
+        after.watermark.getTime() === state.watermark.getTime()) {
+      return { rows, recent };
+    }
+  }
+  return null;
+};
+
+/**
+ * Summarize a session's completed purchases
+ * Starts from the pre-aggregated rollups (when the rollup job has run) and
+ * folds in only the purchases completed after its watermark; without a
+ * consistent rollup snapshot every completed purchase is read directly
+ * 
+ * @param {string} sessionId - Session ID
+ * @returns {Promise<Object>} Grand total, item count and purchase count
+ * @private
+ */
+const summarizeSession = async (sessionId) => {
+  const summary = {
+    grandTotal: 0,
+    totalItems: 0,
+    purchaseCount: 0
+  };
+
+  const snapshot = await readRollupSnapshot(sessionId);
+  const rows = snapshot ? snapshot.rows : [];
+  const recent = snapshot ? snapshot.recent : await Purchase.find({ sessionId, status: 'completed' });
+
+  rows.forEach(row => {
+    summary.grandTotal += row.revenue;
+    summary.totalItems += row.quantity;
+    summary.purchaseCount += row.purchases || 0;
+  });
+
+  recent.forEach(purchase => {
+    summary.grandTotal += purchase.totalAmount;
+    summary.purchaseCount += 1;
+    purchase.items.forEach(item => {
+      summary.totalItems += item.quantity;
+    });
+  });
+
+  return summary;
+};
+
 /**
  * Get spending summary by stadium
  * Calculates total spending grouped by stadium for a session
@@ -409,6 +495,8 @@ const getSpendingByStadium = async (req, res) => {
       });
     }
 
+    // Each line item is listed with its own price, so this reads the
+    // session's purchases rather than the per-souvenir rollups
     const purchases = await Purchase.find({ 
       sessionId, 
       status: 'completed' 
@@ -478,30 +566,14 @@ const getGrandTotal = async (req, res) => {
       });
     }
 
-    const purchases = await Purchase.find({ 
-      sessionId, 
-      status: 'completed' 
-    });
-
-    const grandTotal = purchases.reduce(
-      (sum, purchase) => sum + purchase.totalAmount, 
-      0
-    );
-
-    const totalItems = purchases.reduce(
-      (sum, purchase) => sum + purchase.items.reduce(
-        (itemSum, item) => itemSum + item.quantity, 
-        0
-      ), 
-      0
-    );
+    const { grandTotal, totalItems, purchaseCount } = await summarizeSession(sessionId);
 
     res.status(200).json({
       success: true,
       data: {
         grandTotal,
         totalItems,
-        purchaseCount: purchases.length
+        purchaseCount
       }
     });
   } catch (error) {
@@ -581,6 +653,25 @@ const clearAllPurchases = async (req, res) => {
     // Delete all purchases (both pending and completed) for this session
     const result = await Purchase.deleteMany({ sessionId });
 
+    // Take the session's rolled-up totals back out of the all-sessions rows
+    const rollups = mongoose.connection.db.collection(ROLLUPS_COLLECTION);
+    const rows = await rollups.find({ sessionId }).toArray();
+    if (rows.length > 0) {
+      await rollups.bulkWrite(rows.map(row => ({
+        updateOne: {
+          filter: { sessionId: null, dimension: row.dimension, key: row.key },
+          update: {
+            $inc: {
+              quantity: -row.quantity,
+              revenue: -row.revenue,
+              ...(row.purchases ? { purchases: -row.purchases } : {})
+            }
+          }
+        }
+      })), { ordered: false });
+      await rollups.deleteMany({ sessionId });
+    }
+
     res.status(200).json({
       success: true,
       message: 'All purchase data cleared',
@@ -19,18 +19,21 @@ const storage = multer.diskStorage({
   }
 });
 
-// File filter - only accept .xlsx files
+// File filter - only accept .xlsx, .csv and .parquet files
+const validExtensions = ['.xlsx', '.csv', '.parquet'];
 const fileFilter = (req, file, cb) => {
   const ext = path.extname(file.originalname).toLowerCase();
   const validMimeTypes = [
     'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-    'application/octet-stream' // Some browsers send this for .xlsx
+    'text/csv',
+    'application/vnd.apache.parquet',
+    'application/octet-stream' // Some browsers send this for .xlsx and .parquet
   ];
   
-   if (ext === '.xlsx' || validMimeTypes.includes(file.mimetype)) {
+   if (validExtensions.includes(ext) || validMimeTypes.includes(file.mimetype)) {
     cb(null, true);
   } else {
-    cb(new Error('Only .xlsx files are allowed'), false);
+    cb(new Error('Only .xlsx, .csv and .parquet files are allowed'), false);
   }
 };
 
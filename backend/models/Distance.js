@@ -29,6 +29,7 @@ const distanceSchema = new mongoose.Schema({
 distanceSchema.index({ teamName: 1 });
 distanceSchema.index({ beginningStadium: 1 });
 distanceSchema.index({ endingStadium: 1 });
-distanceSchema.index({ beginningStadium: 1, endingStadium: 1 });
+// Teams share stadiums, so one stadium pair can appear once per team
+distanceSchema.index({ teamName: 1, beginningStadium: 1, endingStadium: 1 }, { unique: true });
 
 module.exports = mongoose.model('Distance', distanceSchema);
\ No newline at end of file
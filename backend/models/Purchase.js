@@ -61,5 +61,7 @@ const purchaseSchema = new mongoose.Schema({
 // Indexes for better performance
 purchaseSchema.index({ sessionId: 1, purchaseDate: -1 });
 purchaseSchema.index({ 'items.stadiumName': 1 });
+// Watermark scans of scripts/purchase_rollups.py
+purchaseSchema.index({ status: 1, purchaseDate: 1 });
 
 module.exports = mongoose.model('Purchase', purchaseSchema);
\ No newline at end of file
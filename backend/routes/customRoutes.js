@@ -2,13 +2,15 @@ const Team = require('../models/Team');
 const express = require('express');
 const {
     calculateCustomRoute,
-    calculateRecursiveRoute
+    calculateRecursiveRoute,
+    saveItinerary
 } = require('../controllers/customRouteService');
 
 const router = express.Router();
 
 router.post('/custom-route', calculateCustomRoute);
 router.post('/recursive', calculateRecursiveRoute);
+router.post('/itineraries', saveItinerary);
 
 module.exports = router;
 
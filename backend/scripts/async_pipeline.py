@@ -0,0 +1,161 @@
+"""Opt-in asyncio import engine: one parser producer, several concurrent writers.
+
+The producer runs the (blocking) parse -> validate -> resolve generator in a
+thread and hands each batch to the writer coroutines through bounded queues,
+so Mongo writes overlap with parsing of the next rows. A full queue makes the
+producer wait, which caps the number of batches held in memory at
+``writers * (queue_size + 1)``.
+
+Rows are routed to a writer by key hash, so every row for a given key goes
+through the same writer in sheet order and the last row still wins.
+"""
+import asyncio
+import os
+import time
+from bulk_writer import BulkUpsertWriter, DEFAULT_BATCH_SIZE
+from pymongo.errors import BulkWriteError
+
+DEFAULT_ASYNC_WRITERS = 4
+DEFAULT_QUEUE_SIZE = 4
+
+
+def async_client():
+    # pymongo's native asyncio client (4.10+); only needed when --async is used
+    try:
+        from pymongo import AsyncMongoClient
+    except ImportError:
+        raise RuntimeError("--async needs pymongo>=4.10 (AsyncMongoClient); upgrade pymongo or drop --async")
+    return AsyncMongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+
+
+class AsyncBulkUpsertWriter(BulkUpsertWriter):
+    """BulkUpsertWriter whose flushes are awaited on an async collection."""
+
+    async def add(self, doc):
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+        key = self.key_for(doc)
+        if key in self.pending:
+            self.stats["duplicates"] += 1
+        self.pending[key] = doc
+        self.stats["received"] += 1
+
+        if len(self.pending) + len(self.pending_deletes) >= self.batch_size:
+            await self.flush()
+
+    async def delete(self, key):
+        self.pending_deletes.append(tuple(key))
+        if len(self.pending) + len(self.pending_deletes) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self.pending and not self.pending_deletes:
+            return
+
+        operations = self._take_operations()
+        flush_started = time.perf_counter()
+        try:
+            self._record_result(await self.collection.bulk_write(operations, ordered=False))
+        except BulkWriteError as e:
+            self._record_bulk_error(e)
+        finally:
+            self.stats["round_trips"] += 1
+            self.stats["write_seconds"] += time.perf_counter() - flush_started
+
+    async def close(self):
+        await self.flush()
+        self.finished_at = time.perf_counter()
+        return self.stats
+
+
+class AsyncImportPipeline:
+    """Feeds batches of documents from a blocking iterator to concurrent async writers."""
+
+    def __init__(self, collection, key_fields, writers=DEFAULT_ASYNC_WRITERS, queue_size=DEFAULT_QUEUE_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE):
+        self.writers = [
+            AsyncBulkUpsertWriter(collection, key_fields, batch_size=batch_size)
+            for _ in range(max(1, int(writers)))
+        ]
+        self.queue_size = max(1, int(queue_size))
+        self.failure = None
+
+    async def run(self, batches, removed_keys=None):
+        """Write every document yielded by ``batches`` (lists of docs).
+
+        ``removed_keys`` is called once the last batch has been produced and
+        returns the keys to delete (e.g. ``ImportManifest.removed_keys``).
+        """
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.writers]
+        tasks = [
+            asyncio.create_task(self._consume(writer, queue))
+            for writer, queue in zip(self.writers, queues)
+        ]
+        iterator = iter(batches)
+        done = object()
+        try:
+            while self.failure is None:
+                # Parsing is blocking pandas/openpyxl work, so it runs off the event loop
+                batch = await asyncio.to_thread(next, iterator, done)
+                if batch is done:
+                    break
+                await self._route(queues, [("add", doc) for doc in batch])
+            if self.failure is None and removed_keys is not None:
+                await self._route(queues, [("delete", tuple(key)) for key in removed_keys()])
+        finally:
+            for queue in queues:
+                await queue.put(None)
+            await asyncio.gather(*tasks)
+
+        if self.failure is not None:
+            raise self.failure
+        return self.writers
+
+    async def _route(self, queues, items):
+        parts = [[] for _ in queues]
+        for action, value in items:
+            key = self.writers[0].key_for(value) if action == "add" else value
+            parts[hash(key) % len(queues)].append((action, value))
+        for queue, part in zip(queues, parts):
+            if part:
+                # Blocks while that writer is behind: this is the backpressure
+                await queue.put(part)
+
+    async def _consume(self, writer, queue):
+        while True:
+            part = await queue.get()
+            if part is None:
+                break
+            if self.failure is not None:
+                # Keep draining so the producer never blocks on a dead writer
+                continue
+            try:
+                for action, value in part:
+                    if action == "add":
+                        await writer.add(value)
+                    else:
+                        await writer.delete(value)
+            except Exception as e:
+                self.failure = e
+        if self.failure is None:
+            try:
+                await writer.close()
+            except Exception as e:
+                self.failure = e
+
+
+def run_async_import(collection_name, db_name, key_fields, batches, removed_keys=None, writers=DEFAULT_ASYNC_WRITERS,
+                     queue_size=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE, client_factory=async_client):
+    """Run one pipeline on a fresh AsyncMongoClient and return its writers (for their stats)."""
+    async def main():
+        client = client_factory()
+        try:
+            collection = client[db_name][collection_name]
+            pipeline = AsyncImportPipeline(collection, key_fields, writers=writers, queue_size=queue_size,
+                                           batch_size=batch_size)
+            return await pipeline.run(batches, removed_keys)
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
@@ -0,0 +1,258 @@
+"""Benchmark the importers on synthetic workbooks.
+
+Every case runs in its own Python process against a scratch database
+(``nfl-vacation-benchmark``), either on a real ``mongod`` (``--backend mongod``,
+uses MONGODB_URI) or on an in-process mongomock stand-in (``--backend memory``).
+Wall time, importer phase timings, round trips and peak RSS are written to a
+JSON results file; ``--compare`` diffs a run against an earlier results file
+and exits non-zero when a case regressed.
+
+mongomock makes each upsert O(n) in the collection size, so the memory
+backend is only meant for the small and medium presets.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from synthetic_workbooks import DEFAULT_SEED, generate_suite
+
+BENCHMARK_DB = 'nfl-vacation-benchmark'
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_DIR = os.path.join(SCRIPTS_DIR, 'benchmark_results')
+DEFAULT_THRESHOLD = 0.10
+
+PRESETS = {
+    'small': {'teams': 32, 'edges': 1_000, 'sheets': 2},
+    'medium': {'teams': 500, 'edges': 50_000, 'sheets': 4},
+    'large': {'teams': 5_000, 'edges': 1_000_000, 'sheets': 8},
+}
+
+# (case name, importer, importer options)
+CASES = [
+    ('teams', 'teams', {}),
+    ('distances', 'distances', {}),
+    ('distances-stream', 'distances', {'stream': True}),
+    ('distances-parallel', 'distances', {'workers': 4}),
+    ('souvenirs', 'souvenirs', {}),
+]
+# The post-import precomputations (shortest paths, optimal trips) are not
+# part of what the cases measure, in the case itself or in its setup
+PRECOMPUTE_OFF = {
+    'teams': {'shortest_paths': False},
+    'distances': {'shortest_paths': False},
+}
+
+
+def connect(backend):
+    if backend == 'memory':
+        try:
+            import mongomock
+        except ImportError:
+            raise SystemExit("❌ --backend memory needs mongomock (pip install mongomock), or use --backend mongod")
+        return mongomock.MongoClient()
+    from pymongo import MongoClient
+    return MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+
+
+def run_case(spec):
+    """Run one measured import inside this process and return its result record."""
+    from import_worker import JOBS, share_connection
+    from progress import ProgressReporter, peak_rss_mb
+
+    client = connect(spec['backend'])
+    for module, _ in JOBS.values():
+        share_connection(module, client, BENCHMARK_DB)
+    client.drop_database(BENCHMARK_DB)
+
+    quiet = open(os.devnull, 'w')
+    with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+        # Distances and souvenirs resolve against teams, so load them first (not measured)
+        for setup_type in spec['setup']:
+            _, function = JOBS[setup_type]
+            function(spec['files'][setup_type], use_cache=False, **PRECOMPUTE_OFF.get(setup_type, {}))
+
+        _, function = JOBS[spec['importer']]
+        progress = ProgressReporter(spec['importer'])
+        started_at = time.perf_counter()
+        try:
+            success = function(spec['files'][spec['importer']], use_cache=False, progress=progress, **spec['options'])
+        except SystemExit as e:
+            success = e.code in (0, None)
+        wall = time.perf_counter() - started_at
+    quiet.close()
+
+    summary = progress.summary_record or {}
+    return {
+        "success": bool(success),
+        "wall": round(wall, 4),
+        "rows": summary.get('rows'),
+        "rowsPerSec": round(summary['rows'] / wall, 1) if summary.get('rows') and wall > 0 else None,
+        "roundTrips": summary.get('roundTrips'),
+        "phases": summary.get('phases', {}),
+        "peakRssMb": peak_rss_mb(),
+        "summary": summary,
+    }
+
+
+def run_case_in_child(spec):
+    # A fresh interpreter per case keeps peak RSS and warm caches from leaking between cases
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', json.dumps(spec)],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return {"success": False, "error": completed.stderr.strip()[-2000:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize_runs(runs):
+    ok = [run for run in runs if run.get('success')]
+    if not ok:
+        return {"success": False, "error": runs[-1].get('error') if runs else None}
+    best = min(ok, key=lambda run: run['wall'])
+    return {
+        "success": len(ok) == len(runs),
+        "wall": round(statistics.median(run['wall'] for run in ok), 4),
+        "wallMin": best['wall'],
+        "rows": best['rows'],
+        "rowsPerSec": best['rowsPerSec'],
+        "roundTrips": best['roundTrips'],
+        "peakRssMb": max(run['peakRssMb'] for run in ok),
+        "phases": best['phases'],
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def environment(backend):
+    versions = {}
+    for name in ('pandas', 'numpy', 'openpyxl', 'pymongo'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        "backend": backend,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print per-case deltas against ``baseline``; return the names of regressed cases."""
+    previous = {case['name']: case for case in baseline.get('cases', [])}
+    regressions = []
+    print(f"\n📊 Compared with {baseline.get('createdAt')} ({baseline.get('environment', {}).get('commit')}):", flush=True)
+    for case in results['cases']:
+        old = previous.get(case['name'])
+        if not old or not old.get('success') or not case.get('success'):
+            print(f"   •  {case['name']}: no comparable baseline", flush=True)
+            continue
+        wall_change = case['wall'] / old['wall'] - 1 if old['wall'] else 0.0
+        rss_change = case['peakRssMb'] / old['peakRssMb'] - 1 if old['peakRssMb'] else 0.0
+        regressed = (wall_change > threshold or rss_change > threshold
+                     or (case['roundTrips'] or 0) > (old['roundTrips'] or 0))
+        marker = "❌" if regressed else "✅"
+        print(f"   {marker} {case['name']}: wall {old['wall']:.2f}s -> {case['wall']:.2f}s ({wall_change:+.0%}), "
+              f"RSS {old['peakRssMb']:.0f} -> {case['peakRssMb']:.0f} MB ({rss_change:+.0%}), "
+              f"round trips {old['roundTrips']} -> {case['roundTrips']}", flush=True)
+        if regressed:
+            regressions.append(case['name'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the importers on synthetic workbooks")
+    parser.add_argument("--preset", action="append", choices=sorted(PRESETS),
+                        help="Workbook size preset (repeatable, default: small)")
+    parser.add_argument("--teams", type=int, help="Custom size: number of teams")
+    parser.add_argument("--edges", type=int, help="Custom size: number of distance rows")
+    parser.add_argument("--sheets", type=int, default=4, help="Custom size: distance sheets")
+    parser.add_argument("--case", action="append", choices=[name for name, _, _ in CASES],
+                        help="Only run these cases (repeatable, default: all)")
+    parser.add_argument("--backend", choices=['mongod', 'memory'], default='mongod')
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median wall time is reported")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=None, help="Where generated workbooks are kept between runs")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown or memory growth that counts as a regression")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(json.loads(args.child))), flush=True)
+        return 0
+
+    sizes = {name: PRESETS[name] for name in (args.preset or [])}
+    if args.teams:
+        sizes['custom'] = {'teams': args.teams, 'edges': args.edges or args.teams * 30, 'sheets': args.sheets}
+    if not sizes:
+        sizes['small'] = PRESETS['small']
+    cases = [case for case in CASES if not args.case or case[0] in args.case]
+
+    results = {
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(args.backend),
+        "repeat": args.repeat,
+        "cases": [],
+    }
+
+    for size_name, size in sizes.items():
+        print(f"🧪 Generating {size_name} workbooks ({size['teams']} teams, {size['edges']} edges, "
+              f"{size['sheets']} sheets)...", flush=True)
+        started_at = time.perf_counter()
+        files = generate_suite(size['teams'], size['edges'], size['sheets'], seed=args.seed, data_dir=args.data_dir)
+        print(f"   ✅ Ready in {time.perf_counter() - started_at:.1f}s", flush=True)
+
+        for case_name, importer, options in cases:
+            spec = {
+                "backend": args.backend,
+                "importer": importer,
+                "options": {**options, **PRECOMPUTE_OFF.get(importer, {})},
+                "setup": [] if importer == 'teams' else ['teams'],
+                "files": files,
+            }
+            runs = [run_case_in_child(spec) for _ in range(max(1, args.repeat))]
+            record = {"name": f"{size_name}/{case_name}", "size": size, **summarize_runs(runs)}
+            results['cases'].append(record)
+
+            if record['success']:
+                print(f"   ⏱️  {record['name']}: {record['wall']:.2f}s, {record['rowsPerSec'] or 0:.0f} rows/sec, "
+                      f"{record['roundTrips']} round trips, {record['peakRssMb']:.0f} MB peak RSS", flush=True)
+            else:
+                print(f"   ❌ {record['name']} failed: {record.get('error')}", flush=True)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {output}", flush=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) regressed: {', '.join(regressions)}", flush=True)
+            return 1
+    return 0 if all(case['success'] for case in results['cases']) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
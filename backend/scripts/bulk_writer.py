@@ -0,0 +1,162 @@
+import time
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+# Default number of upserts sent per bulk_write round trip
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BulkUpsertWriter:
+    """Buffers documents in memory and writes them as keyed, unordered upserts (and deletes).
+
+    Rows with the same key are deduplicated before they reach MongoDB (the last
+    row wins), and every flush sends at most ``batch_size`` upserts in a single
+    ``bulk_write`` call.
+    """
+
+    def __init__(self, collection, key_fields, batch_size=DEFAULT_BATCH_SIZE):
+        self.collection = collection
+        self.key_fields = tuple(key_fields)
+        self.batch_size = max(1, int(batch_size))
+        self.pending = {}
+        self.pending_deletes = []
+        # Called after each flush for as long as every write has succeeded
+        self.on_flush = None
+        self.started_at = None
+        self.finished_at = None
+        self.stats = {
+            "received": 0,
+            "duplicates": 0,
+            "inserted": 0,
+            "updated": 0,
+            "deleted": 0,
+            "unchanged": 0,
+            "errors": 0,
+            "round_trips": 0,
+            "write_seconds": 0.0,
+        }
+
+    def ensure_unique_index(self):
+        """Create the unique index on the key fields; returns ``False`` when it cannot be enforced.
+
+        The unique index is what makes keyed upserts safe under unordered
+        writes, so callers should not write without it.
+        """
+        try:
+            self.collection.create_index(
+                [(field, ASCENDING) for field in self.key_fields],
+                unique=True
+            )
+            self.stats["round_trips"] += 1
+            return True
+        except OperationFailure as e:
+            self.stats["round_trips"] += 1
+            print(f"❌ Could not create unique index on {', '.join(self.key_fields)}: {e}", flush=True)
+            duplicates = self.count_duplicate_keys()
+            if duplicates:
+                print(f"   {duplicates} key(s) appear in more than one document; remove the duplicates first", flush=True)
+            return False
+
+    def count_duplicate_keys(self):
+        result = list(self.collection.aggregate([
+            {"$group": {"_id": {field: f"${field}" for field in self.key_fields}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+            {"$count": "keys"},
+        ]))
+        self.stats["round_trips"] += 1
+        return result[0]["keys"] if result else 0
+
+    def key_for(self, doc):
+        return tuple(doc[field] for field in self.key_fields)
+
+    def add(self, doc):
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+        key = self.key_for(doc)
+        if key in self.pending:
+            self.stats["duplicates"] += 1
+        self.pending[key] = doc
+        self.stats["received"] += 1
+
+        if len(self.pending) + len(self.pending_deletes) >= self.batch_size:
+            self.flush()
+
+    def delete(self, key):
+        # Queue removal of the document identified by a key tuple
+        self.pending_deletes.append(tuple(key))
+        if len(self.pending) + len(self.pending_deletes) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending and not self.pending_deletes:
+            return
+
+        operations = self._take_operations()
+        flush_started = time.perf_counter()
+        try:
+            self._record_result(self.collection.bulk_write(operations, ordered=False))
+        except BulkWriteError as e:
+            self._record_bulk_error(e)
+        finally:
+            self.stats["round_trips"] += 1
+            self.stats["write_seconds"] += time.perf_counter() - flush_started
+        if self.on_flush is not None and not self.stats["errors"]:
+            self.on_flush()
+
+    def _take_operations(self):
+        # Turn the buffer into bulk_write operations and start a new one
+        operations = []
+        for key, doc in self.pending.items():
+            key_filter = dict(zip(self.key_fields, key))
+            fields = {k: v for k, v in doc.items() if k not in self.key_fields}
+            operations.append(UpdateOne(key_filter, {"$set": fields}, upsert=True))
+        for key in self.pending_deletes:
+            operations.append(DeleteOne(dict(zip(self.key_fields, key))))
+        self.pending = {}
+        self.pending_deletes = []
+        return operations
+
+    def _record_result(self, result):
+        self._record(result.upserted_count, result.matched_count, result.modified_count, result.deleted_count)
+
+    def _record_bulk_error(self, error):
+        details = error.details
+        self._record(
+            details.get("nUpserted", 0),
+            details.get("nMatched", 0),
+            details.get("nModified", 0),
+            details.get("nRemoved", 0)
+        )
+        self.stats["errors"] += len(details.get("writeErrors", []))
+        print(f"⚠️ Bulk write reported {len(details.get('writeErrors', []))} error(s)", flush=True)
+
+    def close(self):
+        self.flush()
+        self.finished_at = time.perf_counter()
+        return self.stats
+
+    def merge(self, other):
+        # Fold the stats of another writer (e.g. one per sheet) into this one
+        for key, value in other.stats.items():
+            self.stats[key] += value
+        if other.started_at is not None:
+            self.started_at = other.started_at if self.started_at is None else min(self.started_at, other.started_at)
+
+    def _record(self, upserted, matched, modified, deleted=0):
+        self.stats["inserted"] += upserted
+        self.stats["updated"] += modified
+        self.stats["deleted"] += deleted
+        self.stats["unchanged"] += matched - modified
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def rows_per_sec(self):
+        elapsed = self.elapsed
+        return self.stats["received"] / elapsed if elapsed > 0 else 0.0
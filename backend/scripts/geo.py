@@ -0,0 +1,167 @@
+"""Great-circle distances between stadiums, computed with NumPy.
+
+Stadium locations come from ``backend/utils/stadiumCoordinates.js`` (the
+``lat``/``lng`` of each team's entry). All pairwise distances are computed
+once as a matrix, and sheet rows are checked by vectorised lookups into it.
+"""
+import os
+import re
+import time
+import numpy as np
+import pandas as pd
+from stadium_resolver import normalize_stadium_name
+
+DEFAULT_COORDINATES_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'utils', 'stadiumCoordinates.js'
+)
+EARTH_RADIUS_MILES = 3958.8
+
+# Road miles per great-circle mile used to estimate a missing distance
+DEFAULT_CIRCUITY = 1.2
+# Rows longer than this many times the great-circle distance are flagged
+DEFAULT_MAX_RATIO = 2.5
+# Rows shorter than the great-circle distance are flagged, with this much
+# slack for rounding in the sheet and in the coordinates
+LOWER_BOUND_SLACK = 0.85
+
+_ENTRY = re.compile(r'"([^"]+)"\s*:\s*\{([^}]*)\}')
+_FIELD = re.compile(r'(\w+)\s*:\s*(-?\d+(?:\.\d+)?)')
+
+
+def load_stadium_coordinates(path=DEFAULT_COORDINATES_PATH):
+    """Return ``(team_names, lat, lng)`` for every team with geographic coordinates."""
+    with open(path) as f:
+        source = f.read()
+    team_names, lat, lng = [], [], []
+    for team_name, body in _ENTRY.findall(source):
+        fields = {name: float(value) for name, value in _FIELD.findall(body)}
+        if 'lat' in fields and 'lng' in fields:
+            team_names.append(team_name)
+            lat.append(fields['lat'])
+            lng.append(fields['lng'])
+    return team_names, np.array(lat, dtype=np.float64), np.array(lng, dtype=np.float64)
+
+
+def haversine_matrix(lat, lng):
+    """All-pairs great-circle distances in miles, as one broadcast operation."""
+    phi = np.radians(lat)
+    lam = np.radians(lng)
+    half_dphi = (phi[:, None] - phi[None, :]) / 2
+    half_dlam = (lam[:, None] - lam[None, :]) / 2
+    a = np.sin(half_dphi) ** 2 + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin(half_dlam) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _normalized(names):
+    # Normalise each distinct stadium name once
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    normalized = np.array([normalize_stadium_name(name) for name in uniques] + [''], dtype=object)
+    return normalized[codes]
+
+
+class GreatCircleIndex:
+    """Maps stadium names to rows of a precomputed great-circle distance matrix."""
+
+    def __init__(self, stadium_teams, coordinates_path=DEFAULT_COORDINATES_PATH):
+        team_names, lat, lng = load_stadium_coordinates(coordinates_path)
+        positions = {team_name: i for i, team_name in enumerate(team_names)}
+        # stadium_teams is the resolver's {normalised stadium name: team name}
+        stadiums = {stadium: positions[team] for stadium, team in stadium_teams.items() if team in positions}
+        self.stadiums = pd.Index(list(stadiums), dtype=object)
+        self.positions = np.array(list(stadiums.values()), dtype=np.intp)
+        self.matrix = haversine_matrix(lat, lng)
+
+    @classmethod
+    def from_resolver(cls, resolver, coordinates_path=DEFAULT_COORDINATES_PATH):
+        index = resolver.index if resolver.index is not None else resolver.load()
+        return cls(index, coordinates_path)
+
+    def __len__(self):
+        return len(self.stadiums)
+
+    def lookup(self, beginning, ending):
+        """Great-circle miles for each (beginning, ending) pair; NaN where a stadium is unknown."""
+        begin = self.stadiums.get_indexer(_normalized(beginning))
+        end = self.stadiums.get_indexer(_normalized(ending))
+        known = (begin >= 0) & (end >= 0)
+        miles = np.full(len(begin), np.nan)
+        miles[known] = self.matrix[self.positions[begin[known]], self.positions[end[known]]]
+        return miles
+
+
+class DistanceCheck:
+    """Fills and flags the Distance column of raw sheet frames before validation.
+
+    Picklable, so parser processes can apply it to the sheets they read.
+    """
+
+    def __init__(self, index, fill=False, flag=False, circuity=DEFAULT_CIRCUITY, max_ratio=DEFAULT_MAX_RATIO):
+        self.index = index
+        self.fill = fill
+        self.flag = flag
+        self.circuity = circuity
+        self.max_ratio = max_ratio
+        self.filled = 0
+        self.flagged = 0
+
+    def __call__(self, frame):
+        """Return ``(frame, filled, flags)`` for one frame.
+
+        With ``fill``, rows whose Distance is missing or <= 0 get
+        ``circuity * great-circle`` miles (rounded). With ``flag``, rows below
+        the great-circle lower bound or above ``max_ratio`` times it are
+        listed as ``{'row': n, 'reason': str}`` (they are still imported).
+        """
+        columns = {str(column).strip(): column for column in frame.columns}
+        if not all(name in columns for name in ('Beginning Stadium', 'Ending Stadium', 'Distance')):
+            return frame, 0, []
+        distance_column = columns['Distance']
+
+        great_circle = self.index.lookup(frame[columns['Beginning Stadium']].to_numpy(),
+                                         frame[columns['Ending Stadium']].to_numpy())
+        miles = pd.to_numeric(frame[distance_column], errors='coerce').to_numpy(dtype=np.float64)
+
+        filled = 0
+        if self.fill:
+            gap = (np.isnan(miles) | (miles <= 0)) & (great_circle > 0)
+            filled = int(gap.sum())
+            if filled:
+                miles = np.where(gap, np.round(great_circle * self.circuity), miles)
+                frame = frame.copy()
+                frame[distance_column] = miles
+
+        flags = []
+        if self.flag:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratio = miles / great_circle
+            suspect = (great_circle > 0) & (miles > 0) & ((ratio < LOWER_BOUND_SLACK) | (ratio > self.max_ratio))
+            flags = [
+                {'row': int(row) + 1,
+                 'reason': f"Distance {distance:g} is {row_ratio:.2f}x the {bound:.0f} mi great-circle distance"}
+                for row, distance, bound, row_ratio in zip(
+                    frame.index[suspect], miles[suspect], great_circle[suspect], ratio[suspect])
+            ]
+        return frame, filled, flags
+
+    def record(self, sheet_name, filled, flags):
+        self.filled += filled
+        self.flagged += len(flags)
+        if filled:
+            print(f"🧭 Filled {filled} missing distances in '{sheet_name}' from great-circle estimates", flush=True)
+        report_flags(flags, sheet_name)
+
+    def apply(self, frame, sheet_name, progress=None):
+        """Check one frame of ``sheet_name`` in this process and report the result."""
+        started_at = time.perf_counter()
+        frame, filled, flags = self(frame)
+        if progress is not None:
+            progress.add('geo', time.perf_counter() - started_at, rows=len(frame), sheet=sheet_name)
+        self.record(sheet_name, filled, flags)
+        return frame
+
+
+def report_flags(flags, sheet_name, limit=20):
+    for flag in flags[:limit]:
+        print(f"🧭 Suspicious row {flag['row']} in '{sheet_name}': {flag['reason']}", flush=True)
+    if len(flags) > limit:
+        print(f"   ... and {len(flags) - limit} more suspicious rows", flush=True)
@@ -0,0 +1,89 @@
+import threading
+from datetime import datetime, timezone
+
+CHECKPOINT_COLLECTION = 'import_checkpoints'
+
+
+class ImportCheckpoint:
+    """How far an import has durably got, so a failed run can be resumed.
+
+    ``import_checkpoints`` holds one document per import type with the hash of
+    the file being imported, the settings that shape its rows and, per sheet,
+    the offset of the last validated row whose write was acknowledged. The
+    offsets only mean something for that exact file and those settings, so
+    any other checkpoint is ignored.
+    """
+
+    def __init__(self, db, import_type, file_hash, settings=None):
+        self.collection = db[CHECKPOINT_COLLECTION]
+        self.import_type = import_type
+        self.file_hash = file_hash
+        self.settings = settings or {}
+        self.offsets = {}
+        self.round_trips = 0
+        self.lock = threading.Lock()
+
+    def load(self):
+        doc = self.collection.find_one({"_id": self.import_type})
+        self.round_trips += 1
+        if doc is not None and doc.get('fileHash') == self.file_hash and doc.get('settings', {}) == self.settings:
+            self.offsets = {entry['sheet']: entry['offset'] for entry in doc.get('sheets', [])}
+        return self
+
+    def reset(self):
+        self.offsets = {}
+        self.collection.delete_one({"_id": self.import_type})
+        self.round_trips += 1
+
+    @property
+    def resumed_rows(self):
+        return sum(self.offsets.values())
+
+    def offset(self, sheet):
+        return self.offsets.get(sheet, 0)
+
+    def commit(self, positions):
+        """Record ``{sheet: offset}`` positions whose rows have all been written."""
+        with self.lock:
+            advanced = False
+            for sheet, offset in positions.items():
+                if offset > self.offsets.get(sheet, 0):
+                    self.offsets[sheet] = offset
+                    advanced = True
+            if not advanced:
+                return
+            # Sheet names may contain dots, so they are stored as values rather than keys
+            self.collection.update_one(
+                {"_id": self.import_type},
+                {"$set": {
+                    "importType": self.import_type,
+                    "fileHash": self.file_hash,
+                    "settings": self.settings,
+                    "sheets": [{"sheet": sheet, "offset": offset} for sheet, offset in self.offsets.items()],
+                    "updatedAt": datetime.now(timezone.utc),
+                }},
+                upsert=True
+            )
+            self.round_trips += 1
+
+    def tracker(self):
+        return CheckpointTracker(self)
+
+
+class CheckpointTracker:
+    """Positions queued into one writer, committed each time that writer flushes.
+
+    Used as the writer's ``on_flush``: every row queued before a flush
+    started went out in it or in an earlier one.
+    """
+
+    def __init__(self, checkpoint):
+        self.checkpoint = checkpoint
+        self.queued = {}
+
+    def queue(self, sheet, offset):
+        self.queued[sheet] = offset
+
+    def __call__(self):
+        if self.queued:
+            self.checkpoint.commit(dict(self.queued))
@@ -1,18 +1,259 @@
-import pandas as pd
-import pymongo
 from pymongo import MongoClient
+import argparse
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from itertools import chain
+from async_pipeline import DEFAULT_ASYNC_WRITERS, DEFAULT_QUEUE_SIZE, run_async_import
+from bulk_writer import BulkUpsertWriter, DEFAULT_BATCH_SIZE
+from geo import DEFAULT_CIRCUITY, DEFAULT_MAX_RATIO, DistanceCheck, GreatCircleIndex
+from import_checkpoint import ImportCheckpoint
+from import_manifest import ImportManifest, file_sha256, sheet_fingerprints
+from parse_cache import ParseCache
+from stadium_resolver import StadiumTeamResolver
+from shortest_paths import SHORTEST_PATHS_COLLECTION, META_ID, precompute_shortest_paths
+from optimal_trips import precompute_optimal_trips
+from parallel_import import DEFAULT_WRITER_THREADS, default_worker_count, iter_parsed_sheets
+from progress import PROGRESS_MODES, ProgressReporter, progress_output
+from validation import iter_validated, missing_columns
+from workbook_reader import iter_sheets, list_sheet_names
 
 # MongoDB connection
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
 client = MongoClient(MONGODB_URI)
 db = client['nfl-vacation']
 distances_collection = db['distances']
+teams_collection = db['teams']
 
-def import_distances(file_path=None):
+# Teams share stadiums (Giants and Jets), so the same stadium pair can
+# appear once per team and the team is part of the key
+DISTANCE_KEY = ("teamName", "beginningStadium", "endingStadium")
+# Unique index on the stadium pair alone, created by earlier importers
+LEGACY_KEY_INDEX = [("beginningStadium", 1), ("endingStadium", 1)]
+
+def resolve_team_names(records, resolver):
+    for distance in records:
+        # If teamName is empty, try to find it from the stadium name
+        # This is a fallback - ideally Team Name should be in the sheet
+        if not distance["teamName"]:
+            distance["teamName"] = resolver.resolve(distance["beginningStadium"]) or "Unknown"
+
+def drop_legacy_key_index():
+    # A unique (beginningStadium, endingStadium) index would reject the second team's row
+    for name, spec in distances_collection.index_information().items():
+        if spec.get('unique') and [tuple(field) for field in spec['key']] == LEGACY_KEY_INDEX:
+            distances_collection.drop_index(name)
+            print(f"🧹 Dropped unique index '{name}' on the stadium pair; distances are keyed per team", flush=True)
+
+def select_changed(manifest, sheet_name, records, full):
+    # The manifest always tracks the rows; --full just writes them all anyway
+    changed, unchanged_count = manifest.filter_changed(sheet_name, records)
+    if full:
+        return records, 0
+    return changed, unchanged_count
+
+def diff_slices(manifest, sheet_name, records, full, start=0, resume_at=0, slice_size=None):
+    """Diff one batch of rows, returning ``(slices, unchanged_count, resumed_count)``.
+
+    ``start`` is the sheet offset of ``records[0]`` and each slice is
+    ``(end_offset, changed_records)`` for at most ``slice_size`` rows. Rows
+    before ``resume_at`` were written by an interrupted import: the manifest
+    still sees them, but they are left out of the slices.
+    """
+    resumed = max(0, min(len(records), resume_at - start))
+    if resumed:
+        manifest.filter_changed(sheet_name, records[:resumed])
+    slice_size = slice_size or max(len(records), 1)
+    slices = []
+    unchanged_count = 0
+    for begin in range(resumed, len(records), slice_size):
+        chunk = records[begin:begin + slice_size]
+        changed, chunk_unchanged = select_changed(manifest, sheet_name, chunk, full)
+        unchanged_count += chunk_unchanged
+        slices.append((start + begin + len(chunk), changed))
+    return slices, unchanged_count, resumed
+
+def iter_sheet_batches(file_path, sheet_names, cached_sheets, stream, progress, distance_check=None):
+    """Yield ``(sheet_name, columns, batches, parsed)`` in workbook order.
+
+    Cached sheets come back with their validated batch and ``parsed`` set;
+    the others are read from the workbook and validated lazily.
+    """
+    to_parse = [name for name in sheet_names if name not in cached_sheets]
+    workbook_sheets = iter_sheets(file_path, stream=stream, sheet_names=to_parse, import_type='distances')
+    for sheet_name in sheet_names:
+        parsed = cached_sheets.get(sheet_name)
+        if parsed is not None:
+            yield sheet_name, parsed['columns'], [(parsed['rows'], parsed['records'], parsed['rejections'])], parsed
+            continue
+        # The in-memory reader loads the whole workbook on the first sheet
+        with progress.phase('parse', sheet=sheet_name):
+            sheet_name, columns, frames = next(workbook_sheets)
+        prepare = None
+        if distance_check is not None and not missing_columns(columns, 'distances'):
+            prepare = partial(distance_check.apply, sheet_name=sheet_name, progress=progress)
+        yield sheet_name, columns, iter_validated(frames, 'distances', progress, prepare=prepare), None
+
+def write_distances(sheet_name, slices, batch_size, tracker=None):
+    # Runs on a writer thread; all threads share the module's pooled client
+    writer = BulkUpsertWriter(distances_collection, key_fields=DISTANCE_KEY, batch_size=batch_size)
+    writer.on_flush = tracker
+    for offset, changed in slices:
+        for distance in changed:
+            writer.add(distance)
+        if tracker is not None:
+            tracker.queue(sheet_name, offset)
+    writer.close()
+    return writer
+
+def import_sheets_parallel(file_path, sheet_names, cached_sheets, cache, file_hash, writer, resolver, manifest, full,
+                           workers, writer_threads, progress, distance_check=None, checkpoint=None):
+    row_count = 0
+    skipped_count = 0
+    unchanged_count = 0
+    resumed_count = 0
+    processed_sheets = []
+    pending_writes = {}
+    
+    with ThreadPoolExecutor(max_workers=writer_threads) as write_pool:
+        # Sheets arrive as soon as a worker process finishes parsing them, so
+        # writes for one sheet overlap with parsing of the next
+        to_parse = [name for name in sheet_names if name not in cached_sheets]
+        parsed_sheets = iter_parsed_sheets(file_path, 'distances', workers, sheet_names=to_parse,
+                                           check=distance_check) if to_parse else []
+        for parsed in chain(cached_sheets.values(), parsed_sheets):
+            sheet_name = parsed['sheet']
+            
+            # Cache the validated sheet before team names are filled in
+            if sheet_name not in cached_sheets:
+                progress.add('parse', parsed['read_seconds'], rows=parsed['rows'], sheet=sheet_name)
+                progress.add('validate', parsed['validate_seconds'], rows=parsed['rows'], sheet=sheet_name)
+                if cache is not None:
+                    cache.store(file_hash, 'distances', parsed)
+                if distance_check is not None:
+                    distance_check.record(sheet_name, parsed['filled'], parsed['flags'])
+            
+            if parsed['missing']:
+                print(f"⚠️ Column not found in sheet '{sheet_name}': {', '.join(parsed['missing'])}", flush=True)
+                print(f"   Available columns: {parsed['columns']}", flush=True)
+                manifest.keep_sheet(sheet_name)
+                continue
+            
+            with progress.phase('resolve', rows=len(parsed['records']), sheet=sheet_name):
+                resolve_team_names(parsed['records'], resolver)
+            with progress.phase('diff', rows=len(parsed['records']), sheet=sheet_name):
+                slices, sheet_unchanged, sheet_resumed = diff_slices(
+                    manifest, sheet_name, parsed['records'], full,
+                    resume_at=checkpoint.offset(sheet_name) if checkpoint is not None else 0,
+                    slice_size=writer.batch_size if checkpoint is not None else None
+                )
+            
+            row_count += parsed['rows']
+            skipped_count += len(parsed['rejections'])
+            unchanged_count += sheet_unchanged
+            resumed_count += sheet_resumed
+            processed_sheets.append(sheet_name)
+            source = "Loaded cached" if sheet_name in cached_sheets else "Parsed"
+            changed_count = sum(len(changed) for _, changed in slices)
+            resumed_note = f", {sheet_resumed} already written" if sheet_resumed else ""
+            print(f"📄 {source} sheet '{sheet_name}': {parsed['rows']} rows in {parsed['parse_seconds']:.2f}s "
+                  f"({changed_count} changed, {sheet_unchanged} unchanged{resumed_note})", flush=True)
+            tracker = checkpoint.tracker() if checkpoint is not None else None
+            future = write_pool.submit(write_distances, sheet_name, slices, writer.batch_size, tracker)
+            pending_writes[future] = parsed
+        
+        for future in as_completed(pending_writes):
+            parsed = pending_writes[future]
+            sheet_writer = future.result()
+            writer.merge(sheet_writer)
+            sheet_stats = sheet_writer.stats
+            print(f"   ✅ Sheet '{parsed['sheet']}': {sheet_stats['inserted']} inserted, {sheet_stats['updated']} updated, "
+                  f"{len(parsed['rejections'])} skipped, written in {sheet_writer.elapsed:.2f}s "
+                  f"({sheet_stats['round_trips']} round trips)", flush=True)
+    
+    return row_count, skipped_count, unchanged_count, resumed_count, processed_sheets
+
+def iter_changed_distances(file_path, sheet_names, cached_sheets, cache, file_hash, stream, resolver, manifest, full,
+                           progress, totals, distance_check=None, checkpoint=None, slice_size=None):
+    """Parse -> validate -> resolve -> diff, yielding ``(sheet_name, offset, changed_rows)`` slices.
+
+    ``offset`` is the sheet position just after the slice. With a
+    ``checkpoint``, rows it already covers are not yielded again. Per-sheet
+    counts are added to ``totals`` as each sheet finishes.
+    """
+    for sheet_name, columns, batches, parsed in iter_sheet_batches(file_path, sheet_names, cached_sheets, stream, progress,
+                                                                   distance_check):
+        source = " (from parse cache)" if parsed is not None else ""
+        print(f"\n📄 Processing sheet: '{sheet_name}'{source}", flush=True)
+        
+        missing = missing_columns(columns, 'distances')
+        if missing:
+            print(f"⚠️ Column not found in sheet '{sheet_name}': {', '.join(missing)}", flush=True)
+            print(f"   Available columns: {columns}", flush=True)
+            manifest.keep_sheet(sheet_name)
+            continue
+        
+        # The in-memory reader yields one batch per sheet, so caching it costs nothing;
+        # streaming keeps memory flat and therefore only reads from the cache
+        if cache is not None and parsed is None and not stream:
+            batches = list(batches)
+            cache.store(file_hash, 'distances', {
+                "sheet": sheet_name,
+                "columns": columns,
+                "rows": sum(batch[0] for batch in batches),
+                "records": [record for batch in batches for record in batch[1]],
+                "rejections": [rejection for batch in batches for rejection in batch[2]],
+            })
+        
+        row_count = 0
+        queued_count = 0
+        skipped_count = 0
+        unchanged_count = 0
+        resumed_count = 0
+        offset = 0
+        resume_at = checkpoint.offset(sheet_name) if checkpoint is not None else 0
+        
+        for batch_rows, records, rejections in batches:
+            row_count += batch_rows
+            skipped_count += len(rejections)
+            
+            with progress.phase('resolve', rows=len(records), sheet=sheet_name):
+                resolve_team_names(records, resolver)
+            with progress.phase('diff', rows=len(records), sheet=sheet_name):
+                slices, batch_unchanged, batch_resumed = diff_slices(
+                    manifest, sheet_name, records, full, start=offset, resume_at=resume_at, slice_size=slice_size
+                )
+            offset += len(records)
+            unchanged_count += batch_unchanged
+            resumed_count += batch_resumed
+            for end_offset, changed in slices:
+                queued_count += len(changed)
+                yield sheet_name, end_offset, changed
+        
+        print(f"📊 Processed {row_count} rows in sheet '{sheet_name}'", flush=True)
+        print(f"   ✅ Queued: {queued_count} records from '{sheet_name}'", flush=True)
+        print(f"   ⏸️  Unchanged: {unchanged_count} records from '{sheet_name}'", flush=True)
+        if resumed_count:
+            print(f"   ⏩ Already written: {resumed_count} records from '{sheet_name}'", flush=True)
+        print(f"   ⏭️  Skipped: {skipped_count} records from '{sheet_name}'", flush=True)
+        
+        totals["rows"] += row_count
+        totals["unchanged"] += unchanged_count
+        totals["resumed"] += resumed_count
+        totals["skipped"] += skipped_count
+        totals["sheets"].append(sheet_name)
+
+def import_distances(file_path=None, batch_size=DEFAULT_BATCH_SIZE, stream=False, workers=1,
+                     writer_threads=DEFAULT_WRITER_THREADS, full=False, shortest_paths=True, use_cache=True,
+                     progress=None, async_pipeline=False, async_writers=DEFAULT_ASYNC_WRITERS,
+                     queue_size=DEFAULT_QUEUE_SIZE, fill_missing=False, check_distances=False,
+                     circuity=DEFAULT_CIRCUITY, max_ratio=DEFAULT_MAX_RATIO, resume=False, prune=False):
+    progress = progress or ProgressReporter('distances')
     try:
         print("🔌 Connecting to MongoDB...", flush=True)
+        opened_at = time.perf_counter()
         
         # Determine file path
         if file_path is None:
@@ -21,122 +262,267 @@ def import_distances(file_path=None):
         # Check if file exists
         if not os.path.exists(file_path):
             print(f"❌ File not found: {file_path}", flush=True)
+            progress.summary(success=False, error=f"File not found: {file_path}")
+            sys.exit(1)
+        
+        # Batched upsert writer keyed on (teamName, beginningStadium, endingStadium)
+        drop_legacy_key_index()
+        writer = BulkUpsertWriter(distances_collection, key_fields=DISTANCE_KEY, batch_size=batch_size)
+        if not writer.ensure_unique_index():
+            message = f"Unique index on ({', '.join(DISTANCE_KEY)}) could not be created; import aborted"
+            print(f"❌ {message}", flush=True)
+            progress.summary(success=False, error=message)
             sys.exit(1)
         
-        # Read Excel file - get all sheet names first
-        print(f"📖 Reading Excel file: {file_path}...", flush=True)
-        excel_file = pd.ExcelFile(file_path)
-        sheet_names = excel_file.sheet_names
-        print(f"📋 Found {len(sheet_names)} sheet(s): {', '.join(sheet_names)}", flush=True)
+        # Stadium -> team index, loaded once from the shared client when first needed
+        resolver = StadiumTeamResolver(teams_collection)
+        
+        # Content hashes from the previous import decide what needs writing
+        all_sheet_names = list_sheet_names(file_path)
+        manifest = ImportManifest(db, 'distances', DISTANCE_KEY, prune=prune).load(all_sheet_names)
+        fingerprints = sheet_fingerprints(file_path)
+        
+        # Great-circle gap filling and plausibility checks run on the raw rows,
+        # so every sheet is re-read and the parse cache is bypassed
+        distance_check = None
+        if fill_missing or check_distances:
+            distance_check = DistanceCheck(GreatCircleIndex.from_resolver(resolver), fill=fill_missing,
+                                           flag=check_distances, circuity=circuity, max_ratio=max_ratio)
+            print(f"🧭 Great-circle distances loaded for {len(distance_check.index)} stadiums", flush=True)
+            use_cache = False
         
         # Track statistics
-        total_inserted_count = 0
-        total_skipped_count = 0
-        
-        # Process each sheet
-        for sheet_name in sheet_names:
-            print(f"\n📄 Processing sheet: '{sheet_name}'", flush=True)
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            print(f"📊 Found {len(df)} rows in sheet '{sheet_name}'", flush=True)
-            
-            inserted_count = 0
-            skipped_count = 0
-            
-            # Process each row
-            for index, row in df.iterrows():
-                try:
-                    # Clean and map data
-                    # Check which column structure this sheet uses
-                    if 'Team Name' in df.columns:
-                        team_name = str(row['Team Name']).strip()
-                    else:
-                        # If no Team Name column, try to infer or use empty
-                        team_name = ""
-                    
-                    beginning_stadium = str(row['Beginning Stadium']).strip()
-                    ending_stadium = str(row['Ending Stadium']).strip()
-                    distance_value = float(row['Distance']) if pd.notna(row['Distance']) else 0
-                    
-                    # Only add if all required fields are present and distance > 0
-                    if not (beginning_stadium and ending_stadium and distance_value > 0):
-                        skipped_count += 1
-                        continue
-                    
-                    # If team_name is empty, try to find it from the stadium name
-                    # This is a fallback - ideally Team Name should be in the sheet
-                    if not team_name:
-                        # Try to find team by stadium name
-                        from pymongo import MongoClient as MC
-                        temp_client = MC(MONGODB_URI)
-                        temp_db = temp_client['nfl-vacation']
-                        temp_teams = temp_db['teams']
-                        team_doc = temp_teams.find_one({"stadium.name": beginning_stadium})
-                        if team_doc:
-                            team_name = team_doc.get('teamName', '')
-                        temp_client.close()
-                    
-                    # Check if distance record already exists
-                    existing_distance = distances_collection.find_one({
-                        "beginningStadium": beginning_stadium,
-                        "endingStadium": ending_stadium
-                    })
-                    
-                    if existing_distance:
-                        print(f"⏭️  Distance '{beginning_stadium}' → '{ending_stadium}' already exists, skipping...", flush=True)
-                        skipped_count += 1
-                        continue
-                    
-                    # Create new distance document
-                    distance = {
-                        "teamName": team_name if team_name else "Unknown",
-                        "beginningStadium": beginning_stadium,
-                        "endingStadium": ending_stadium,
-                        "distance": distance_value
-                    }
-                    
-                    # Insert new distance
-                    distances_collection.insert_one(distance)
-                    inserted_count += 1
-                    if (index + 1) % 10 == 0:  # Print progress every 10 rows
-                        print(f"   Processed {index + 1} rows...", flush=True)
-                    
-                except KeyError as e:
-                    print(f"⚠️ Column not found in row {index + 1}: {e}", flush=True)
-                    print(f"   Available columns: {list(df.columns)}", flush=True)
-                    skipped_count += 1
-                    continue
-                except Exception as e:
-                    print(f"❌ Error processing row {index + 1}: {e}", flush=True)
-                    skipped_count += 1
-                    continue
-            
-            print(f"   ✅ Inserted: {inserted_count} records from '{sheet_name}'", flush=True)
-            print(f"   ⏭️  Skipped: {skipped_count} records from '{sheet_name}'", flush=True)
+        totals = {"rows": 0, "skipped": 0, "unchanged": 0, "resumed": 0, "sheets": []}
+        kept_row_count = 0
+        changed_batches = ()
+        
+        # Skip sheets whose raw content has not changed since the last import
+        sheet_names = []
+        for sheet_name in all_sheet_names:
+            if not full and distance_check is None and manifest.is_sheet_unchanged(sheet_name, fingerprints.get(sheet_name)):
+                kept = manifest.keep_sheet(sheet_name)
+                kept_row_count += kept
+                print(f"⏭️  Sheet '{sheet_name}' unchanged since last import ({kept} rows), skipping", flush=True)
+            else:
+                sheet_names.append(sheet_name)
+        
+        # Sheets parsed from this exact file before skip Excel parsing entirely
+        cache = ParseCache() if use_cache else None
+        file_hash = file_sha256(file_path) if cache is not None or not async_pipeline else None
+        
+        # Every acknowledged batch moves the checkpoint forward; --resume skips
+        # the rows an interrupted import of this same file already wrote
+        checkpoint = None
+        if async_pipeline:
+            if resume:
+                print("⚠️ --resume is ignored with --async: async writers do not keep a checkpoint", flush=True)
+        else:
+            settings = {"fillMissing": fill_missing, "circuity": circuity if fill_missing else None}
+            checkpoint = ImportCheckpoint(db, 'distances', file_hash, settings)
+            if resume and checkpoint.load().resumed_rows:
+                print(f"⏩ Resuming an interrupted import: {checkpoint.resumed_rows} rows in "
+                      f"{len(checkpoint.offsets)} sheet(s) were already written", flush=True)
+            else:
+                if resume:
+                    print("⏩ No checkpoint for this file, starting from the first row", flush=True)
+                checkpoint.reset()
+        progress.add('open', time.perf_counter() - opened_at, sheets=len(all_sheet_names))
+        cached_sheets = {}
+        if cache is not None:
+            for sheet_name in sheet_names:
+                parsed = cache.load(file_hash, 'distances', sheet_name)
+                if parsed is not None:
+                    cached_sheets[sheet_name] = parsed
+                    progress.add('parse', parsed['parse_seconds'], rows=parsed['rows'], sheet=sheet_name, cached=True)
+            if cached_sheets:
+                print(f"💾 Parse cache hit for {len(cached_sheets)} of {len(sheet_names)} sheet(s)", flush=True)
+        
+        if not sheet_names:
+            print("📖 Nothing to parse", flush=True)
+        elif workers > 1 and not async_pipeline:
+            # Parse sheets in a process pool and write them from a bounded set of threads
+            print(f"📖 Reading file ({workers} parser processes, {writer_threads} writer threads): {file_path}...", flush=True)
+            totals["rows"], totals["skipped"], totals["unchanged"], totals["resumed"], totals["sheets"] = import_sheets_parallel(
+                file_path, sheet_names, cached_sheets, cache, file_hash, writer, resolver, manifest, full,
+                workers, writer_threads, progress, distance_check, checkpoint
+            )
+        else:
+            # Read Excel file - every sheet is parsed exactly once
+            mode = "streaming" if stream else "in-memory"
+            if async_pipeline:
+                mode += f", async with {async_writers} writers"
+                if workers > 1:
+                    print("⚠️ --workers is ignored with --async: one parser feeds the async writers", flush=True)
+            print(f"📖 Reading file ({mode}): {file_path}...", flush=True)
+            changed_batches = iter_changed_distances(
+                file_path, sheet_names, cached_sheets, cache, file_hash, stream, resolver, manifest, full,
+                progress, totals, distance_check, checkpoint, slice_size=batch_size if checkpoint is not None else None
+            )
+        
+        if async_pipeline:
+            # Writer coroutines overlap with parsing; removed rows are deleted through the same pipeline
+            for async_writer in run_async_import(
+                distances_collection.name, db.name, DISTANCE_KEY, (changed for _, _, changed in changed_batches),
+                removed_keys=manifest.removed_keys, writers=async_writers, queue_size=queue_size,
+                batch_size=batch_size
+            ):
+                writer.merge(async_writer)
+        else:
+            # Queue for the next bulk upsert (duplicates are merged in memory)
+            tracker = checkpoint.tracker() if checkpoint is not None else None
+            writer.on_flush = tracker
+            for sheet_name, offset, changed in changed_batches:
+                for distance in changed:
+                    writer.add(distance)
+                if tracker is not None:
+                    tracker.queue(sheet_name, offset)
             
-            total_inserted_count += inserted_count
-            total_skipped_count += skipped_count
+            # With --prune, rows that disappeared from one of this file's sheets
+            for key in manifest.removed_keys():
+                writer.delete(key)
+        
+        # Send whatever is still buffered
+        stats = writer.close()
+        progress.add('write', stats['write_seconds'], rows=stats['received'] + stats['deleted'])
+        
+        processed_sheets = totals["sheets"]
+        total_unchanged_count = totals["unchanged"]
+        total_skipped_count = totals["skipped"]
+        
+        # Only remember this import once every write went through
+        if stats['errors']:
+            print("⚠️ Some writes failed; the import manifest was not updated", flush=True)
+            if checkpoint is not None:
+                print("   The checkpoint stops before the first failed batch; rerun with --resume to retry from there", flush=True)
+        else:
+            with progress.phase('manifest'):
+                manifest.save({name: fingerprints[name] for name in processed_sheets if name in fingerprints})
+            if checkpoint is not None:
+                checkpoint.reset()
         
         # Print summary
-        print(f"\n📊 Overall Import Summary:", flush=True)
-        print(f"   ✅ Total Inserted: {total_inserted_count} distance records", flush=True)
-        print(f"   ⏭️  Total Skipped: {total_skipped_count} records (already exist or invalid)", flush=True)
+        print(f"\n📊 Overall Import Summary ({len(all_sheet_names)} sheet(s), {len(processed_sheets)} parsed):", flush=True)
+        print(f"   ✅ Total Inserted: {stats['inserted']} distance records", flush=True)
+        print(f"   🔄 Total Updated: {stats['updated']} records", flush=True)
+        print(f"   🗑️  Total Deleted: {stats['deleted']} records", flush=True)
+        print(f"   ⏸️  Unchanged: {stats['unchanged'] + total_unchanged_count + kept_row_count} records "
+              f"({kept_row_count} in unchanged sheets)", flush=True)
+        print(f"   🔁 Duplicates merged: {stats['duplicates']} rows", flush=True)
+        if totals["resumed"]:
+            print(f"   ⏩ Resumed: {totals['resumed']} records already written before the interruption", flush=True)
+        print(f"   ⏭️  Total Skipped: {total_skipped_count} records (invalid)", flush=True)
+        if distance_check is not None:
+            print(f"   🧭 Great-circle check: {distance_check.filled} distances filled, "
+                  f"{distance_check.flagged} suspicious rows flagged", flush=True)
+        if resolver.lookups:
+            print(f"   🏟️  Team lookups by stadium: {resolver.hits} hits, {resolver.misses} misses", flush=True)
+        if cache is not None and (cache.hits or cache.misses):
+            print(f"   💾 Parse cache: {cache.hits} hits, {cache.misses} misses", flush=True)
+        if stats['errors']:
+            print(f"   ❌ Write errors: {stats['errors']} records", flush=True)
+        round_trips = stats['round_trips'] + manifest.round_trips + (1 if resolver.index is not None else 0)
+        if checkpoint is not None:
+            round_trips += checkpoint.round_trips
+        print(f"   🚀 {writer.rows_per_sec:.0f} rows/sec over {round_trips} round trips (batch size {writer.batch_size})", flush=True)
+        progress.print_phases()
         
         # Verify total count
         total_count = distances_collection.count_documents({})
+        round_trips += 1
         print(f"📈 Total distances in database: {total_count}", flush=True)
         
-        return True
+        # Refresh the all-pairs shortest-path matrices and optimal trips when the graph changed
+        graph_changed = stats['inserted'] or stats['updated'] or stats['deleted']
+        if shortest_paths and (graph_changed or not db[SHORTEST_PATHS_COLLECTION].find_one({"_id": META_ID}, {"_id": 1})):
+            try:
+                print("", flush=True)
+                with progress.phase('shortest_paths'):
+                    precompute_shortest_paths(db)
+            except Exception as e:
+                print(f"⚠️ Shortest-path precomputation failed: {e}", flush=True)
+            try:
+                print("", flush=True)
+                with progress.phase('optimal_trips'):
+                    precompute_optimal_trips(db)
+            except Exception as e:
+                print(f"⚠️ Optimal-trip precomputation failed: {e}", flush=True)
+        
+        progress.summary(
+            success=not stats['errors'],
+            rows=totals["rows"],
+            round_trips=round_trips,
+            inserted=stats['inserted'],
+            updated=stats['updated'],
+            deleted=stats['deleted'],
+            unchanged=stats['unchanged'] + total_unchanged_count + kept_row_count,
+            duplicates=stats['duplicates'],
+            resumed=totals["resumed"],
+            skipped=total_skipped_count,
+            errors=stats['errors'],
+            sheets=len(all_sheet_names),
+            sheetsParsed=len(processed_sheets),
+            filled=distance_check.filled if distance_check is not None else 0,
+            flagged=distance_check.flagged if distance_check is not None else 0,
+            total=total_count,
+        )
+        return not stats['errors']
         
     except Exception as error:
         print(f"❌ Error importing distances: {error}", flush=True)
         import traceback
         traceback.print_exc()
+        progress.summary(success=False, error=str(error))
         sys.exit(1)
     finally:
         client.close()
 
 if __name__ == "__main__":
     # Allow file path as command line argument
-    file_path = sys.argv[1] if len(sys.argv) > 1 else None
-    result = import_distances(file_path)
+    parser = argparse.ArgumentParser(description="Import stadium distances from Excel, CSV or Parquet")
+    parser.add_argument("file_path", nargs="?", default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help="Number of upserts sent per bulk_write round trip")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read in fixed-size chunks (openpyxl read-only mode for .xlsx) with constant memory")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parse sheets in this many processes (0 = one per CPU core)")
+    parser.add_argument("--writer-threads", type=int, default=DEFAULT_WRITER_THREADS,
+                        help="Number of threads writing parsed sheets in parallel mode")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-import every sheet and row even if the manifest says it is unchanged")
+    parser.add_argument("--skip-shortest-paths", action="store_true",
+                        help="Do not refresh the precomputed shortest-path matrices and optimal trips after the import")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse the workbook instead of using the on-disk parse cache")
+    parser.add_argument("--progress", choices=PROGRESS_MODES, default="text",
+                        help="jsonl: write phase timings and a final summary as JSON lines on stdout")
+    parser.add_argument("--async", dest="async_pipeline", action="store_true",
+                        help="Write through concurrent asyncio writers fed by a bounded queue (needs pymongo>=4.10)")
+    parser.add_argument("--async-writers", type=int, default=DEFAULT_ASYNC_WRITERS,
+                        help="Number of concurrent writer coroutines in --async mode")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Batches each async writer may have waiting before the parser pauses")
+    parser.add_argument("--fill-missing", action="store_true",
+                        help="Estimate missing or non-positive distances from the great-circle distance")
+    parser.add_argument("--check-distances", action="store_true",
+                        help="Flag rows whose distance is implausible for the great-circle distance")
+    parser.add_argument("--circuity", type=float, default=DEFAULT_CIRCUITY,
+                        help="Road miles per great-circle mile used by --fill-missing")
+    parser.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO,
+                        help="Flag rows longer than this many times the great-circle distance")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete distances that were imported from one of this file's sheets but are no longer in it")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted import of the same file from its last committed batch")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else default_worker_count()
+    with progress_output(args.progress, 'distances') as progress:
+        result = import_distances(args.file_path, batch_size=args.batch_size, stream=args.stream,
+                                  workers=workers, writer_threads=args.writer_threads, full=args.full,
+                                  shortest_paths=not args.skip_shortest_paths, use_cache=not args.no_cache,
+                                  progress=progress, async_pipeline=args.async_pipeline,
+                                  async_writers=args.async_writers, queue_size=args.queue_size,
+                                  fill_missing=args.fill_missing, check_distances=args.check_distances,
+                                  circuity=args.circuity, max_ratio=args.max_ratio, resume=args.resume,
+                                  prune=args.prune)
     sys.exit(0 if result else 1)
\ No newline at end of file
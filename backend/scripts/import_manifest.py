@@ -0,0 +1,189 @@
+import hashlib
+import json
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from pymongo import DeleteOne, UpdateOne
+from workbook_reader import FLAT_FILE_SHEET, file_format
+
+MANIFEST_COLLECTION = 'import_manifests'
+MANIFEST_ROWS_COLLECTION = 'import_manifest_rows'
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def file_sha256(file_path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sheet_fingerprints(file_path):
+    """Hash each worksheet's raw XML without parsing any cells.
+
+    Shared strings are folded into every sheet's hash because cells refer to
+    them by index. A .csv/.parquet file is one sheet fingerprinted by its
+    file hash. Returns ``{}`` for other files that are not .xlsx packages.
+    """
+    if file_format(file_path) != 'xlsx':
+        return {FLAT_FILE_SHEET: file_sha256(file_path)}
+    try:
+        archive = zipfile.ZipFile(file_path)
+    except zipfile.BadZipFile:
+        return {}
+
+    with archive:
+        names = set(archive.namelist())
+        shared_strings = archive.read('xl/sharedStrings.xml') if 'xl/sharedStrings.xml' in names else b''
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{_PKG_REL_NS}Relationship')}
+
+        fingerprints = {}
+        for sheet in workbook.iter(f'{_MAIN_NS}sheet'):
+            target = targets.get(sheet.get(f'{_REL_NS}id'), '')
+            path = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            if path not in names:
+                continue
+            digest = hashlib.sha256(archive.read(path))
+            digest.update(shared_strings)
+            fingerprints[sheet.get('name')] = digest.hexdigest()
+        return fingerprints
+
+
+def row_hash(record):
+    payload = json.dumps(record, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class ImportManifest:
+    """Per-sheet and per-row content hashes from the previous import.
+
+    ``import_manifests`` holds one document per (import type, sheet) with the
+    sheet fingerprint; ``import_manifest_rows`` holds one document per row key
+    with the hash of the document that was last written for it.
+
+    Rows missing from a new file are only reported as removed with ``prune``,
+    and only when they came from a sheet the new file also has, so a partial
+    upload never deletes what it doesn't mention.
+    """
+
+    def __init__(self, db, import_type, key_fields, prune=False):
+        self.sheets_collection = db[MANIFEST_COLLECTION]
+        self.rows_collection = db[MANIFEST_ROWS_COLLECTION]
+        self.import_type = import_type
+        self.key_fields = tuple(key_fields)
+        self.prune = prune
+        self.file_sheets = set()
+        self.sheets = {}
+        self.rows = {}
+        self.seen = {}
+        self.kept_sheets = set()
+        self.stale_row_ids = []
+        self.round_trips = 0
+
+    def load(self, file_sheets=()):
+        # file_sheets: every sheet of the file being imported, read or not
+        self.file_sheets = set(file_sheets)
+        for doc in self.sheets_collection.find({"importType": self.import_type}, {"sheet": 1, "hash": 1}):
+            self.sheets[doc['sheet']] = doc['hash']
+        self.round_trips += 1
+
+        for doc in self.rows_collection.find({"importType": self.import_type}, {"key": 1, "hash": 1, "sheet": 1}):
+            if len(doc['key']) != len(self.key_fields):
+                # Written under a different key; it can't be matched or safely deleted by key
+                self.stale_row_ids.append(doc['_id'])
+                continue
+            self.rows[tuple(doc['key'])] = (doc['hash'], doc['sheet'])
+        self.round_trips += 1
+
+        if self.stale_row_ids:
+            # Rows of unchanged sheets can't be carried over, so every sheet is re-read
+            print(f"🔑 The {self.import_type} key changed since the last import; re-reading every sheet", flush=True)
+            self.sheets = {}
+        return self
+
+    def key_for(self, record):
+        return tuple(record[field] for field in self.key_fields)
+
+    def is_sheet_unchanged(self, sheet, fingerprint):
+        # Rows left behind by earlier imports without prune are only found by re-reading the sheet
+        return not self.prune and fingerprint is not None and self.sheets.get(sheet) == fingerprint
+
+    def keep_sheet(self, sheet):
+        """Treat every row previously imported from ``sheet`` as still present."""
+        self.kept_sheets.add(sheet)
+        kept = 0
+        for key, (digest, row_sheet) in self.rows.items():
+            if row_sheet == sheet and key not in self.seen:
+                self.seen[key] = (digest, sheet)
+                kept += 1
+        return kept
+
+    def filter_changed(self, sheet, records):
+        """Return ``(changed_records, unchanged_count)`` for one batch of rows."""
+        changed = []
+        unchanged = 0
+        for record in records:
+            key = self.key_for(record)
+            digest = row_hash(record)
+            # A key repeated within this import is always written so the last row wins
+            repeated = key in self.seen
+            self.seen[key] = (digest, sheet)
+            previous = self.rows.get(key)
+            if previous is not None and previous[0] == digest and not repeated:
+                unchanged += 1
+            else:
+                changed.append(record)
+        return changed, unchanged
+
+    def removed_keys(self):
+        if not self.prune:
+            return []
+        return [
+            key for key, (_, sheet) in self.rows.items()
+            if key not in self.seen and sheet in self.file_sheets
+        ]
+
+    def save(self, fingerprints):
+        operations = []
+        for key, (digest, sheet) in self.seen.items():
+            if self.rows.get(key) != (digest, sheet):
+                operations.append(UpdateOne(
+                    {"_id": self._row_id(key)},
+                    {"$set": {"importType": self.import_type, "key": list(key), "hash": digest, "sheet": sheet}},
+                    upsert=True
+                ))
+        for key in self.removed_keys():
+            operations.append(DeleteOne({"_id": self._row_id(key)}))
+        for row_id in self.stale_row_ids:
+            operations.append(DeleteOne({"_id": row_id}))
+        if operations:
+            self.rows_collection.bulk_write(operations, ordered=False)
+            self.round_trips += 1
+
+        # Sheets kept because they could not be read keep their old fingerprint
+        sheet_operations = []
+        for sheet in self.sheets:
+            if sheet not in fingerprints and sheet not in self.kept_sheets:
+                sheet_operations.append(DeleteOne({"_id": self._sheet_id(sheet)}))
+        for sheet, fingerprint in fingerprints.items():
+            sheet_operations.append(UpdateOne(
+                {"_id": self._sheet_id(sheet)},
+                {"$set": {"importType": self.import_type, "sheet": sheet, "hash": fingerprint}},
+                upsert=True
+            ))
+        if sheet_operations:
+            self.sheets_collection.bulk_write(sheet_operations, ordered=False)
+            self.round_trips += 1
+
+    def _row_id(self, key):
+        digest = hashlib.sha1(json.dumps(list(key), default=str).encode('utf-8')).hexdigest()
+        return f"{self.import_type}|{digest}"
+
+    def _sheet_id(self, sheet):
+        return f"{self.import_type}|{sheet}"
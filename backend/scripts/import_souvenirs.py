@@ -1,9 +1,17 @@
-import pandas as pd
-import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
+import argparse
 import sys
 import os
+import time
+from async_pipeline import DEFAULT_ASYNC_WRITERS, DEFAULT_QUEUE_SIZE, run_async_import
+from bulk_writer import DEFAULT_BATCH_SIZE
+from import_manifest import file_sha256
+from parse_cache import ParseCache
+from progress import PROGRESS_MODES, ProgressReporter, progress_output
+from validation import validate_frame, report_rejections
+from workbook_reader import list_sheet_names, read_frame
 
 # MongoDB connection
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
@@ -11,7 +19,58 @@ client = MongoClient(MONGODB_URI)
 db = client['nfl-vacation']
 teams_collection = db['teams']
 
-def import_souvenirs(file_path=None):
+SYNCED_FIELDS = ('price', 'category', 'isTraditional')
+
+
+def plan_souvenir_sync(team, souvenirs):
+    """Return ``(operations, counts)`` that bring one team's stored souvenirs in line with ``souvenirs``.
+
+    Stored souvenirs are matched by name and keep their ``_id``: changed fields
+    are ``$set`` on the matched element, new souvenirs are ``$push``ed and those
+    no longer in the sheet are ``$pull``ed. The operators cannot touch the same
+    array in one update, so each kind of change is its own operation.
+    """
+    stored = {}
+    duplicate_ids = []
+    for souvenir in team.get('souvenirs') or []:
+        if souvenir.get('name') in stored:
+            duplicate_ids.append(souvenir['_id'])
+        else:
+            stored[souvenir.get('name')] = souvenir
+    # Later rows for the same souvenir win
+    incoming = {souvenir['name']: souvenir for souvenir in souvenirs}
+
+    operations = []
+    added = []
+    counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    for name, souvenir in incoming.items():
+        current = stored.get(name)
+        if current is None:
+            added.append(souvenir)
+            continue
+        changed = [field for field in SYNCED_FIELDS if current.get(field) != souvenir[field]]
+        if not changed:
+            counts["unchanged"] += 1
+            continue
+        operations.append(UpdateOne(
+            {"_id": team['_id'], "souvenirs._id": current['_id']},
+            {"$set": {f"souvenirs.$.{field}": souvenir[field] for field in changed}}
+        ))
+        counts["updated"] += 1
+    removed_ids = [souvenir['_id'] for name, souvenir in stored.items() if name not in incoming] + duplicate_ids
+    counts["added"] = len(added)
+    counts["removed"] = len(removed_ids)
+
+    if removed_ids:
+        operations.append(UpdateOne({"_id": team['_id']}, {"$pull": {"souvenirs": {"_id": {"$in": removed_ids}}}}))
+    if added:
+        operations.append(UpdateOne({"_id": team['_id']}, {"$push": {"souvenirs": {"$each": added}}}))
+    return operations, counts
+
+
+def import_souvenirs(file_path=None, use_cache=True, progress=None, async_pipeline=False,
+                     async_writers=DEFAULT_ASYNC_WRITERS, queue_size=DEFAULT_QUEUE_SIZE, sync=False):
+    progress = progress or ProgressReporter('souvenirs')
     try:
         print("🔌 Connecting to MongoDB...", flush=True)
         
@@ -22,95 +81,180 @@ def import_souvenirs(file_path=None):
         # Check if file exists
         if not os.path.exists(file_path):
             print(f"❌ File not found: {file_path}", flush=True)
+            progress.summary(success=False, error=f"File not found: {file_path}")
             return False
         
-        # Read Excel file
-        print(f"📖 Reading Excel file: {file_path}...", flush=True)
-        df = pd.read_excel(file_path)
-        
-        print(f"📊 Found {len(df)} rows in Excel file", flush=True)
-        
         # Track statistics
         updated_count = 0
         skipped_count = 0
+        error_count = 0
+        round_trips = 0
         teams_processed = set()
+        sync_counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
         
-        # Group souvenirs by team
-        teams_souvenirs = {}
-        for index, row in df.iterrows():
+        # A file parsed before is served from the on-disk parse cache
+        phase_started = time.perf_counter()
+        sheet_name = list_sheet_names(file_path)[0]
+        cache = ParseCache() if use_cache else None
+        file_hash = file_sha256(file_path) if cache is not None else None
+        progress.add('open', time.perf_counter() - phase_started)
+        phase_started = time.perf_counter()
+        parsed = cache.load(file_hash, 'souvenirs', sheet_name) if cache is not None else None
+        
+        if parsed is not None:
+            print(f"💾 Loaded '{sheet_name}' from parse cache ({parsed['rows']} rows)", flush=True)
+            records, rejections = parsed['records'], parsed['rejections']
+            row_count = parsed['rows']
+            progress.add('parse', time.perf_counter() - phase_started, rows=row_count, cached=True)
+        else:
+            # Read the workbook (or .csv/.parquet file)
+            print(f"📖 Reading file: {file_path}...", flush=True)
+            df = read_frame(file_path, sheet_name, 'souvenirs')
+            row_count = len(df)
+            
+            print(f"📊 Found {len(df)} rows in file", flush=True)
+            progress.add('parse', time.perf_counter() - phase_started, rows=row_count)
+            phase_started = time.perf_counter()
+            
+            # Clean and validate the whole sheet at once
             try:
-                # Get required fields
-                team_name = str(row['Team Name']).strip() if pd.notna(row['Team Name']) else ""
-                souvenir_name = str(row['Souvenir Name']).strip() if pd.notna(row['Souvenir Name']) else ""
-                price = float(row['Price']) if pd.notna(row['Price']) else 0
-                category = str(row['Category']).strip() if pd.notna(row['Category']) else ""
-                is_traditional = bool(row.get('Is Traditional', False)) if pd.notna(row.get('Is Traditional', False)) else False
-                
-                # Validate required fields
-                if not (team_name and souvenir_name and price > 0 and category):
-                    print(f"⚠️ Skipping row {index + 1}: Missing required fields", flush=True)
-                    skipped_count += 1
-                    continue
-                
-                # Validate category
-                valid_categories = ['Apparel', 'Accessories', 'Collectibles', 'Food & Beverage']
-                if category not in valid_categories:
-                    print(f"⚠️ Skipping row {index + 1}: Invalid category '{category}'. Must be one of: {', '.join(valid_categories)}", flush=True)
-                    skipped_count += 1
-                    continue
-                
-                # Group by team
-                if team_name not in teams_souvenirs:
-                    teams_souvenirs[team_name] = []
-                
-                teams_souvenirs[team_name].append({
-                    "_id": ObjectId(),
-                    "name": souvenir_name,
-                    "price": price,
-                    "category": category,
-                    "isTraditional": is_traditional
-                })
-                
+                records, rejections = validate_frame(df, 'souvenirs')
+                if cache is not None:
+                    cache.store(file_hash, 'souvenirs', {
+                        "sheet": sheet_name,
+                        "columns": [str(c).strip() for c in df.columns],
+                        "rows": len(df),
+                        "records": records,
+                        "rejections": rejections,
+                    })
             except KeyError as e:
                 print(f"❌ Column not found: {e}", flush=True)
                 print(f"   Available columns: {list(df.columns)}", flush=True)
                 print(f"   Required columns: Team Name, Souvenir Name, Price, Category, Is Traditional (optional)", flush=True)
-                break
-            except Exception as e:
-                print(f"❌ Error processing row {index + 1}: {e}", flush=True)
-                skipped_count += 1
-                continue
+                records, rejections = [], []
+            progress.add('validate', time.perf_counter() - phase_started, rows=row_count)
+        report_rejections(rejections)
+        skipped_count += len(rejections)
+        
+        # Group souvenirs by team
+        teams_souvenirs = {}
+        for record in records:
+            teams_souvenirs.setdefault(record['teamName'], []).append({
+                "_id": ObjectId(),
+                "name": record['name'],
+                "price": record['price'],
+                "category": record['category'],
+                "isTraditional": record['isTraditional']
+            })
         
         # Update each team's souvenirs
-        for team_name, souvenirs in teams_souvenirs.items():
-            try:
-                # Find the team
-                team = teams_collection.find_one({"teamName": team_name})
-                
-                if not team:
+        resolve_seconds = 0.0
+        phase_started = time.perf_counter()
+        if sync and teams_souvenirs:
+            # Diff against the stored souvenirs so only what changed is written
+            if async_pipeline:
+                print("⚠️ --async is ignored with --sync: the diff is sent as one bulk write", flush=True)
+            stored_teams = {team['teamName']: team for team in teams_collection.find(
+                {"teamName": {"$in": list(teams_souvenirs)}}, {"teamName": 1, "souvenirs": 1})}
+            resolve_seconds = time.perf_counter() - phase_started
+            round_trips += 1
+            operations = []
+            for team_name, souvenirs in teams_souvenirs.items():
+                team = stored_teams.get(team_name)
+                if team is None:
                     print(f"⚠️ Team '{team_name}' not found, skipping souvenirs", flush=True)
                     skipped_count += len(souvenirs)
                     continue
                 
-                # Replace all souvenirs for this team
-                teams_collection.update_one(
-                    {"teamName": team_name},
-                    {"$set": {"souvenirs": souvenirs}}
-                )
-                
-                updated_count += 1
+                team_operations, counts = plan_souvenir_sync(team, souvenirs)
+                for key, value in counts.items():
+                    sync_counts[key] += value
                 teams_processed.add(team_name)
-                print(f"✅ Updated souvenirs for '{team_name}': {len(souvenirs)} items", flush=True)
-                
-            except Exception as e:
-                print(f"❌ Error updating souvenirs for '{team_name}': {e}", flush=True)
-                skipped_count += len(souvenirs)
-                continue
+                if team_operations:
+                    operations.extend(team_operations)
+                    updated_count += 1
+                    print(f"✅ Synced souvenirs for '{team_name}': {counts['added']} added, "
+                          f"{counts['updated']} updated, {counts['removed']} removed", flush=True)
+                else:
+                    print(f"⏸️  Souvenirs for '{team_name}' unchanged", flush=True)
+            
+            if operations:
+                # Every team's field-level changes go out in a single unordered round trip
+                try:
+                    teams_collection.bulk_write(operations, ordered=False)
+                except BulkWriteError as e:
+                    for write_error in e.details.get('writeErrors', []):
+                        print(f"❌ Error writing operation {write_error['index']}: {write_error.get('errmsg')}", flush=True)
+                    error_count = len(e.details.get('writeErrors', []))
+                round_trips += 1
+        elif async_pipeline and teams_souvenirs:
+            # One lookup for every known team, then keyed $set writes on concurrent async writers
+            existing = {team['teamName'] for team in teams_collection.find(
+                {"teamName": {"$in": list(teams_souvenirs)}}, {"_id": 0, "teamName": 1})}
+            resolve_seconds = time.perf_counter() - phase_started
+            round_trips += 1
+            updates = []
+            for team_name, souvenirs in teams_souvenirs.items():
+                if team_name not in existing:
+                    print(f"⚠️ Team '{team_name}' not found, skipping souvenirs", flush=True)
+                    skipped_count += len(souvenirs)
+                    continue
+                updates.append({"teamName": team_name, "souvenirs": souvenirs})
+            
+            writers = run_async_import(
+                teams_collection.name, db.name, ("teamName",),
+                [updates[i:i + DEFAULT_BATCH_SIZE] for i in range(0, len(updates), DEFAULT_BATCH_SIZE)],
+                writers=async_writers, queue_size=queue_size
+            )
+            error_count = sum(writer.stats['errors'] for writer in writers)
+            round_trips += sum(writer.stats['round_trips'] for writer in writers)
+            if error_count:
+                print(f"❌ {error_count} souvenir updates failed", flush=True)
+            else:
+                for update in updates:
+                    updated_count += 1
+                    teams_processed.add(update['teamName'])
+                    print(f"✅ Updated souvenirs for '{update['teamName']}': {len(update['souvenirs'])} items", flush=True)
+        else:
+            for team_name, souvenirs in teams_souvenirs.items():
+                try:
+                    # Find the team
+                    lookup_started = time.perf_counter()
+                    team = teams_collection.find_one({"teamName": team_name})
+                    resolve_seconds += time.perf_counter() - lookup_started
+                    round_trips += 1
+                    
+                    if not team:
+                        print(f"⚠️ Team '{team_name}' not found, skipping souvenirs", flush=True)
+                        skipped_count += len(souvenirs)
+                        continue
+                    
+                    # Replace all souvenirs for this team
+                    teams_collection.update_one(
+                        {"teamName": team_name},
+                        {"$set": {"souvenirs": souvenirs}}
+                    )
+                    round_trips += 1
+                    
+                    updated_count += 1
+                    teams_processed.add(team_name)
+                    print(f"✅ Updated souvenirs for '{team_name}': {len(souvenirs)} items", flush=True)
+                    
+                except Exception as e:
+                    print(f"❌ Error updating souvenirs for '{team_name}': {e}", flush=True)
+                    skipped_count += len(souvenirs)
+                    error_count += 1
+                    continue
+        progress.add('resolve', resolve_seconds, rows=len(teams_souvenirs))
+        progress.add('write', time.perf_counter() - phase_started - resolve_seconds, rows=len(records))
         
         # Print summary
         print(f"\n📊 Import Summary:", flush=True)
         print(f"   ✅ Updated: {updated_count} teams", flush=True)
         print(f"   📦 Total souvenirs imported: {sum(len(s) for s in teams_souvenirs.values())}", flush=True)
+        if sync:
+            print(f"   🔄 Souvenirs: {sync_counts['added']} added, {sync_counts['updated']} updated, "
+                  f"{sync_counts['removed']} removed, {sync_counts['unchanged']} unchanged", flush=True)
         print(f"   ⏭️  Skipped: {skipped_count} rows (invalid data or team not found)", flush=True)
         
         if teams_processed:
@@ -118,20 +262,52 @@ def import_souvenirs(file_path=None):
             for team in sorted(teams_processed):
                 souvenir_count = len(teams_souvenirs[team])
                 print(f"   • {team}: {souvenir_count} souvenirs", flush=True)
+        progress.print_phases()
         
-        return True
+        progress.summary(
+            success=not error_count,
+            rows=row_count,
+            round_trips=round_trips,
+            inserted=0,
+            updated=updated_count,
+            souvenirs=sum(len(s) for s in teams_souvenirs.values()),
+            **({"souvenirsAdded": sync_counts['added'], "souvenirsUpdated": sync_counts['updated'],
+                "souvenirsRemoved": sync_counts['removed'], "souvenirsUnchanged": sync_counts['unchanged']}
+               if sync else {}),
+            skipped=skipped_count,
+            errors=error_count,
+        )
+        return not error_count
         
     except Exception as error:
         print(f"❌ Error importing souvenirs: {error}", flush=True)
         import traceback
         traceback.print_exc()
+        progress.summary(success=False, error=str(error))
         return False
     finally:
         client.close()
 
 if __name__ == "__main__":
     # Allow file path as command line argument
-    file_path = sys.argv[1] if len(sys.argv) > 1 else None
-    result = import_souvenirs(file_path)
+    parser = argparse.ArgumentParser(description="Import team souvenirs from Excel, CSV or Parquet")
+    parser.add_argument("file_path", nargs="?", default=None)
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse the workbook instead of using the on-disk parse cache")
+    parser.add_argument("--progress", choices=PROGRESS_MODES, default="text",
+                        help="jsonl: write phase timings and a final summary as JSON lines on stdout")
+    parser.add_argument("--async", dest="async_pipeline", action="store_true",
+                        help="Write through concurrent asyncio writers fed by a bounded queue (needs pymongo>=4.10)")
+    parser.add_argument("--async-writers", type=int, default=DEFAULT_ASYNC_WRITERS,
+                        help="Number of concurrent writer coroutines in --async mode")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Batches each async writer may have waiting before the parser pauses")
+    parser.add_argument("--sync", action="store_true",
+                        help="Match souvenirs by name, keep their ids and write only field-level changes")
+    args = parser.parse_args()
+    with progress_output(args.progress, 'souvenirs') as progress:
+        result = import_souvenirs(args.file_path, use_cache=not args.no_cache, progress=progress,
+                                  async_pipeline=args.async_pipeline, async_writers=args.async_writers,
+                                  queue_size=args.queue_size, sync=args.sync)
     sys.exit(0 if result else 1)
 
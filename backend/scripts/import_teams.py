@@ -1,9 +1,19 @@
-import pandas as pd
-import pymongo
-from pymongo import MongoClient
+from pymongo import DeleteMany, InsertOne, MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
+import argparse
 import sys
 import os
+import time
+from async_pipeline import DEFAULT_ASYNC_WRITERS, DEFAULT_QUEUE_SIZE, run_async_import
+from bulk_writer import DEFAULT_BATCH_SIZE
+from import_manifest import ImportManifest, file_sha256, sheet_fingerprints
+from optimal_trips import precompute_optimal_trips
+from parse_cache import ParseCache
+from shortest_paths import precompute_shortest_paths
+from progress import PROGRESS_MODES, ProgressReporter, progress_output
+from validation import validate_frame, report_rejections
+from workbook_reader import list_sheet_names, read_frame
 
 # MongoDB connection - use environment variable or default to localhost
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
@@ -11,7 +21,33 @@ client = MongoClient(MONGODB_URI)
 db = client['nfl-vacation']
 teams_collection = db['teams']
 
-def import_teams(file_path=None):
+TEAM_KEY = ("teamName",)
+
+DEFAULT_SOUVENIRS = [
+    {"name": "Signed helmets", "price": 74.99, "category": "Collectibles", "isTraditional": True},
+    {"name": "Autographed Football", "price": 79.89, "category": "Collectibles", "isTraditional": True},
+    {"name": "Team pennant", "price": 17.99, "category": "Accessories", "isTraditional": True},
+    {"name": "Team picture", "price": 29.99, "category": "Collectibles", "isTraditional": True},
+    {"name": "Team jersey", "price": 199.99, "category": "Apparel", "isTraditional": True}
+]
+
+
+def load_existing_teams():
+    """Return ``{teamName: souvenir count}`` for every team in one projected query."""
+    cursor = teams_collection.aggregate([
+        {"$project": {
+            "_id": 0,
+            "teamName": 1,
+            "souvenirCount": {"$size": {"$ifNull": ["$souvenirs", []]}}
+        }}
+    ])
+    return {doc['teamName']: doc['souvenirCount'] for doc in cursor}
+
+
+def import_teams(file_path=None, full=False, use_cache=True, progress=None, async_pipeline=False,
+                 async_writers=DEFAULT_ASYNC_WRITERS, queue_size=DEFAULT_QUEUE_SIZE, prune=False,
+                 shortest_paths=True):
+    progress = progress or ProgressReporter('teams')
     try:
         print("🔌 Connecting to MongoDB...", flush=True)
         
@@ -22,119 +58,268 @@ def import_teams(file_path=None):
         # Check if file exists
         if not os.path.exists(file_path):
             print(f"❌ File not found: {file_path}", flush=True)
+            progress.summary(success=False, error=f"File not found: {file_path}")
             return False
         
-        # Read Excel file
-        print(f"📖 Reading Excel file: {file_path}...", flush=True)
-        df = pd.read_excel(file_path)
+        round_trips = 0
+        phase_started = time.perf_counter()
+        
+        # Content hashes from the previous import decide what needs writing
+        sheet_name = list_sheet_names(file_path)[0]
+        manifest = ImportManifest(db, 'teams', TEAM_KEY, prune=prune).load([sheet_name])
+        fingerprint = sheet_fingerprints(file_path).get(sheet_name)
+        progress.add('open', time.perf_counter() - phase_started)
         
-        print(f"📊 Found {len(df)} rows in Excel file", flush=True)
+        if not full and manifest.is_sheet_unchanged(sheet_name, fingerprint):
+            kept = manifest.keep_sheet(sheet_name)
+            print(f"⏭️  Sheet '{sheet_name}' unchanged since last import ({kept} teams), nothing to do", flush=True)
+            print(f"\n📊 Import Summary:", flush=True)
+            print(f"   ⏸️  Unchanged: {kept} teams", flush=True)
+            print(f"   🔁 Round trips: {manifest.round_trips}", flush=True)
+            progress.print_phases()
+            progress.summary(rows=0, round_trips=manifest.round_trips, inserted=0, updated=0, deleted=0,
+                             unchanged=kept, skipped=0, errors=0)
+            return True
         
         # Track statistics
         inserted_count = 0
         updated_count = 0
+        deleted_count = 0
+        unchanged_count = 0
         skipped_count = 0
+        error_count = 0
         
-        # Process each row
-        for index, row in df.iterrows():
-            try:
-                # Skip the "Expansion" row (row 33)
-                if str(row['Team(s)']).strip() == 'Expansion':
+        # A file parsed before is served from the on-disk parse cache
+        phase_started = time.perf_counter()
+        cache = ParseCache() if use_cache else None
+        file_hash = file_sha256(file_path) if cache is not None else None
+        parsed = cache.load(file_hash, 'teams', sheet_name) if cache is not None else None
+        
+        if parsed is not None:
+            print(f"💾 Loaded '{sheet_name}' from parse cache ({parsed['rows']} rows)", flush=True)
+            records, rejections = parsed['records'], parsed['rejections']
+            row_count = parsed['rows']
+            progress.add('parse', time.perf_counter() - phase_started, rows=row_count, cached=True)
+        else:
+            # Read the workbook (or .csv/.parquet file)
+            print(f"📖 Reading file: {file_path}...", flush=True)
+            df = read_frame(file_path, sheet_name, 'teams')
+            
+            print(f"📊 Found {len(df)} rows in file", flush=True)
+            progress.add('parse', time.perf_counter() - phase_started, rows=len(df))
+            phase_started = time.perf_counter()
+            
+            # Skip the "Expansion" row (row 33)
+            if 'Team(s)' in df.columns:
+                expansion_rows = df['Team(s)'].astype(str).str.strip() == 'Expansion'
+                for index in df.index[expansion_rows]:
                     print(f"⚠️ Skipping expansion row {index + 1}", flush=True)
-                    continue
-                
-                # Clean and map data with correct column names
-                team_name = str(row['Team(s)']).strip() if pd.notna(row['Team(s)']) else ""
-                conference = str(row['Conference']).strip() if pd.notna(row['Conference']) else ""
-                division = str(row['Division ']).strip() if pd.notna(row['Division ']) else ""
-                stadium_name = str(row['Name']).strip() if pd.notna(row['Name']) else ""
-                
-                # Only process if all required fields are present
-                if not (team_name and conference and division and stadium_name):
-                    print(f"⚠️ Skipping row {index + 1}: Missing required fields", flush=True)
-                    skipped_count += 1
-                    continue
-                
-                # Check if team already exists
-                existing_team = teams_collection.find_one({"teamName": team_name})
-                
-                # Prepare stadium data
-                stadium_data = {
-                        "name": stadium_name,
-                        "location": str(row['Location']).strip() if pd.notna(row['Location']) else "",
-                        "seatingCapacity": int(float(row['Capacity'])) if pd.notna(row['Capacity']) else 0,
-                        "surfaceType": str(row['Surface']).strip() if pd.notna(row['Surface']) else "",
-                        "roofType": str(row['Roof Type']).strip() if pd.notna(row['Roof Type']) else "",
-                        "yearOpened": int(float(row['Opened'])) if pd.notna(row['Opened']) else 0
-                    }
-                
-                if existing_team:
-                    # Update existing team - preserve souvenirs but update other fields
-                    update_data = {
-                        "$set": {
-                            "conference": conference,
-                            "division": division,
-                            "stadium": stadium_data
-                        }
-                    }
-                    teams_collection.update_one(
-                        {"teamName": team_name},
-                        update_data
-                    )
-                    updated_count += 1
-                    print(f"🔄 Updated: {team_name} - {stadium_name} (preserved {len(existing_team.get('souvenirs', []))} souvenirs)", flush=True)
-                else:
-                    # Create new team document with default souvenirs
-                    team = {
-                        "teamName": team_name,
-                        "conference": conference,
-                        "division": division,
-                        "stadium": stadium_data,
-                        "souvenirs": [
-                            {"_id": ObjectId(), "name": "Signed helmets", "price": 74.99, "category": "Collectibles", "isTraditional": True},
-                            {"_id": ObjectId(), "name": "Autographed Football", "price": 79.89, "category": "Collectibles", "isTraditional": True},
-                            {"_id": ObjectId(), "name": "Team pennant", "price": 17.99, "category": "Accessories", "isTraditional": True},
-                            {"_id": ObjectId(), "name": "Team picture", "price": 29.99, "category": "Collectibles", "isTraditional": True},
-                            {"_id": ObjectId(), "name": "Team jersey", "price": 199.99, "category": "Apparel", "isTraditional": True}
-                        ]
-                    }
-                    
-                    # Insert new team
-                    teams_collection.insert_one(team)
-                    inserted_count += 1
-                    print(f"✅ Inserted: {team_name} - {stadium_name} ({team['stadium']['seatingCapacity']}) with {len(team['souvenirs'])} default souvenirs", flush=True)
-                    
+                df = df[~expansion_rows]
+            row_count = len(df)
+            
+            # Clean and validate the whole sheet at once
+            try:
+                records, rejections = validate_frame(df, 'teams')
+                if cache is not None:
+                    cache.store(file_hash, 'teams', {
+                        "sheet": sheet_name,
+                        "columns": [str(c).strip() for c in df.columns],
+                        "rows": len(df),
+                        "records": records,
+                        "rejections": rejections,
+                    })
             except KeyError as e:
                 print(f"❌ Column not found: {e}", flush=True)
                 print(f"   Available columns: {list(df.columns)}", flush=True)
-                break
-            except Exception as e:
-                print(f"❌ Error processing row {index + 1}: {e}", flush=True)
-                skipped_count += 1
-                continue
+                manifest.keep_sheet(sheet_name)
+                fingerprint = None
+                records, rejections = [], []
+            progress.add('validate', time.perf_counter() - phase_started, rows=row_count)
+        report_rejections(rejections)
+        skipped_count += len(rejections)
+        
+        # Only rows whose content changed since the last import are written
+        changed, unchanged_count = manifest.filter_changed(sheet_name, records)
+        if full:
+            changed, unchanged_count = records, 0
+        
+        # One projected query tells us which teams exist and how many souvenirs they keep
+        with progress.phase('resolve', rows=len(changed)):
+            existing_teams = load_existing_teams() if changed else {}
+        if changed:
+            round_trips += 1
+        
+        # Decide insert versus update in memory; a team repeated in the sheet keeps its last row
+        phase_started = time.perf_counter()
+        planned = {}
+        for record in changed:
+            team_name = record['teamName']
+            stadium_data = {
+                "name": record['stadiumName'],
+                "location": record['location'],
+                "seatingCapacity": record['seatingCapacity'],
+                "surfaceType": record['surfaceType'],
+                "roofType": record['roofType'],
+                "yearOpened": record['yearOpened']
+            }
+            
+            team = {
+                "teamName": team_name,
+                "conference": record['conference'],
+                "division": record['division'],
+                "stadium": stadium_data
+            }
+            if team_name in existing_teams:
+                # Update existing team - preserve souvenirs but update other fields
+                operation = UpdateOne({"teamName": team_name}, {"$set": {k: v for k, v in team.items() if k != "teamName"}})
+                message = f"🔄 Updated: {team_name} - {record['stadiumName']} (preserved {existing_teams[team_name]} souvenirs)"
+            else:
+                # Create new team document with default souvenirs
+                team["souvenirs"] = [{"_id": ObjectId(), **souvenir} for souvenir in DEFAULT_SOUVENIRS]
+                operation = InsertOne(team)
+                message = f"✅ Inserted: {team_name} - {record['stadiumName']} ({record['seatingCapacity']}) with {len(team['souvenirs'])} default souvenirs"
+            planned[team_name] = (team, operation, message)
+        
+        operations = [operation for _, operation, _ in planned.values()]
+        messages = [message for _, _, message in planned.values()]
+        
+        # With --prune, teams imported from this sheet before but no longer in it
+        # (their souvenirs go with them)
+        removed_teams = [key[0] for key in manifest.removed_keys()]
+        if removed_teams:
+            operations.append(DeleteMany({"teamName": {"$in": removed_teams}}))
+        
+        failed = set()
+        if async_pipeline and operations:
+            # Opt-in: keyed upserts spread over concurrent async writers
+            teams = [team for team, _, _ in planned.values()]
+            writers = run_async_import(
+                teams_collection.name, db.name, TEAM_KEY,
+                [teams[i:i + DEFAULT_BATCH_SIZE] for i in range(0, len(teams), DEFAULT_BATCH_SIZE)],
+                removed_keys=lambda: [(team_name,) for team_name in removed_teams],
+                writers=async_writers, queue_size=queue_size
+            )
+            for writer in writers:
+                stats = writer.stats
+                inserted_count += stats['inserted']
+                updated_count += stats['updated'] + stats['unchanged']
+                deleted_count += stats['deleted']
+                error_count += stats['errors']
+                round_trips += stats['round_trips']
+            skipped_count += error_count
+        elif operations:
+            # Every insert, update and removal goes out in a single unordered round trip
+            try:
+                result = teams_collection.bulk_write(operations, ordered=False)
+                inserted_count = result.inserted_count
+                updated_count = result.matched_count
+                deleted_count = result.deleted_count
+            except BulkWriteError as e:
+                details = e.details
+                inserted_count = details.get('nInserted', 0)
+                updated_count = details.get('nMatched', 0)
+                deleted_count = details.get('nRemoved', 0)
+                for write_error in details.get('writeErrors', []):
+                    failed.add(write_error['index'])
+                    print(f"❌ Error writing operation {write_error['index']}: {write_error.get('errmsg')}", flush=True)
+                error_count = len(failed)
+                skipped_count += error_count
+            round_trips += 1
+        
+        for index, message in enumerate(messages):
+            if index not in failed:
+                print(message, flush=True)
+        if removed_teams and len(messages) not in failed:
+            for team_name in removed_teams:
+                print(f"🗑️  Removed: {team_name} (no longer in the sheet)", flush=True)
+        progress.add('write', time.perf_counter() - phase_started, rows=len(operations))
+        
+        # Only remember this import once every write went through
+        if error_count:
+            print("⚠️ Some teams failed to import; the import manifest was not updated", flush=True)
+        else:
+            with progress.phase('manifest'):
+                manifest.save({sheet_name: fingerprint} if fingerprint else {})
         
         # Print summary
         print(f"\n📊 Import Summary:", flush=True)
         print(f"   ✅ Inserted: {inserted_count} teams", flush=True)
         print(f"   🔄 Updated: {updated_count} teams", flush=True)
+        print(f"   🗑️  Deleted: {deleted_count} teams", flush=True)
+        print(f"   ⏸️  Unchanged: {unchanged_count} teams", flush=True)
         print(f"   ⏭️  Skipped: {skipped_count} teams (invalid data)", flush=True)
         
         # Verify total count
         total_count = teams_collection.count_documents({})
+        round_trips += 1
         print(f"📈 Total teams in database: {total_count}", flush=True)
+        print(f"   🔁 Round trips: {round_trips + manifest.round_trips}", flush=True)
+        progress.print_phases()
+        
+        # Teams are the graph's nodes (and their stadiums its edge endpoints), so
+        # the precomputed shortest paths and optimal trips are stale after a change
+        graph_changed = inserted_count or updated_count or deleted_count
+        if shortest_paths and graph_changed:
+            try:
+                print("", flush=True)
+                with progress.phase('shortest_paths'):
+                    precompute_shortest_paths(db)
+            except Exception as e:
+                print(f"⚠️ Shortest-path precomputation failed: {e}", flush=True)
+            try:
+                print("", flush=True)
+                with progress.phase('optimal_trips'):
+                    precompute_optimal_trips(db)
+            except Exception as e:
+                print(f"⚠️ Optimal-trip precomputation failed: {e}", flush=True)
         
-        return True
+        progress.summary(
+            success=not error_count,
+            rows=row_count,
+            round_trips=round_trips + manifest.round_trips,
+            inserted=inserted_count,
+            updated=updated_count,
+            deleted=deleted_count,
+            unchanged=unchanged_count,
+            skipped=skipped_count,
+            errors=error_count,
+            total=total_count,
+        )
+        return not error_count
         
     except Exception as error:
         print(f"❌ Error importing teams: {error}", flush=True)
         import traceback
         traceback.print_exc()
+        progress.summary(success=False, error=str(error))
         return False
     finally:
         client.close()
 
 if __name__ == "__main__":
     # Allow file path as command line argument
-    file_path = sys.argv[1] if len(sys.argv) > 1 else None
-    result = import_teams(file_path)
+    parser = argparse.ArgumentParser(description="Import teams and stadiums from Excel, CSV or Parquet")
+    parser.add_argument("file_path", nargs="?", default=None)
+    parser.add_argument("--full", action="store_true",
+                        help="Re-import every row even if the manifest says it is unchanged")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always parse the workbook instead of using the on-disk parse cache")
+    parser.add_argument("--progress", choices=PROGRESS_MODES, default="text",
+                        help="jsonl: write phase timings and a final summary as JSON lines on stdout")
+    parser.add_argument("--async", dest="async_pipeline", action="store_true",
+                        help="Write through concurrent asyncio writers fed by a bounded queue (needs pymongo>=4.10)")
+    parser.add_argument("--async-writers", type=int, default=DEFAULT_ASYNC_WRITERS,
+                        help="Number of concurrent writer coroutines in --async mode")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Batches each async writer may have waiting before the parser pauses")
+    parser.add_argument("--prune", action="store_true",
+                        help="Delete teams (and their souvenirs) imported from this sheet before but no longer in it")
+    parser.add_argument("--skip-shortest-paths", action="store_true",
+                        help="Do not refresh the precomputed shortest-path matrices and optimal trips after the import")
+    args = parser.parse_args()
+    with progress_output(args.progress, 'teams') as progress:
+        result = import_teams(args.file_path, full=args.full, use_cache=not args.no_cache, progress=progress,
+                              async_pipeline=args.async_pipeline, async_writers=args.async_writers,
+                              queue_size=args.queue_size, prune=args.prune,
+                              shortest_paths=not args.skip_shortest_paths)
     sys.exit(0 if result else 1)
\ No newline at end of file
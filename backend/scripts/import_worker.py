@@ -0,0 +1,284 @@
+"""Long-lived import worker.
+
+Loads pandas, openpyxl and every importer once and shares one pooled
+MongoClient between them, then runs import jobs sent as JSON lines:
+
+    {"id": "42", "type": "teams", "file": "/path/teams-stadiums.xlsx", "options": {"full": true}}
+
+Jobs arrive on stdin (default) or on a Unix socket (``--socket PATH``).
+Each job answers with ``queued``, ``started``, one ``log`` event per output
+line, ``progress`` events carrying phase timings and a final ``done`` event
+with the import's summary record. Jobs run one at a time because the importers
+share module state; when ``--max-queue`` jobs are already waiting, new ones
+get a ``rejected`` event instead of piling up.
+"""
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from progress import ProgressReporter
+
+import import_distances
+import import_souvenirs
+import import_teams
+import purchase_rollups
+import restore_default_souvenirs
+
+MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+DEFAULT_MAX_QUEUE = 8
+
+JOBS = {
+    'teams': (import_teams, import_teams.import_teams),
+    'distances': (import_distances, import_distances.import_distances),
+    'souvenirs': (import_souvenirs, import_souvenirs.import_souvenirs),
+    'restore_souvenirs': (restore_default_souvenirs, restore_default_souvenirs.restore_default_souvenirs),
+    'purchase_rollups': (purchase_rollups, purchase_rollups.update_purchase_rollups),
+}
+
+
+class SharedClient:
+    """One pooled MongoClient handed to every importer; their ``close()`` calls leave it open."""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def __getitem__(self, name):
+        return self._client[name]
+
+    def close(self):
+        pass
+
+
+def share_connection(module, client, db_name=None):
+    # Point the importer's module-level client, db and collections at the shared pool
+    original = module.client
+    db = client[db_name or module.db.name]
+    module.client = SharedClient(client)
+    module.db = db
+    for name, value in list(vars(module).items()):
+        if isinstance(value, Collection):
+            setattr(module, name, db[value.name])
+    original.close()
+
+
+class LineStream:
+    """File-like object that turns everything printed during a job into ``log`` events."""
+
+    def __init__(self, emit, stream_name):
+        self.emit = emit
+        self.stream_name = stream_name
+        self.buffer = ''
+        self.lines = []
+
+    def write(self, text):
+        self.buffer += text
+        while '\n' in self.buffer:
+            line, self.buffer = self.buffer.split('\n', 1)
+            self._emit_line(line)
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def close_line(self):
+        if self.buffer:
+            self._emit_line(self.buffer)
+            self.buffer = ''
+
+    def getvalue(self):
+        return '\n'.join(self.lines) + ('\n' if self.lines else '')
+
+    def _emit_line(self, line):
+        self.lines.append(line)
+        self.emit({"event": "log", "stream": self.stream_name, "line": line})
+
+
+def run_job(job, emit):
+    """Run one import job and return its ``done`` event."""
+    stdout = LineStream(emit, 'stdout')
+    stderr = LineStream(emit, 'stderr')
+    started_at = time.perf_counter()
+    success = False
+    progress = None
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            _, function = JOBS[job['type']]
+            args = [job['file']] if job.get('file') else []
+            options = dict(job.get('options') or {})
+            if 'progress' in inspect.signature(function).parameters:
+                progress = ProgressReporter(job['type'], sink=lambda record: emit({"event": "progress", "record": record}))
+                options['progress'] = progress
+            success = bool(function(*args, **options))
+        except SystemExit as e:
+            # import_distances exits instead of returning False
+            success = e.code in (0, None)
+        except Exception as e:
+            print(f"❌ Import worker error: {e}", flush=True)
+            traceback.print_exc()
+    stdout.close_line()
+    stderr.close_line()
+
+    return {
+        "event": "done",
+        "success": success,
+        "output": stdout.getvalue(),
+        "errors": stderr.getvalue(),
+        "summary": progress.summary_record if progress is not None else None,
+        "elapsed": round(time.perf_counter() - started_at, 3),
+    }
+
+
+class JobScheduler:
+    """Bounded FIFO of import jobs drained by a single runner thread."""
+
+    def __init__(self, max_queue=DEFAULT_MAX_QUEUE):
+        self.jobs = queue.Queue(maxsize=max(1, int(max_queue)))
+        self.runner = threading.Thread(target=self._run, name='import-runner', daemon=True)
+        self.runner.start()
+
+    def submit(self, job, emit):
+        """Queue ``job``; ``emit`` receives its events. Returns False when the queue is full."""
+        job_id = job.get('id')
+
+        def emit_for_job(event):
+            emit({"id": job_id, **event})
+
+        if job.get('type') not in JOBS:
+            emit_for_job({"event": "rejected", "error": f"Unknown import type: {job.get('type')!r}"})
+            return False
+        try:
+            self.jobs.put_nowait((job, emit_for_job))
+        except queue.Full:
+            emit_for_job({"event": "rejected", "error": "Import queue is full, try again later"})
+            return False
+        emit_for_job({"event": "queued", "position": self.jobs.qsize()})
+        return True
+
+    def join(self):
+        self.jobs.join()
+
+    def _run(self):
+        while True:
+            job, emit = self.jobs.get()
+            try:
+                emit({"event": "started"})
+                emit(run_job(job, emit))
+            finally:
+                self.jobs.task_done()
+
+
+def handle_line(line, scheduler, emit):
+    line = line.strip()
+    if not line:
+        return
+    try:
+        job = json.loads(line)
+    except ValueError as e:
+        emit({"event": "rejected", "error": f"Invalid JSON: {e}"})
+        return
+    if job.get('type') == 'ping':
+        emit({"id": job.get('id'), "event": "pong"})
+        return
+    scheduler.submit(job, emit)
+
+
+def make_emitter(stream):
+    lock = threading.Lock()
+
+    def emit(event):
+        payload = json.dumps(event, default=str) + '\n'
+        with lock:
+            try:
+                stream.write(payload)
+                stream.flush()
+            except (OSError, ValueError):
+                # The client disconnected; the job still runs to completion
+                pass
+    return emit
+
+
+def serve_stdin(scheduler):
+    # Keep fd 1 for the protocol only; anything else (e.g. pool processes) goes to stderr
+    protocol = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    emit = make_emitter(protocol)
+    emit({"event": "ready", "pid": os.getpid(), "types": sorted(JOBS)})
+
+    for line in sys.stdin:
+        handle_line(line, scheduler, emit)
+    # stdin closed: finish what was already accepted, then exit
+    scheduler.join()
+
+
+class _SocketWriter:
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        self.wfile.write(text.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
+
+
+def serve_socket(scheduler, socket_path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            emit = make_emitter(_SocketWriter(self.wfile))
+            for raw in self.rfile:
+                handle_line(raw.decode('utf-8'), scheduler, emit)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    server.daemon_threads = True
+    print(f"🚀 Import worker {os.getpid()} listening on {socket_path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        os.remove(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run imports in a long-lived worker process")
+    parser.add_argument("--socket", default=None,
+                        help="Listen on this Unix socket instead of reading jobs from stdin")
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE,
+                        help="Maximum number of jobs waiting to run before new ones are rejected")
+    args = parser.parse_args()
+
+    # Importers resolve default file names relative to the scripts directory
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    client = MongoClient(MONGODB_URI)
+    for module, _ in JOBS.values():
+        share_connection(module, client)
+
+    scheduler = JobScheduler(max_queue=args.max_queue)
+    try:
+        if args.socket:
+            serve_socket(scheduler, args.socket)
+        else:
+            serve_stdin(scheduler)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Precomputed optimal visiting orders for fixed sets of teams.
+
+For every division, every conference and every saved itinerary the shortest
+trip visiting all of its teams is solved exactly with Held-Karp over the
+all-pairs shortest-path distances, and stored in ``optimal_trips``: one
+document for the best trip from any start plus one per start team.
+
+Saved itineraries (``{setKey, teams: [teamName, ...], savedAt}`` in
+``saved_itineraries``) are the sets users explicitly saved through
+``POST /api/itineraries``; customRouteService.js caps their size and count
+and lets them expire, and only the newest are solved here.
+"""
+import numpy as np
+from pymongo import ASCENDING, DeleteMany, MongoClient, UpdateOne
+from datetime import datetime, timezone
+import argparse
+import time
+import sys
+import os
+from shortest_paths import build_adjacency, floyd_warshall, reconstruct_path
+
+OPTIMAL_TRIPS_COLLECTION = 'optimal_trips'
+SAVED_ITINERARIES_COLLECTION = 'saved_itineraries'
+
+# The DP table holds 2^n * n costs, so 20 teams is ~170 MB
+MAX_SET_SIZE = 20
+# Saved itineraries solved per run and their largest size, as enforced by
+# customRouteService.js (MAX_SAVED_ITINERARIES, MAX_ITINERARY_SIZE)
+MAX_SAVED_ITINERARIES = 50
+MAX_ITINERARY_SIZE = 16
+# Subsets per vectorised step; bounds the (subsets, n, n) candidate array
+SUBSET_CHUNK_SIZE = 4096
+
+
+def set_key(team_names):
+    # Order-independent key shared with customRouteService.js
+    return "|".join(sorted(team_names))
+
+
+def held_karp(dist):
+    """Shortest Hamiltonian paths through every node of a symmetric ``dist`` matrix.
+
+    Returns ``(cost, parent)``: ``cost[mask, j]`` is the shortest path that
+    visits exactly the nodes in ``mask`` and ends at ``j``; ``parent`` holds
+    the node visited before ``j``. Each subset size is relaxed for all
+    subsets and end nodes at once.
+    """
+    n = len(dist)
+    nodes = np.arange(n)
+    bits = 1 << nodes
+    masks = np.arange(1 << n)
+    popcount = ((masks[:, None] >> nodes) & 1).sum(axis=1)
+
+    cost = np.full((1 << n, n), np.inf)
+    parent = np.full((1 << n, n), -1, dtype=np.int8)
+    cost[bits, nodes] = 0.0
+    # incoming[j, i] = dist[i, j]
+    incoming = dist.T[None, :, :]
+
+    for size in range(2, n + 1):
+        layer = masks[popcount == size]
+        for start in range(0, len(layer), SUBSET_CHUNK_SIZE):
+            chunk = layer[start:start + SUBSET_CHUNK_SIZE]
+            contains = (chunk[:, None] & bits) != 0
+            # candidates[m, j, i]: reach chunk[m] minus j ending at i, then step i -> j
+            candidates = cost[chunk[:, None] ^ bits] + incoming
+            best = candidates.argmin(axis=2)
+            best_cost = np.take_along_axis(candidates, best[..., None], axis=2)[..., 0]
+            cost[chunk] = np.where(contains, best_cost, np.inf)
+            parent[chunk] = np.where(contains, best, -1)
+    return cost, parent
+
+
+def walk_back(parent, end):
+    """Visiting order of the full-set path ending at ``end``, listed from ``end`` backwards."""
+    mask = parent.shape[0] - 1
+    order = [end]
+    node = end
+    while True:
+        previous = parent[mask, node]
+        if previous < 0:
+            return order
+        mask ^= 1 << node
+        node = int(previous)
+        order.append(node)
+
+
+def solve_set(members, dist):
+    """Return ``{start: (total, order)}`` plus ``None`` for the best start.
+
+    ``members`` are node indices. Distances are symmetric, so the best path
+    ending at ``s`` read backwards is the best path starting at ``s``: one
+    DP answers every start.
+    """
+    cost, parent = held_karp(dist[np.ix_(members, members)])
+    full = cost[-1]
+    trips = {}
+    for local, node in enumerate(members):
+        if np.isfinite(full[local]):
+            trips[node] = (float(full[local]), [members[i] for i in walk_back(parent, local)])
+    if trips:
+        best = min(trips, key=lambda node: trips[node][0])
+        trips[None] = trips[best]
+    return trips
+
+
+def expand_trip(order, nodes, weights, pred):
+    """Full team path (including pass-through teams) and its direct edges."""
+    path = [order[0]]
+    for source, target in zip(order, order[1:]):
+        path.extend(reconstruct_path(pred[source], source, target)[1:])
+    edges = [
+        {"from": nodes[a], "to": nodes[b], "distance": float(weights[a, b])}
+        for a, b in zip(path, path[1:])
+    ]
+    return [nodes[i] for i in path], edges
+
+
+def collect_team_sets(db, teams):
+    """Return ``[(kind, label, team_names)]`` for divisions, conferences and saved itineraries."""
+    groups = {}
+    for team in teams:
+        for kind in ('division', 'conference'):
+            label = " ".join(str(team.get(kind) or '').split())
+            if label:
+                groups.setdefault((kind, label), []).append(team['teamName'])
+    team_sets = [(kind, label, names) for (kind, label), names in sorted(groups.items())]
+
+    itineraries = (db[SAVED_ITINERARIES_COLLECTION]
+                   .find({"savedAt": {"$exists": True}}, {"name": 1, "teams": 1})
+                   .sort([("savedAt", -1), ("_id", 1)])
+                   .limit(MAX_SAVED_ITINERARIES))
+    for itinerary in itineraries:
+        names = list(dict.fromkeys(itinerary.get('teams') or []))
+        if 2 <= len(names) <= MAX_ITINERARY_SIZE:
+            label = itinerary.get('name') or f"itinerary of {len(names)} teams"
+            team_sets.append(('itinerary', label, names))
+    return team_sets
+
+
+def precompute_optimal_trips(db):
+    print("🧭 Precomputing optimal trips (Held-Karp)...", flush=True)
+    started_at = time.perf_counter()
+
+    teams = list(db['teams'].find({}, {"_id": 0, "teamName": 1, "conference": 1, "division": 1, "stadium.name": 1}))
+    distances = list(db['distances'].find({}, {"_id": 0, "teamName": 1, "endingStadium": 1, "distance": 1}))
+    nodes, weights, _ = build_adjacency(teams, distances)
+    if not nodes:
+        print("⚠️ No teams found, skipping optimal-trip precomputation", flush=True)
+        return 0
+    dist, pred = floyd_warshall(weights)
+    index = {name: i for i, name in enumerate(nodes)}
+
+    computed_at = datetime.now(timezone.utc)
+    operations = []
+    keys = set()
+    for kind, label, names in collect_team_sets(db, teams):
+        members = [index[name] for name in names if name in index]
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_SET_SIZE:
+            print(f"   ⏭️  {label}: {len(members)} teams is above the {MAX_SET_SIZE}-team limit, skipping", flush=True)
+            continue
+
+        set_started = time.perf_counter()
+        key = set_key(nodes[i] for i in members)
+        keys.add(key)
+        trips = solve_set(members, dist)
+        for start, (total, order) in trips.items():
+            path, edges = expand_trip(order, nodes, weights, pred)
+            start_team = nodes[start] if start is not None else None
+            operations.append(UpdateOne(
+                {"setKey": key, "startTeam": start_team},
+                {"$set": {
+                    "kind": kind,
+                    "label": label,
+                    "teams": sorted(nodes[i] for i in members),
+                    "route": [nodes[i] for i in order],
+                    "path": path,
+                    "edges": edges,
+                    "totalDistance": round(total, 2),
+                    "computedAt": computed_at,
+                }},
+                upsert=True
+            ))
+        if len(trips) <= len(members):
+            print(f"   ⚠️  {label}: some teams are unreachable from the rest of the set", flush=True)
+        print(f"   ✅ {label}: {len(members)} teams in {time.perf_counter() - set_started:.2f}s", flush=True)
+
+    collection = db[OPTIMAL_TRIPS_COLLECTION]
+    collection.create_index([("setKey", ASCENDING), ("startTeam", ASCENDING)], unique=True)
+    # Sets that no longer exist (renamed divisions, deleted itineraries) are dropped
+    operations.append(DeleteMany({"setKey": {"$nin": sorted(keys)}}))
+    collection.bulk_write(operations, ordered=False)
+
+    elapsed = time.perf_counter() - started_at
+    print(f"   ✅ Stored {len(operations) - 1} trips for {len(keys)} team sets in {elapsed:.2f}s", flush=True)
+    return len(keys)
+
+
+def lookup_optimal_trip(db, team_names, start_team=None):
+    """Return the stored optimal trip for a set of teams, or ``None`` if it was not precomputed."""
+    return db[OPTIMAL_TRIPS_COLLECTION].find_one(
+        {"setKey": set_key(team_names), "startTeam": start_team}, {"_id": 0}
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute optimal trips for divisions, conferences and saved itineraries"
+    )
+    parser.parse_args()
+    MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    client = MongoClient(MONGODB_URI)
+    try:
+        print("🔌 Connecting to MongoDB...", flush=True)
+        precompute_optimal_trips(client['nfl-vacation'])
+        result = True
+    except Exception as error:
+        print(f"❌ Error precomputing optimal trips: {error}", flush=True)
+        import traceback
+        traceback.print_exc()
+        result = False
+    finally:
+        client.close()
+    sys.exit(0 if result else 1)
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from validation import missing_columns, validate_frame
+from workbook_reader import list_sheet_names, read_sheet
+
+# Writer threads share the caller's MongoClient connection pool
+DEFAULT_WRITER_THREADS = 4
+# Parse workers start a fresh interpreter instead of forking: the pool is
+# created from threaded callers (the import worker, the writer threads) that
+# hold a MongoClient, and neither threads nor the client's sockets survive a
+# fork. Workers only parse and validate; any client they need is their own.
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+
+def parse_sheet(file_path, sheet_name, import_type, check=None):
+    """Parse and validate one sheet. Runs inside a worker process.
+
+    ``check`` (e.g. ``geo.DistanceCheck``) maps the raw frame to
+    ``(frame, filled, flags)`` before validation.
+    """
+    started_at = time.perf_counter()
+    columns, frame = read_sheet(file_path, sheet_name, import_type)
+    filled, flags = 0, []
+    if check is not None and not missing_columns(columns, import_type):
+        frame, filled, flags = check(frame)
+    result = {
+        "sheet": sheet_name,
+        "columns": columns,
+        "missing": missing_columns(columns, import_type),
+        "rows": len(frame),
+        "records": [],
+        "rejections": [],
+        "filled": filled,
+        "flags": flags,
+    }
+    read_at = time.perf_counter()
+    if not result["missing"]:
+        result["records"], result["rejections"] = validate_frame(frame, import_type)
+    result["read_seconds"] = read_at - started_at
+    result["validate_seconds"] = time.perf_counter() - read_at
+    result["parse_seconds"] = time.perf_counter() - started_at
+    return result
+
+
+def iter_parsed_sheets(file_path, import_type, workers, sheet_names=None, check=None):
+    """Parse every sheet of a workbook in a process pool.
+
+    Results are yielded as soon as each sheet finishes, so the caller can start
+    writing one sheet while the pool is still parsing the others.
+    """
+    if sheet_names is None:
+        sheet_names = list_sheet_names(file_path)
+    workers = max(1, min(workers, len(sheet_names) or 1))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT) as pool:
+        futures = [
+            pool.submit(parse_sheet, file_path, sheet_name, import_type, check)
+            for sheet_name in sheet_names
+        ]
+        for future in as_completed(futures):
+            yield future.result()
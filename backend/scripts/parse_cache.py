@@ -0,0 +1,158 @@
+import hashlib
+import io
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from validation import SCHEMAS
+
+# Bump when validation output changes so stale cache files are never read
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.import_cache')
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _encode_strings(values):
+    # Dictionary-encode strings: one array of distinct values plus int32 codes
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return codes.astype(np.int32), np.array(list(uniques), dtype=str)
+
+
+def _decode_strings(codes, uniques):
+    return uniques[codes].tolist() if len(codes) else []
+
+
+class ParseCache:
+    """On-disk cache of parsed, validated sheets keyed by the upload's SHA-256.
+
+    Each sheet is stored as one compressed ``.npz`` file holding its validated
+    columns (strings dictionary-encoded), its rejection report and a small JSON
+    header. Files are evicted least-recently-used once the directory grows
+    past ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.getenv('IMPORT_CACHE_DIR', DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_mb = os.getenv('IMPORT_CACHE_MAX_MB')
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_CACHE_MAX_BYTES
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, file_hash, import_type, sheet_name):
+        sheet_digest = hashlib.sha1(str(sheet_name).encode('utf-8')).hexdigest()[:16]
+        name = f"v{CACHE_FORMAT_VERSION}-{import_type}-{file_hash}-{sheet_digest}.npz"
+        return os.path.join(self.cache_dir, name)
+
+    def load(self, file_hash, import_type, sheet_name):
+        """Return a parsed-sheet dict (see ``parallel_import.parse_sheet``) or ``None``."""
+        path = self.path_for(file_hash, import_type, sheet_name)
+        started_at = time.perf_counter()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['__meta__']))
+                columns = []
+                for field in meta['fields']:
+                    if meta['kinds'][field] == 'str':
+                        columns.append(_decode_strings(data[f'codes__{field}'], data[f'values__{field}']))
+                    else:
+                        columns.append(data[f'col__{field}'].tolist())
+                reasons = _decode_strings(data['reject_codes'], data['reject_values'])
+                rejections = [
+                    {'row': row, 'reason': reason}
+                    for row, reason in zip(data['reject_rows'].tolist(), reasons)
+                ]
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable cache file {os.path.basename(path)}: {e}", flush=True)
+            self.misses += 1
+            return None
+
+        # Touch the file so eviction treats it as recently used
+        os.utime(path, None)
+        self.hits += 1
+        fields = meta['fields']
+        return {
+            "sheet": meta['sheet'],
+            "columns": meta['columns'],
+            "missing": [],
+            "rows": meta['rows'],
+            "records": [dict(zip(fields, row)) for row in zip(*columns)] if fields else [],
+            "rejections": rejections,
+            "parse_seconds": time.perf_counter() - started_at,
+        }
+
+    def store(self, file_hash, import_type, parsed):
+        if parsed.get('missing'):
+            return
+        kinds = {spec['field']: spec['kind'] for spec in SCHEMAS[import_type]}
+        fields = list(kinds)
+        records = parsed['records']
+        arrays = {}
+        for field in fields:
+            values = [record[field] for record in records]
+            if kinds[field] == 'str':
+                arrays[f'codes__{field}'], arrays[f'values__{field}'] = _encode_strings(values)
+            elif kinds[field] == 'bool':
+                arrays[f'col__{field}'] = np.array(values, dtype=bool)
+            elif kinds[field] == 'int':
+                arrays[f'col__{field}'] = np.array(values, dtype=np.int64)
+            else:
+                arrays[f'col__{field}'] = np.array(values, dtype=np.float64)
+
+        rejections = parsed['rejections']
+        arrays['reject_rows'] = np.array([r['row'] for r in rejections], dtype=np.int64)
+        arrays['reject_codes'], arrays['reject_values'] = _encode_strings([r['reason'] for r in rejections])
+        arrays['__meta__'] = np.array(json.dumps({
+            "sheet": parsed['sheet'],
+            "columns": parsed['columns'],
+            "rows": parsed['rows'],
+            "fields": fields,
+            "kinds": kinds,
+        }))
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(file_hash, import_type, parsed['sheet'])
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        # Write to a temp file first so a crash never leaves a truncated entry
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        try:
+            entries = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith('.npz')
+            ]
+        except FileNotFoundError:
+            return 0
+
+        stats = []
+        for path in entries:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in stats)
+        evicted = 0
+        for _, size, path in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                evicted += 1
+            except FileNotFoundError:
+                continue
+        return evicted
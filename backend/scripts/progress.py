@@ -0,0 +1,115 @@
+import contextlib
+import json
+import resource
+import sys
+import time
+
+PROGRESS_MODES = ('text', 'jsonl')
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def json_sink(stream):
+    def write(record):
+        stream.write(json.dumps(record, default=str) + '\n')
+        stream.flush()
+    return write
+
+
+class ProgressReporter:
+    """Per-phase timings and counters for one import.
+
+    Phases (open, parse, validate, resolve, write, ...) accumulate across
+    sheets and batches. With a ``sink`` every phase and the final summary are
+    also emitted as JSON-ready dicts; without one the reporter only collects
+    them for the human-readable summary.
+    """
+
+    def __init__(self, import_type, sink=None):
+        self.import_type = import_type
+        self.sink = sink
+        self.phases = {}
+        self.phase_rows = {}
+        self.started_at = time.perf_counter()
+        self.summary_record = None
+
+    def emit(self, event, **fields):
+        if self.sink is not None:
+            self.sink({"event": event, "importType": self.import_type, "ts": round(time.time(), 3), **fields})
+
+    def add(self, name, seconds, rows=None, **fields):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if rows is not None:
+            self.phase_rows[name] = self.phase_rows.get(name, 0) + rows
+        record = {"phase": name, "seconds": round(seconds, 4), "totalSeconds": round(self.phases[name], 4)}
+        if rows is not None:
+            record["rows"] = rows
+            record["rowsPerSec"] = round(rows / seconds, 1) if seconds > 0 else None
+        self.emit("phase", **record, **fields)
+
+    @contextlib.contextmanager
+    def phase(self, name, rows=None, **fields):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started_at, rows=rows, **fields)
+
+    def timed_iter(self, name, iterable, **fields):
+        # Charge the time spent producing each item (e.g. reading a chunk) to ``name``
+        iterator = iter(iterable)
+        while True:
+            started_at = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - started_at, **fields)
+                return
+            rows = len(item) if hasattr(item, '__len__') else None
+            self.add(name, time.perf_counter() - started_at, rows=rows, **fields)
+            yield item
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def summary(self, success=True, rows=0, round_trips=0, **counts):
+        """Emit and return the final record with exact counts for this import."""
+        elapsed = self.elapsed
+        self.summary_record = {
+            "success": bool(success),
+            "rows": rows,
+            **counts,
+            "roundTrips": round_trips,
+            "elapsed": round(elapsed, 4),
+            "rowsPerSec": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "peakRssMb": peak_rss_mb(),
+            "childrenPeakRssMb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        }
+        self.emit("summary", **self.summary_record)
+        return self.summary_record
+
+    def print_phases(self):
+        if self.phases:
+            print("   ⏱️  Phases: " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items()), flush=True)
+        print(f"   🧠 Peak RSS: {peak_rss_mb():.1f} MB", flush=True)
+
+
+@contextlib.contextmanager
+def progress_output(mode, import_type):
+    """Yield the reporter for a ``--progress`` mode.
+
+    In ``jsonl`` mode stdout carries only JSON records and the usual status
+    lines move to stderr, so the output can be piped straight into a parser.
+    """
+    if mode != 'jsonl':
+        yield ProgressReporter(import_type)
+        return
+    reporter = ProgressReporter(import_type, sink=json_sink(sys.stdout))
+    with contextlib.redirect_stdout(sys.stderr):
+        yield reporter
@@ -0,0 +1,207 @@
+"""Pre-aggregated purchase revenue, maintained incrementally.
+
+Completed purchases are folded into ``purchase_rollups``: one document per
+``(sessionId, dimension, key)`` holding the quantity sold and the revenue,
+for the ``stadium``, ``team``, ``category`` and ``souvenir`` dimensions plus a
+``total`` row that also counts purchases. Rows with ``sessionId: null`` are
+totals across all sessions.
+
+Each run only reads purchases whose ``purchaseDate`` is after the stored
+watermark. Completed purchases are never edited, so adding their items to the
+running totals is enough.
+"""
+from pymongo import ASCENDING, MongoClient, UpdateOne
+from datetime import datetime, timedelta, timezone
+import argparse
+import time
+import sys
+import os
+
+ROLLUPS_COLLECTION = 'purchase_rollups'
+ROLLUP_STATE_COLLECTION = 'purchase_rollup_state'
+STATE_ID = 'purchases'
+
+# Rollup dimension -> purchase item field used as its key
+DIMENSIONS = {
+    'stadium': 'stadiumName',
+    'team': 'teamName',
+    'category': 'category',
+    'souvenir': 'souvenirId',
+}
+# Checkout stamps purchaseDate before the write lands, so the newest
+# purchases are left for the next run instead of risking a skip
+DEFAULT_LAG_SECONDS = 60
+
+MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+client = MongoClient(MONGODB_URI)
+db = client['nfl-vacation']
+
+
+def purchase_window(watermark, cutoff):
+    """Match completed purchases with ``watermark < purchaseDate <= cutoff``."""
+    dates = {"$lte": cutoff}
+    if watermark is not None:
+        dates["$gt"] = watermark
+    return {"status": "completed", "purchaseDate": dates}
+
+
+def aggregate_window(purchases, match):
+    """Return ``(souvenir_groups, session_totals)`` for the purchases in ``match``.
+
+    Items are grouped per session and souvenir inside MongoDB, so only one
+    row per souvenir sold crosses the wire.
+    """
+    souvenir_groups = purchases.aggregate([
+        {"$match": match},
+        {"$unwind": "$items"},
+        {"$group": {
+            "_id": {
+                "sessionId": "$sessionId",
+                "souvenirId": "$items.souvenirId",
+                "stadiumName": "$items.stadiumName",
+                "teamName": "$items.teamName",
+                "category": "$items.category",
+            },
+            "souvenirName": {"$last": "$items.souvenirName"},
+            "quantity": {"$sum": "$items.quantity"},
+            "revenue": {"$sum": {"$multiply": ["$items.price", "$items.quantity"]}},
+        }},
+    ])
+    session_totals = purchases.aggregate([
+        {"$match": match},
+        {"$group": {"_id": "$sessionId", "purchases": {"$sum": 1}, "revenue": {"$sum": "$totalAmount"}}},
+    ])
+    return list(souvenir_groups), list(session_totals)
+
+
+def fold_rollups(souvenir_groups, session_totals):
+    """Fold grouped items into ``{(sessionId, dimension, key): row}`` increments.
+
+    Every group counts towards its own session and towards the
+    all-sessions rows (``sessionId`` ``None``).
+    """
+    rows = {}
+
+    def add(session_id, dimension, key, quantity, revenue, labels=None):
+        for owner in (session_id, None):
+            row = rows.setdefault((owner, dimension, key), {"quantity": 0, "revenue": 0.0, "labels": {}})
+            row["quantity"] += quantity
+            row["revenue"] += revenue
+            if labels:
+                row["labels"].update(labels)
+
+    for group in souvenir_groups:
+        item = group["_id"]
+        quantity = group["quantity"]
+        revenue = group["revenue"]
+        for dimension, field in DIMENSIONS.items():
+            labels = None
+            if dimension == 'souvenir':
+                labels = {
+                    "souvenirName": group["souvenirName"],
+                    "stadiumName": item.get("stadiumName"),
+                    "teamName": item.get("teamName"),
+                    "category": item.get("category"),
+                }
+            add(item["sessionId"], dimension, item.get(field), quantity, revenue, labels)
+        add(item["sessionId"], 'total', None, quantity, 0.0)
+
+    # The total row takes revenue from totalAmount, as getGrandTotal() does
+    for session in session_totals:
+        for owner in (session["_id"], None):
+            row = rows.setdefault((owner, 'total', None), {"quantity": 0, "revenue": 0.0, "labels": {}})
+            row["revenue"] += session["revenue"]
+            row["purchases"] = row.get("purchases", 0) + session["purchases"]
+    return rows
+
+
+def rollup_operations(rows, updated_at):
+    operations = []
+    for (session_id, dimension, key), row in rows.items():
+        increments = {"quantity": row["quantity"], "revenue": row["revenue"]}
+        if "purchases" in row:
+            increments["purchases"] = row["purchases"]
+        operations.append(UpdateOne(
+            {"sessionId": session_id, "dimension": dimension, "key": key},
+            {"$inc": increments, "$set": {**row["labels"], "updatedAt": updated_at}},
+            upsert=True
+        ))
+    return operations
+
+
+def roll_up_purchases(db, rebuild=False, lag_seconds=DEFAULT_LAG_SECONDS):
+    """Fold purchases completed since the last run into ``purchase_rollups``.
+
+    The window being applied is recorded as ``pending`` before any rollup is
+    written and cleared together with the new watermark. A run that finds a
+    leftover ``pending`` window was interrupted mid-write, so it rebuilds
+    the rollups from scratch rather than counting that window twice.
+    Returns the number of purchases folded in.
+    """
+    started_at = time.perf_counter()
+    purchases = db['purchases']
+    rollups = db[ROLLUPS_COLLECTION]
+    state_collection = db[ROLLUP_STATE_COLLECTION]
+    state = state_collection.find_one({"_id": STATE_ID}) or {}
+
+    if state.get('pending') is not None and not rebuild:
+        print("⚠️ The previous rollup run did not finish, rebuilding from scratch", flush=True)
+        rebuild = True
+
+    watermark = None if rebuild else state.get('watermark')
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=lag_seconds)
+    if watermark is not None and watermark.tzinfo is None:
+        watermark = watermark.replace(tzinfo=timezone.utc)
+    if watermark is not None and watermark >= cutoff:
+        print("✅ Purchase rollups are already up to date", flush=True)
+        return 0
+
+    state_collection.update_one({"_id": STATE_ID}, {"$set": {"pending": cutoff}}, upsert=True)
+    if rebuild:
+        print("🧹 Clearing existing purchase rollups...", flush=True)
+        rollups.delete_many({})
+    else:
+        since = watermark.isoformat() if watermark is not None else 'the beginning'
+        print(f"📈 Rolling up purchases since {since}...", flush=True)
+
+    souvenir_groups, session_totals = aggregate_window(purchases, purchase_window(watermark, cutoff))
+    purchase_count = sum(session["purchases"] for session in session_totals)
+    rows = fold_rollups(souvenir_groups, session_totals)
+    if rows:
+        rollups.create_index([("sessionId", ASCENDING), ("dimension", ASCENDING), ("key", ASCENDING)], unique=True)
+        rollups.bulk_write(rollup_operations(rows, datetime.now(timezone.utc)), ordered=False)
+
+    state_collection.update_one(
+        {"_id": STATE_ID},
+        {"$set": {"watermark": cutoff, "updatedAt": datetime.now(timezone.utc)}, "$unset": {"pending": ""}}
+    )
+
+    elapsed = time.perf_counter() - started_at
+    print(f"   ✅ Folded {purchase_count} purchases into {len(rows)} rollup rows in {elapsed:.2f}s", flush=True)
+    return purchase_count
+
+
+def update_purchase_rollups(rebuild=False, lag_seconds=DEFAULT_LAG_SECONDS):
+    """Run ``roll_up_purchases`` on the module database; the entry point for the CLI and the import worker."""
+    try:
+        print("🔌 Connecting to MongoDB...", flush=True)
+        roll_up_purchases(db, rebuild=rebuild, lag_seconds=lag_seconds)
+        return True
+    except Exception as error:
+        print(f"❌ Error rolling up purchases: {error}", flush=True)
+        import traceback
+        traceback.print_exc()
+        return False
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fold new completed purchases into the revenue rollups")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Discard the rollups and recompute them from every completed purchase")
+    parser.add_argument("--lag", type=float, default=DEFAULT_LAG_SECONDS,
+                        help=f"Leave purchases newer than this many seconds for the next run (default: {DEFAULT_LAG_SECONDS})")
+    args = parser.parse_args()
+    result = update_purchase_rollups(rebuild=args.rebuild, lag_seconds=args.lag)
+    sys.exit(0 if result else 1)
@@ -0,0 +1,201 @@
+"""Load a ``mongodump`` snapshot such as ``backend/backup/nfl-vacation`` without ``mongorestore``.
+
+Each ``<collection>.bson`` file is streamed one document at a time and sent
+as raw BSON in unordered ``insert_many`` batches, one collection per worker
+thread. The indexes listed in ``<collection>.metadata.json`` are built after
+the data is in, so each one is built once over the full collection.
+"""
+from pymongo import IndexModel, MongoClient
+from pymongo.errors import BulkWriteError, OperationFailure
+from bson import decode_file_iter, json_util
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import time
+import sys
+import os
+from import_checkpoint import CHECKPOINT_COLLECTION
+from import_manifest import MANIFEST_COLLECTION, MANIFEST_ROWS_COLLECTION
+from purchase_rollups import roll_up_purchases
+
+DEFAULT_BACKUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backup', 'nfl-vacation')
+INSERT_BATCH_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+# Index options mongodump records that are not createIndexes options
+IGNORED_INDEX_OPTIONS = {'v', 'key', 'ns', 'background'}
+# Import types whose manifest and checkpoint describe a collection's contents
+IMPORT_TYPES = {'teams': 'teams', 'distances': 'distances'}
+# Documents stay raw BSON from the file to the wire, never decoded to dicts
+RAW_BSON = CodecOptions(document_class=RawBSONDocument)
+
+
+def list_backup_collections(backup_dir):
+    return sorted(name[:-len('.bson')] for name in os.listdir(backup_dir) if name.endswith('.bson'))
+
+
+def read_metadata(backup_dir, collection_name):
+    path = os.path.join(backup_dir, f"{collection_name}.metadata.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json_util.loads(f.read())
+
+
+def iter_document_batches(bson_path, batch_size=INSERT_BATCH_SIZE):
+    """Yield lists of at most ``batch_size`` raw documents, reading the file incrementally."""
+    with open(bson_path, 'rb') as f:
+        batch = []
+        for document in decode_file_iter(f, RAW_BSON):
+            batch.append(document)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def index_models(metadata):
+    """``IndexModel`` for every index in the metadata except the implicit ``_id_``."""
+    models = []
+    for spec in metadata.get('indexes', []):
+        if spec.get('name') == '_id_':
+            continue
+        options = {name: value for name, value in spec.items() if name not in IGNORED_INDEX_OPTIONS}
+        models.append(IndexModel(list(spec['key'].items()), **options))
+    return models
+
+
+def insert_batch(collection, batch):
+    """Insert one batch and return ``(inserted, duplicates)``.
+
+    Documents whose ``_id`` already exists are skipped; any other write
+    error is raised.
+    """
+    try:
+        return len(collection.insert_many(batch, ordered=False).inserted_ids), 0
+    except BulkWriteError as error:
+        details = error.details
+        failures = [e for e in details.get('writeErrors', []) if e.get('code') != DUPLICATE_KEY_ERROR]
+        if failures:
+            raise
+        return details.get('nInserted', 0), len(details.get('writeErrors', []))
+
+
+def forget_import_state(db, collection_names):
+    """Drop import manifests and checkpoints for restored collections.
+
+    They describe what the importers last wrote; after a restore the next
+    import must compare against the restored data, not skip rows as unchanged.
+    """
+    import_types = [IMPORT_TYPES[name] for name in collection_names if name in IMPORT_TYPES]
+    if not import_types:
+        return
+    db[MANIFEST_COLLECTION].delete_many({"importType": {"$in": import_types}})
+    db[MANIFEST_ROWS_COLLECTION].delete_many({"importType": {"$in": import_types}})
+    db[CHECKPOINT_COLLECTION].delete_many({"_id": {"$in": import_types}})
+    print(f"🧹 Cleared import manifests for: {', '.join(import_types)}", flush=True)
+
+
+def refresh_purchase_rollups(db, collection_names):
+    """Rebuild the purchase rollups when ``purchases`` was restored.
+
+    The rollups and their watermark were computed from the purchases the
+    restore replaced; folding new purchases on top of them would report
+    stale totals and skip or double-count purchases.
+    """
+    if 'purchases' in collection_names:
+        roll_up_purchases(db, rebuild=True)
+
+
+def restore_collection(db, backup_dir, collection_name, drop=False, batch_size=INSERT_BATCH_SIZE):
+    started_at = time.perf_counter()
+    collection = db[collection_name]
+    if drop:
+        db.drop_collection(collection_name)
+
+    inserted = 0
+    duplicates = 0
+    for batch in iter_document_batches(os.path.join(backup_dir, f"{collection_name}.bson"), batch_size):
+        batch_inserted, batch_duplicates = insert_batch(collection, batch)
+        inserted += batch_inserted
+        duplicates += batch_duplicates
+
+    models = index_models(read_metadata(backup_dir, collection_name))
+    if models:
+        try:
+            collection.create_indexes(models)
+        except OperationFailure as error:
+            # e.g. an existing index of the same name with other options
+            print(f"⚠️ Could not rebuild indexes on '{collection_name}': {error}", flush=True)
+
+    elapsed = time.perf_counter() - started_at
+    message = f"   ✅ {collection_name}: {inserted} documents, {len(models)} indexes in {elapsed:.2f}s"
+    if duplicates:
+        message += f" ({duplicates} already present, skipped)"
+    print(message, flush=True)
+    return inserted
+
+
+def restore_backup(db, backup_dir=DEFAULT_BACKUP_DIR, collections=None, drop=False,
+                   workers=4, batch_size=INSERT_BATCH_SIZE):
+    """Restore ``collections`` (default: every ``.bson`` file in ``backup_dir``) into ``db``.
+
+    With ``drop`` each collection is dropped before it is loaded, so the
+    database ends up matching the snapshot. Returns ``{collection: inserted}``.
+    """
+    available = list_backup_collections(backup_dir)
+    if collections:
+        unknown = sorted(set(collections) - set(available))
+        if unknown:
+            raise ValueError(f"No backup for collection(s): {', '.join(unknown)}")
+        available = [name for name in available if name in collections]
+
+    action = "Replacing" if drop else "Loading"
+    print(f"📦 {action} {len(available)} collections from {os.path.abspath(backup_dir)}...", flush=True)
+    started_at = time.perf_counter()
+    counts = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(restore_collection, db, backup_dir, name, drop, batch_size): name
+            for name in available
+        }
+        for future in as_completed(futures):
+            counts[futures[future]] = future.result()
+    forget_import_state(db, available)
+    refresh_purchase_rollups(db, available)
+
+    elapsed = time.perf_counter() - started_at
+    print(f"🎉 Restored {sum(counts.values())} documents in {elapsed:.2f}s", flush=True)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restore a mongodump snapshot (default: backup/nfl-vacation)")
+    parser.add_argument("--dir", default=DEFAULT_BACKUP_DIR,
+                        help="Directory holding the <collection>.bson and .metadata.json files")
+    parser.add_argument("--db", default='nfl-vacation', help="Target database (default: nfl-vacation)")
+    parser.add_argument("--collections", nargs='+',
+                        help="Only restore these collections (default: every .bson file)")
+    parser.add_argument("--drop", action="store_true",
+                        help="Drop each collection before loading it, replacing its contents")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Collections loaded in parallel (default: 4)")
+    parser.add_argument("--batch-size", type=int, default=INSERT_BATCH_SIZE,
+                        help=f"Documents per insert_many (default: {INSERT_BATCH_SIZE})")
+    args = parser.parse_args()
+    MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    client = MongoClient(MONGODB_URI)
+    try:
+        print("🔌 Connecting to MongoDB...", flush=True)
+        restore_backup(client[args.db], backup_dir=args.dir, collections=args.collections, drop=args.drop,
+                       workers=args.workers, batch_size=args.batch_size)
+        result = True
+    except Exception as error:
+        print(f"❌ Error restoring backup: {error}", flush=True)
+        import traceback
+        traceback.print_exc()
+        result = False
+    finally:
+        client.close()
+    sys.exit(0 if result else 1)
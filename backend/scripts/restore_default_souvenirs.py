@@ -1,7 +1,7 @@
-import pymongo
+import argparse
 import sys
 import os
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from bson import ObjectId
 
 # MongoDB connection - use environment variable or default to localhost
@@ -19,95 +19,125 @@ DEFAULT_SOUVENIRS = [
     {"_id": ObjectId(), "name": "Team jersey", "price": 199.99, "category": "Apparel", "isTraditional": True}
 ]
 
-def restore_default_souvenirs():
+# Lookup by name, built once instead of once per team
+DEFAULT_SOUVENIRS_MAP = {s['name']: s for s in DEFAULT_SOUVENIRS}
+RESTORED_FIELDS = ('price', 'category', 'isTraditional')
+
+
+def plan_restoration(souvenirs):
+    """Return ``(updated_souvenirs, restored, added)`` for one team's souvenir list.
+
+    ``restored`` holds ``(name, field, old, new)`` tuples and ``added`` the names
+    of missing defaults; both are empty when the team needs no update.
+    """
+    updated_souvenirs = []
+    restored = []
+    added = []
+
+    for souvenir in souvenirs:
+        default_souvenir = DEFAULT_SOUVENIRS_MAP.get(souvenir.get('name', ''))
+        if default_souvenir is None:
+            # Custom souvenir (not in defaults), keep it
+            updated_souvenirs.append(souvenir)
+            continue
+
+        changes = [
+            (default_souvenir['name'], field, souvenir.get(field), default_souvenir[field])
+            for field in RESTORED_FIELDS
+            if souvenir.get(field) != default_souvenir[field]
+        ]
+        if changes:
+            # Restore to default values (keep existing _id)
+            updated_souvenirs.append({
+                '_id': souvenir.get('_id', ObjectId()),
+                'name': default_souvenir['name'],
+                'price': default_souvenir['price'],
+                'category': default_souvenir['category'],
+                'isTraditional': default_souvenir['isTraditional']
+            })
+            restored.extend(changes)
+        else:
+            updated_souvenirs.append(souvenir)
+
+    # Add missing default souvenirs
+    current_names = {s.get('name', '') for s in updated_souvenirs}
+    for default_souvenir in DEFAULT_SOUVENIRS:
+        if default_souvenir['name'] not in current_names:
+            new_souvenir = default_souvenir.copy()
+            new_souvenir['_id'] = ObjectId()
+            updated_souvenirs.append(new_souvenir)
+            added.append(default_souvenir['name'])
+
+    return updated_souvenirs, restored, added
+
+
+def print_team_diff(team_name, restored, added):
+    print(f"📝 {team_name}:", flush=True)
+    for name, field, old, new in restored:
+        print(f"   ~ {name}: {field} {old!r} -> {new!r}", flush=True)
+    for name in added:
+        print(f"   + {name}", flush=True)
+
+
+def restore_default_souvenirs(dry_run=False):
     try:
         print("🔌 Connecting to MongoDB...", flush=True)
         
-        # Get all teams
-        teams = teams_collection.find({})
-        total_teams = teams_collection.count_documents({})
+        # One cursor over the fields we need; every change is computed in this pass
+        teams = teams_collection.find({}, {"teamName": 1, "souvenirs": 1})
         
-        print(f"📊 Found {total_teams} teams in database", flush=True)
-        
-        updated_count = 0
+        operations = []
+        total_teams = 0
         skipped_count = 0
+        restored_total = 0
+        added_total = 0
         
         for team in teams:
+            total_teams += 1
             team_name = team.get('teamName', 'Unknown')
             current_souvenirs = team.get('souvenirs', [])
+            updated_souvenirs, restored, added = plan_restoration(current_souvenirs)
             
-            # Create a map of default souvenirs by name for quick lookup
-            default_souvenirs_map = {s['name']: s for s in DEFAULT_SOUVENIRS}
-            
-            # Track if we need to update
-            needs_update = False
-            updated_souvenirs = []
-            added_count = 0
-            restored_count = 0
-            
-            # Process existing souvenirs
-            for souvenir in current_souvenirs:
-                souvenir_name = souvenir.get('name', '')
-                
-                # Check if this souvenir matches a default one
-                if souvenir_name in default_souvenirs_map:
-                    default_souvenir = default_souvenirs_map[souvenir_name]
-                    
-                    # Check if price, category, or isTraditional differs from default
-                    if (souvenir.get('price') != default_souvenir['price'] or
-                        souvenir.get('category') != default_souvenir['category'] or
-                        souvenir.get('isTraditional') != default_souvenir['isTraditional']):
-                        # Restore to default values (keep existing _id)
-                        restored_souvenir = {
-                            '_id': souvenir.get('_id', ObjectId()),
-                            'name': default_souvenir['name'],
-                            'price': default_souvenir['price'],
-                            'category': default_souvenir['category'],
-                            'isTraditional': default_souvenir['isTraditional']
-                        }
-                        updated_souvenirs.append(restored_souvenir)
-                        restored_count += 1
-                        needs_update = True
-                    else:
-                        # Already matches default, keep as is
-                        updated_souvenirs.append(souvenir)
-                else:
-                    # Custom souvenir (not in defaults), keep it
-                    updated_souvenirs.append(souvenir)
+            if not restored and not added:
+                skipped_count += 1
+                continue
             
-            # Add missing default souvenirs
-            current_names = {s.get('name', '') for s in updated_souvenirs}
-            for default_souvenir in DEFAULT_SOUVENIRS:
-                if default_souvenir['name'] not in current_names:
-                    new_souvenir = default_souvenir.copy()
-                    new_souvenir['_id'] = ObjectId()
-                    updated_souvenirs.append(new_souvenir)
-                    added_count += 1
-                    needs_update = True
+            restored_names = {name for name, _, _, _ in restored}
+            restored_total += len(restored_names)
+            added_total += len(added)
+            operations.append(UpdateOne(
+                {"_id": team['_id']},
+                {"$set": {"souvenirs": updated_souvenirs}}
+            ))
             
-            # Update if needed
-            if needs_update:
-                teams_collection.update_one(
-                    {"_id": team['_id']},
-                    {"$set": {"souvenirs": updated_souvenirs}}
-                )
-                updated_count += 1
+            if dry_run:
+                print_team_diff(team_name, restored, added)
+            else:
                 messages = []
-                if restored_count > 0:
-                    messages.append(f"restored {restored_count} prices/properties")
-                if added_count > 0:
-                    messages.append(f"added {added_count} missing")
-                message = " and ".join(messages) if messages else "updated"
+                if restored:
+                    messages.append(f"restored {len(restored_names)} prices/properties")
+                if added:
+                    messages.append(f"added {len(added)} missing")
+                message = " and ".join(messages)
                 print(f"✅ {message.capitalize()} for '{team_name}' (now has {len(updated_souvenirs)} items)", flush=True)
-            else:
-                skipped_count += 1
-                print(f"⏭️  Team '{team_name}' already has correct default souvenirs ({len(current_souvenirs)} items), skipping", flush=True)
+        
+        print(f"📊 Found {total_teams} teams in database", flush=True)
+        
+        # Apply every change in a single unordered round trip
+        round_trips = 1
+        if operations and not dry_run:
+            teams_collection.bulk_write(operations, ordered=False)
+            round_trips += 1
         
         # Print summary
-        print(f"\n📊 Restoration Summary:", flush=True)
-        print(f"   ✅ Updated: {updated_count} teams (restored default souvenirs)", flush=True)
-        print(f"   ⏭️  Skipped: {skipped_count} teams (already have souvenirs)", flush=True)
-        print(f"   📦 Total souvenirs restored: {updated_count * len(DEFAULT_SOUVENIRS)}", flush=True)
+        print(f"\n📊 Restoration Summary{' (dry run, nothing written)' if dry_run else ''}:", flush=True)
+        if dry_run:
+            print(f"   📝 Would update: {len(operations)} teams", flush=True)
+        else:
+            print(f"   ✅ Updated: {len(operations)} teams (restored default souvenirs)", flush=True)
+        print(f"   ⏭️  Skipped: {skipped_count} teams (already have default souvenirs)", flush=True)
+        print(f"   📦 Souvenirs restored: {restored_total}, added: {added_total}", flush=True)
+        print(f"   🔁 Round trips: {round_trips}", flush=True)
         
         return True
         
@@ -120,5 +150,9 @@ def restore_default_souvenirs():
         client.close()
 
 if __name__ == "__main__":
-    result = restore_default_souvenirs()
+    parser = argparse.ArgumentParser(description="Restore the default souvenirs on every team")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the per-team changes without writing them")
+    args = parser.parse_args()
+    result = restore_default_souvenirs(dry_run=args.dry_run)
     sys.exit(0 if result else 1)
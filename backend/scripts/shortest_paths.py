@@ -0,0 +1,173 @@
+import numpy as np
+from pymongo import ASCENDING, MongoClient
+from datetime import datetime, timezone
+import time
+import sys
+import os
+
+SHORTEST_PATHS_COLLECTION = 'shortest_paths'
+META_ID = 'current'
+INSERT_CHUNK_SIZE = 500
+
+
+def build_adjacency(teams, distances):
+    """Build the team graph the same way GraphService.buildGraph() does.
+
+    Nodes are teams; each distance document is an undirected edge from its
+    teamName to the team playing at its endingStadium. Missing edges are inf.
+    """
+    nodes = [team['teamName'] for team in teams]
+    index = {name: i for i, name in enumerate(nodes)}
+    stadium_to_team = {}
+    for team in teams:
+        stadium_name = (team.get('stadium') or {}).get('name')
+        if stadium_name:
+            stadium_to_team.setdefault(stadium_name, team['teamName'])
+
+    n = len(nodes)
+    weights = np.full((n, n), np.inf)
+    np.fill_diagonal(weights, 0.0)
+    edge_count = 0
+    for doc in distances:
+        from_index = index.get(doc.get('teamName'))
+        to_index = index.get(stadium_to_team.get(doc.get('endingStadium')))
+        distance = doc.get('distance') or 0
+        if from_index is None or to_index is None or distance <= 0 or from_index == to_index:
+            continue
+        weights[from_index, to_index] = distance
+        weights[to_index, from_index] = distance
+        edge_count += 1
+    return nodes, weights, edge_count
+
+
+def floyd_warshall(weights):
+    """All-pairs shortest paths, vectorized over the (i, j) plane for each k.
+
+    Returns ``(dist, pred)`` where ``pred[i, j]`` is the node before ``j`` on
+    the shortest path from ``i`` (``-1`` when unreachable or ``i == j``).
+    """
+    n = len(weights)
+    dist = weights.astype(np.float64, copy=True)
+    pred = np.where(np.isfinite(dist) & ~np.eye(n, dtype=bool), np.arange(n)[:, None], -1).astype(np.int32)
+    for k in range(n):
+        through_k = dist[:, k, None] + dist[None, k, :]
+        better = through_k < dist
+        if not better.any():
+            continue
+        dist = np.where(better, through_k, dist)
+        pred = np.where(better, pred[k][None, :], pred)
+    return dist, pred
+
+
+def reconstruct_path(predecessors, source_index, target_index):
+    # Walk one predecessor row back from the target to the source
+    if source_index == target_index:
+        return [source_index]
+    if predecessors[target_index] < 0:
+        return []
+    path = [target_index]
+    current = target_index
+    while current != source_index:
+        current = predecessors[current]
+        if current < 0 or len(path) > len(predecessors):
+            return []
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def graph_signature(db):
+    """Count and newest ``updatedAt`` of the teams and distances collections.
+
+    Stored with the matrices; the API compares it with the live collections
+    and falls back to its own Dijkstra when they differ, e.g. after a team is
+    edited through the API without a precomputation run.
+    """
+    signature = {}
+    for name in ('teams', 'distances'):
+        latest = db[name].find_one({"updatedAt": {"$exists": True}}, {"updatedAt": 1}, sort=[("updatedAt", -1)])
+        signature[name] = {
+            "count": db[name].count_documents({}),
+            "updatedAt": latest['updatedAt'] if latest else None,
+        }
+    return signature
+
+
+def store_matrices(db, nodes, dist, pred, edge_count, signature=None):
+    """Write one document per source team under a new version, then switch to it.
+
+    Readers follow the ``current`` meta document, so they never see a
+    half-written version; rows of older versions are removed afterwards.
+    """
+    collection = db[SHORTEST_PATHS_COLLECTION]
+    collection.create_index([("version", ASCENDING), ("source", ASCENDING)])
+
+    previous = collection.find_one({"_id": META_ID}, {"version": 1})
+    version = (previous or {}).get("version", 0) + 1
+
+    rows = []
+    for i, source in enumerate(nodes):
+        row = dist[i]
+        rows.append({
+            "_id": f"{version}:{source}",
+            "version": version,
+            "source": source,
+            "index": i,
+            "distances": [float(d) if np.isfinite(d) else None for d in row.tolist()],
+            "predecessors": pred[i].tolist(),
+        })
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        collection.insert_many(rows[start:start + INSERT_CHUNK_SIZE], ordered=False)
+
+    collection.update_one(
+        {"_id": META_ID},
+        {"$set": {
+            "version": version,
+            "nodes": nodes,
+            "nodeCount": len(nodes),
+            "edgeCount": edge_count,
+            "graph": signature,
+            "computedAt": datetime.now(timezone.utc),
+        }},
+        upsert=True
+    )
+    collection.delete_many({"source": {"$exists": True}, "version": {"$ne": version}})
+    return version
+
+
+def precompute_shortest_paths(db):
+    print("🧮 Precomputing all-pairs shortest paths...", flush=True)
+    started_at = time.perf_counter()
+
+    # Taken first, so an edit made while the matrices are computed marks them stale
+    signature = graph_signature(db)
+    teams = list(db['teams'].find({}, {"_id": 0, "teamName": 1, "stadium.name": 1}))
+    distances = list(db['distances'].find({}, {"_id": 0, "teamName": 1, "endingStadium": 1, "distance": 1}))
+    nodes, weights, edge_count = build_adjacency(teams, distances)
+    if not nodes:
+        print("⚠️ No teams found, skipping shortest-path precomputation", flush=True)
+        return None
+
+    dist, pred = floyd_warshall(weights)
+    version = store_matrices(db, nodes, dist, pred, edge_count, signature)
+
+    elapsed = time.perf_counter() - started_at
+    print(f"   ✅ Stored version {version}: {len(nodes)} teams, {edge_count} edges in {elapsed:.2f}s", flush=True)
+    return version
+
+
+if __name__ == "__main__":
+    MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
+    client = MongoClient(MONGODB_URI)
+    try:
+        print("🔌 Connecting to MongoDB...", flush=True)
+        precompute_shortest_paths(client['nfl-vacation'])
+        result = True
+    except Exception as error:
+        print(f"❌ Error precomputing shortest paths: {error}", flush=True)
+        import traceback
+        traceback.print_exc()
+        result = False
+    finally:
+        client.close()
+    sys.exit(0 if result else 1)
@@ -0,0 +1,43 @@
+def normalize_stadium_name(name):
+    # Collapse internal whitespace and ignore case so "AT&T  Stadium" matches "at&t stadium"
+    return " ".join(str(name).split()).casefold()
+
+
+class StadiumTeamResolver:
+    """Resolves a stadium name to its team using a single projected read of ``teams``.
+
+    The index is loaded lazily on the first lookup, so imports whose sheets all
+    carry a 'Team Name' column never touch the teams collection.
+    """
+
+    def __init__(self, teams_collection):
+        self.teams_collection = teams_collection
+        self.index = None
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        self.index = {}
+        cursor = self.teams_collection.find({}, {"_id": 0, "teamName": 1, "stadium.name": 1})
+        for team in cursor:
+            stadium_name = (team.get('stadium') or {}).get('name')
+            team_name = team.get('teamName')
+            if stadium_name and team_name:
+                # Keep the first team for shared stadiums (e.g. MetLife Stadium)
+                self.index.setdefault(normalize_stadium_name(stadium_name), team_name)
+        return self.index
+
+    def resolve(self, stadium_name):
+        if self.index is None:
+            self.load()
+
+        team_name = self.index.get(normalize_stadium_name(stadium_name))
+        if team_name:
+            self.hits += 1
+            return team_name
+        self.misses += 1
+        return ""
+
+    @property
+    def lookups(self):
+        return self.hits + self.misses
@@ -0,0 +1,151 @@
+"""Synthetic teams / distances / souvenirs workbooks for benchmarking the importers.
+
+Files are deterministic for a given size and seed and use the same headers
+as the real spreadsheets, so every importer reads them unchanged.
+"""
+import argparse
+import os
+import numpy as np
+from openpyxl import Workbook
+from validation import VALID_CATEGORIES, VALID_ROOF_TYPES
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmark_data')
+DEFAULT_SEED = 1960
+
+TEAM_COLUMNS = ['Team(s)', 'Conference', 'Division', 'Name', 'Location', 'Capacity', 'Surface', 'Roof Type', 'Opened']
+SURFACES = ['Grass', 'FieldTurf', 'Hellas Matrix Turf', 'Bermuda Grass']
+DIVISIONS = ['North', 'South', 'East', 'West']
+
+
+def team_name(i):
+    return f"Team {i:05d}"
+
+
+def stadium_name(i):
+    return f"Stadium {i:05d}"
+
+
+def _write_rows(path, sheets):
+    # write_only mode streams rows to disk, so 1M-row sheets stay cheap to build
+    workbook = Workbook(write_only=True)
+    for title, header, rows in sheets:
+        sheet = workbook.create_sheet(title=title)
+        sheet.append(header)
+        for row in rows:
+            sheet.append(row)
+    temp_path = f"{path}.tmp"
+    workbook.save(temp_path)
+    os.replace(temp_path, path)
+
+
+def generate_teams(path, teams, seed=DEFAULT_SEED):
+    rng = np.random.default_rng(seed)
+    capacity = rng.integers(40_000, 95_000, size=teams)
+    opened = rng.integers(1920, 2024, size=teams)
+    roof = rng.integers(0, len(VALID_ROOF_TYPES), size=teams)
+    surface = rng.integers(0, len(SURFACES), size=teams)
+
+    def rows():
+        for i in range(teams):
+            conference = 'AFC' if i % 2 == 0 else 'NFC'
+            yield [
+                team_name(i),
+                conference,
+                f"{conference} {DIVISIONS[(i // 2) % len(DIVISIONS)]}",
+                stadium_name(i),
+                f"City {i}, ST",
+                int(capacity[i]),
+                SURFACES[surface[i]],
+                VALID_ROOF_TYPES[roof[i]],
+                int(opened[i]),
+            ]
+
+    _write_rows(path, [('Teams', TEAM_COLUMNS, rows())])
+
+
+def generate_distances(path, teams, edges, sheets=1, seed=DEFAULT_SEED, invalid_fraction=0.001):
+    """Write ``edges`` distinct directed stadium pairs split across ``sheets`` sheets.
+
+    Even-numbered sheets carry a 'Team Name' column and odd-numbered ones do
+    not, so both the direct path and the stadium -> team fallback are exercised.
+    A small ``invalid_fraction`` of rows gets a non-positive distance.
+    """
+    rng = np.random.default_rng(seed + 1)
+    edges = min(edges, teams * (teams - 1))
+    # Each pair index encodes (begin, offset): end = (begin + 1 + offset) % teams
+    pairs = rng.choice(teams * (teams - 1), size=edges, replace=False)
+    begin = pairs // (teams - 1)
+    end = (begin + 1 + pairs % (teams - 1)) % teams
+    distance = np.round(rng.uniform(50, 3000, size=edges), 1)
+    invalid = rng.random(edges) < invalid_fraction
+    distance[invalid] = -distance[invalid]
+
+    bounds = np.linspace(0, edges, max(1, sheets) + 1).astype(int)
+    workbook_sheets = []
+    for k in range(max(1, sheets)):
+        start, stop = bounds[k], bounds[k + 1]
+        with_team = k % 2 == 0
+        header = (['Team Name'] if with_team else []) + ['Beginning Stadium', 'Ending Stadium', 'Distance']
+
+        def rows(start=start, stop=stop, with_team=with_team):
+            for b, e, d in zip(begin[start:stop].tolist(), end[start:stop].tolist(), distance[start:stop].tolist()):
+                row = [stadium_name(b), stadium_name(e), d]
+                yield [team_name(b)] + row if with_team else row
+
+        workbook_sheets.append((f"Distances {k + 1}", header, rows()))
+    _write_rows(path, workbook_sheets)
+
+
+def generate_souvenirs(path, teams, per_team=5, seed=DEFAULT_SEED):
+    rng = np.random.default_rng(seed + 2)
+    count = teams * per_team
+    price = np.round(rng.uniform(5, 250, size=count), 2)
+    category = rng.integers(0, len(VALID_CATEGORIES), size=count)
+    traditional = rng.random(count) < 0.5
+
+    def rows():
+        for i in range(count):
+            yield [
+                team_name(i // per_team),
+                f"Souvenir {i % per_team}",
+                float(price[i]),
+                VALID_CATEGORIES[category[i]],
+                bool(traditional[i]),
+            ]
+
+    _write_rows(path, [('Souvenirs', ['Team Name', 'Souvenir Name', 'Price', 'Category', 'Is Traditional'], rows())])
+
+
+def generate_suite(teams, edges, sheets=1, souvenirs_per_team=5, seed=DEFAULT_SEED, data_dir=None, force=False):
+    """Return ``{'teams', 'distances', 'souvenirs'}`` paths, generating any that do not exist yet."""
+    directory = os.path.join(data_dir or DEFAULT_DATA_DIR,
+                             f"t{teams}-e{edges}-s{sheets}-p{souvenirs_per_team}-seed{seed}")
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        'teams': os.path.join(directory, 'teams-stadiums.xlsx'),
+        'distances': os.path.join(directory, 'stadium-distances.xlsx'),
+        'souvenirs': os.path.join(directory, 'souvenirs.xlsx'),
+    }
+    if force or not os.path.exists(paths['teams']):
+        generate_teams(paths['teams'], teams, seed)
+    if force or not os.path.exists(paths['distances']):
+        generate_distances(paths['distances'], teams, edges, sheets, seed)
+    if force or not os.path.exists(paths['souvenirs']):
+        generate_souvenirs(paths['souvenirs'], teams, souvenirs_per_team, seed)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic import workbooks")
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--edges", type=int, default=1000)
+    parser.add_argument("--sheets", type=int, default=2)
+    parser.add_argument("--souvenirs-per-team", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=None)
+    parser.add_argument("--force", action="store_true", help="Regenerate files that already exist")
+    args = parser.parse_args()
+    paths = generate_suite(args.teams, args.edges, args.sheets, args.souvenirs_per_team, args.seed,
+                           args.data_dir, args.force)
+    for kind, path in paths.items():
+        print(f"📄 {kind}: {path}", flush=True)
@@ -0,0 +1,53 @@
+import os
+
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+if not hasattr(pymongo, "AsyncMongoClient"):
+    pytest.skip("the async pipeline needs pymongo>=4.10 (AsyncMongoClient)", allow_module_level=True)
+
+from async_pipeline import run_async_import
+
+DB_NAME = "nfl-vacation-test"
+COLLECTION = "async_pipeline_teams"
+
+
+@pytest.fixture
+def teams():
+    # AsyncMongoClient has no in-memory stand-in, so this runs against a live server
+    client = pymongo.MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'),
+                                 serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command('ping')
+    except pymongo.errors.PyMongoError:
+        client.close()
+        pytest.skip("no MongoDB server available")
+    collection = client[DB_NAME][COLLECTION]
+    collection.drop()
+    collection.insert_one({"teamName": "Oakland Raiders", "stadiumName": "Oakland Coliseum"})
+    yield collection
+    collection.drop()
+    client.close()
+
+
+def test_writers_upsert_every_batch_and_apply_removals(teams):
+    batches = [
+        [{"teamName": "Green Bay Packers", "stadiumName": "Lambeau Field"},
+         {"teamName": "Chicago Bears", "stadiumName": "Soldier Field"}],
+        [{"teamName": "Green Bay Packers", "stadiumName": "Lambeau Field (renovated)"},
+         {"teamName": "Detroit Lions", "stadiumName": "Ford Field"}],
+    ]
+
+    writers = run_async_import(COLLECTION, DB_NAME, ("teamName",), batches,
+                               removed_keys=lambda: [("Oakland Raiders",)], writers=2, queue_size=1, batch_size=2)
+
+    stats = [writer.stats for writer in writers]
+    assert sum(s["received"] for s in stats) == 4
+    assert sum(s["deleted"] for s in stats) == 1
+    assert sum(s["errors"] for s in stats) == 0
+    stored = {doc["teamName"]: doc["stadiumName"] for doc in teams.find()}
+    assert stored == {
+        "Green Bay Packers": "Lambeau Field (renovated)",
+        "Chicago Bears": "Soldier Field",
+        "Detroit Lions": "Ford Field",
+    }
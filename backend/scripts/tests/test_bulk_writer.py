@@ -0,0 +1,61 @@
+from bulk_writer import BulkUpsertWriter
+
+DISTANCE_KEY = ("teamName", "beginningStadium", "endingStadium")
+
+
+def distance(team, begin, end, miles):
+    return {"teamName": team, "beginningStadium": begin, "endingStadium": end, "distance": miles}
+
+
+def test_rows_with_the_same_key_are_deduplicated_last_row_wins(db):
+    writer = BulkUpsertWriter(db['distances'], DISTANCE_KEY)
+    writer.add(distance("New York Giants", "MetLife Stadium", "Gillette Stadium", 200))
+    writer.add(distance("New York Giants", "MetLife Stadium", "Gillette Stadium", 215))
+    stats = writer.close()
+
+    assert stats["received"] == 2
+    assert stats["duplicates"] == 1
+    assert stats["inserted"] == 1
+    assert db['distances'].find_one({"teamName": "New York Giants"})["distance"] == 215
+
+
+def test_teams_sharing_a_stadium_keep_separate_rows(db):
+    writer = BulkUpsertWriter(db['distances'], DISTANCE_KEY)
+    writer.add(distance("New York Giants", "MetLife Stadium", "Gillette Stadium", 215))
+    writer.add(distance("New York Jets", "MetLife Stadium", "Gillette Stadium", 215))
+    stats = writer.close()
+
+    assert stats["duplicates"] == 0
+    assert stats["inserted"] == 2
+    assert db['distances'].count_documents({"beginningStadium": "MetLife Stadium"}) == 2
+
+
+def test_key_fields_are_the_filter_not_the_update(db):
+    writer = BulkUpsertWriter(db['distances'], DISTANCE_KEY)
+    writer.add(distance("New York Jets", "MetLife Stadium", "Gillette Stadium", 215))
+    writer.close()
+
+    rewrite = BulkUpsertWriter(db['distances'], DISTANCE_KEY)
+    rewrite.add(distance("New York Jets", "MetLife Stadium", "Gillette Stadium", 220))
+    rewrite.add(distance("New York Jets", "MetLife Stadium", "Gillette Stadium", 220))
+    stats = rewrite.close()
+
+    assert stats["inserted"] == 0
+    assert stats["updated"] == 1
+    assert db['distances'].count_documents({}) == 1
+
+
+def test_flushes_every_batch_size_operations(db):
+    flushes = []
+    writer = BulkUpsertWriter(db['distances'], DISTANCE_KEY, batch_size=2)
+    writer.on_flush = lambda: flushes.append(writer.stats["round_trips"])
+    for miles in range(5):
+        writer.add(distance("Team", f"Stadium {miles}", "Gillette Stadium", miles))
+    writer.delete(("Team", "Stadium 0", "Gillette Stadium"))
+    stats = writer.close()
+
+    assert len(flushes) == 3
+    assert stats["round_trips"] == 3
+    assert stats["inserted"] == 5
+    assert stats["deleted"] == 1
+    assert db['distances'].count_documents({}) == 4
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo import DEFAULT_CIRCUITY, DistanceCheck, GreatCircleIndex, haversine_matrix
+
+STADIUM_TEAMS = {"lambeau field": "Green Bay Packers", "soldier field": "Chicago Bears"}
+
+
+@pytest.fixture
+def index():
+    return GreatCircleIndex(STADIUM_TEAMS)
+
+
+def distances_sheet(rows):
+    return pd.DataFrame(rows, columns=["Beginning Stadium", "Ending Stadium", "Distance"])
+
+
+def test_haversine_matches_known_great_circle_distances():
+    # One degree of longitude on the equator, then New York to Los Angeles
+    lat = np.array([0.0, 0.0, 40.7128, 34.0522])
+    lng = np.array([0.0, 1.0, -74.0060, -118.2437])
+
+    matrix = haversine_matrix(lat, lng)
+
+    assert np.allclose(np.diag(matrix), 0.0)
+    assert np.allclose(matrix, matrix.T)
+    assert matrix[0, 1] == pytest.approx(69.09, abs=0.01)
+    assert matrix[2, 3] == pytest.approx(2445, rel=0.01)
+
+
+def test_lookup_is_nan_for_unknown_stadiums(index):
+    miles = index.lookup(np.array(["Lambeau  Field", "Lambeau Field"]),
+                         np.array(["soldier field", "Arrowhead Stadium"]))
+
+    assert miles[0] == pytest.approx(183, abs=3)
+    assert np.isnan(miles[1])
+
+
+def test_distances_outside_the_tolerance_are_flagged(index):
+    check = DistanceCheck(index, flag=True)
+    sheet = distances_sheet([
+        ["Lambeau Field", "Soldier Field", 207],
+        ["Lambeau Field", "Soldier Field", 100],
+        ["Soldier Field", "Lambeau Field", 600],
+        ["Lambeau Field", "Arrowhead Stadium", 5000],
+    ])
+
+    _, filled, flags = check(sheet)
+
+    assert filled == 0
+    assert [flag["row"] for flag in flags] == [2, 3]
+    assert flags[0]["reason"] == "Distance 100 is 0.54x the 184 mi great-circle distance"
+
+
+def test_missing_distances_are_filled_from_the_great_circle_estimate(index):
+    check = DistanceCheck(index, fill=True)
+    sheet = distances_sheet([["Lambeau Field", "Soldier Field", None], ["Lambeau Field", "Soldier Field", 207]])
+
+    frame, filled, _ = check(sheet)
+
+    great_circle = index.lookup(np.array(["Lambeau Field"]), np.array(["Soldier Field"]))[0]
+    assert filled == 1
+    assert frame["Distance"].tolist() == [round(great_circle * DEFAULT_CIRCUITY), 207]
@@ -0,0 +1,39 @@
+from import_checkpoint import ImportCheckpoint
+
+
+def test_committed_offsets_are_loaded_for_the_same_file_and_settings(db):
+    checkpoint = ImportCheckpoint(db, 'distances', 'abc', {"circuity": 1.2})
+    checkpoint.commit({"Distances": 500, "Expansion": 20})
+
+    resumed = ImportCheckpoint(db, 'distances', 'abc', {"circuity": 1.2}).load()
+
+    assert resumed.offset("Distances") == 500
+    assert resumed.offset("Expansion") == 20
+    assert resumed.offset("Other") == 0
+    assert resumed.resumed_rows == 520
+
+
+def test_offsets_never_move_backwards(db):
+    checkpoint = ImportCheckpoint(db, 'distances', 'abc')
+    checkpoint.commit({"Distances": 500})
+    round_trips = checkpoint.round_trips
+    checkpoint.commit({"Distances": 300})
+
+    assert checkpoint.round_trips == round_trips
+    assert ImportCheckpoint(db, 'distances', 'abc').load().offset("Distances") == 500
+
+
+def test_checkpoint_of_another_file_or_settings_is_ignored(db):
+    ImportCheckpoint(db, 'distances', 'abc', {"circuity": 1.2}).commit({"Distances": 500})
+
+    assert ImportCheckpoint(db, 'distances', 'def', {"circuity": 1.2}).load().offsets == {}
+    assert ImportCheckpoint(db, 'distances', 'abc', {"circuity": 1.5}).load().offsets == {}
+
+
+def test_reset_forgets_the_checkpoint(db):
+    checkpoint = ImportCheckpoint(db, 'distances', 'abc')
+    checkpoint.commit({"Distances": 500})
+    checkpoint.reset()
+
+    assert checkpoint.offsets == {}
+    assert ImportCheckpoint(db, 'distances', 'abc').load().offsets == {}
@@ -0,0 +1,58 @@
+from import_manifest import ImportManifest
+
+KEY = ("teamName", "beginningStadium", "endingStadium")
+
+
+def record(team, begin, end, miles=100):
+    return {"teamName": team, "beginningStadium": begin, "endingStadium": end, "distance": miles}
+
+
+def previous_import(db, records_by_sheet):
+    manifest = ImportManifest(db, 'distances', KEY).load(records_by_sheet)
+    for sheet, records in records_by_sheet.items():
+        manifest.filter_changed(sheet, records)
+    manifest.save({sheet: f"hash-{sheet}" for sheet in records_by_sheet})
+
+
+def seed(db):
+    previous_import(db, {
+        "Distances": [record("Jets", "MetLife", "Gillette"), record("Jets", "MetLife", "Highmark")],
+        "Expansion": [record("Raiders", "Allegiant", "SoFi")],
+    })
+
+
+def test_missing_rows_are_kept_without_prune(db):
+    seed(db)
+    manifest = ImportManifest(db, 'distances', KEY).load(["Distances", "Expansion"])
+    manifest.filter_changed("Distances", [record("Jets", "MetLife", "Gillette")])
+
+    assert manifest.removed_keys() == []
+
+
+def test_prune_removes_rows_missing_from_a_sheet_in_the_file(db):
+    seed(db)
+    manifest = ImportManifest(db, 'distances', KEY, prune=True).load(["Distances", "Expansion"])
+    manifest.filter_changed("Distances", [record("Jets", "MetLife", "Gillette")])
+    manifest.filter_changed("Expansion", [record("Raiders", "Allegiant", "SoFi")])
+
+    assert manifest.removed_keys() == [("Jets", "MetLife", "Highmark")]
+
+
+def test_prune_leaves_sheets_the_file_does_not_have(db):
+    seed(db)
+    manifest = ImportManifest(db, 'distances', KEY, prune=True).load(["Distances"])
+    manifest.filter_changed("Distances", [record("Jets", "MetLife", "Gillette"), record("Jets", "MetLife", "Highmark")])
+
+    assert manifest.removed_keys() == []
+
+
+def test_unchanged_rows_are_filtered_out(db):
+    seed(db)
+    manifest = ImportManifest(db, 'distances', KEY).load(["Distances"])
+    changed, unchanged = manifest.filter_changed("Distances", [
+        record("Jets", "MetLife", "Gillette"),
+        record("Jets", "MetLife", "Highmark", miles=400),
+    ])
+
+    assert unchanged == 1
+    assert changed == [record("Jets", "MetLife", "Highmark", miles=400)]
@@ -0,0 +1,71 @@
+from bson import ObjectId
+
+from import_souvenirs import plan_souvenir_sync
+
+
+def souvenir(name, price, category="Apparel", traditional=False, _id=None):
+    item = {"name": name, "price": price, "category": category, "isTraditional": traditional}
+    if _id is not None:
+        item["_id"] = _id
+    return item
+
+
+def stored_team(db, *souvenirs):
+    team = {"_id": ObjectId(), "teamName": "Green Bay Packers", "souvenirs": list(souvenirs)}
+    db['teams'].insert_one(team)
+    return team
+
+
+def sync(db, team, souvenirs):
+    operations, counts = plan_souvenir_sync(team, souvenirs)
+    if operations:
+        db['teams'].bulk_write(operations, ordered=True)
+    return counts, db['teams'].find_one({"_id": team["_id"]})["souvenirs"]
+
+
+def test_new_souvenirs_are_pushed_with_their_own_id(db):
+    kept_id = ObjectId()
+    team = stored_team(db, souvenir("Cheesehead", 19.99, _id=kept_id))
+
+    counts, stored = sync(db, team, [
+        souvenir("Cheesehead", 19.99, _id=ObjectId()),
+        souvenir("Pennant", 9.99, "Collectibles", _id=ObjectId()),
+    ])
+
+    assert counts == {"added": 1, "updated": 0, "removed": 0, "unchanged": 1}
+    assert [item["name"] for item in stored] == ["Cheesehead", "Pennant"]
+    assert stored[0]["_id"] == kept_id
+
+
+def test_changed_souvenirs_are_updated_in_place_and_keep_their_id(db):
+    kept_id = ObjectId()
+    team = stored_team(db, souvenir("Cheesehead", 19.99, _id=kept_id))
+
+    counts, stored = sync(db, team, [souvenir("Cheesehead", 24.99, traditional=True, _id=ObjectId())])
+
+    assert counts == {"added": 0, "updated": 1, "removed": 0, "unchanged": 0}
+    assert stored == [souvenir("Cheesehead", 24.99, traditional=True, _id=kept_id)]
+
+
+def test_souvenirs_missing_from_the_sheet_and_duplicates_are_pulled(db):
+    kept_id = ObjectId()
+    team = stored_team(
+        db,
+        souvenir("Cheesehead", 19.99, _id=kept_id),
+        souvenir("Cheesehead", 19.99, _id=ObjectId()),
+        souvenir("Pennant", 9.99, "Collectibles", _id=ObjectId()),
+    )
+
+    counts, stored = sync(db, team, [souvenir("Cheesehead", 19.99, _id=ObjectId())])
+
+    assert counts == {"added": 0, "updated": 0, "removed": 2, "unchanged": 1}
+    assert [item["_id"] for item in stored] == [kept_id]
+
+
+def test_an_unchanged_sheet_plans_no_writes():
+    team = {"_id": ObjectId(), "souvenirs": [souvenir("Cheesehead", 19.99, _id=ObjectId())]}
+
+    operations, counts = plan_souvenir_sync(team, [souvenir("Cheesehead", 19.99, _id=ObjectId())])
+
+    assert operations == []
+    assert counts["unchanged"] == 1
@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+import import_teams
+
+COLUMNS = ["Team(s)", "Conference", "Division", "Name", "Location", "Capacity", "Surface", "Roof Type", "Opened"]
+ROWS = [
+    ["Green Bay Packers", "National Football Conference", "NFC North", "Lambeau Field",
+     "Green Bay, Wisconsin", 81441, "Grass", "Open", 1957],
+    ["Chicago Bears", "National Football Conference", "NFC North", "Soldier Field",
+     "Chicago, Illinois", 61500, "Grass", "Open", 1924],
+]
+
+
+@pytest.fixture
+def teams(db, monkeypatch):
+    monkeypatch.setattr(import_teams, "client", db.client)
+    monkeypatch.setattr(import_teams, "db", db)
+    monkeypatch.setattr(import_teams, "teams_collection", db['teams'])
+    return db['teams']
+
+
+def write_sheet(path, rows):
+    pd.DataFrame(rows, columns=COLUMNS).to_excel(path, sheet_name="Teams", index=False)
+    return str(path)
+
+
+def run_import(path, **options):
+    return import_teams.import_teams(path, use_cache=False, shortest_paths=False, **options)
+
+
+def test_reimporting_a_sheet_updates_teams_instead_of_duplicating_them(teams, tmp_path):
+    assert run_import(write_sheet(tmp_path / "teams.xlsx", ROWS))
+    souvenir_ids = [s["_id"] for s in teams.find_one({"teamName": "Green Bay Packers"})["souvenirs"]]
+
+    renovated = [row[:] for row in ROWS]
+    renovated[0][5] = 81500
+    assert run_import(write_sheet(tmp_path / "teams-renovated.xlsx", renovated))
+
+    assert teams.count_documents({}) == 2
+    packers = teams.find_one({"teamName": "Green Bay Packers"})
+    assert packers["stadium"]["seatingCapacity"] == 81500
+    assert [s["_id"] for s in packers["souvenirs"]] == souvenir_ids
+
+
+def test_a_full_reimport_of_the_same_sheet_keeps_one_document_per_team(teams, tmp_path):
+    path = write_sheet(tmp_path / "teams.xlsx", ROWS)
+    assert run_import(path)
+    assert run_import(path, full=True)
+
+    assert sorted(doc["teamName"] for doc in teams.find()) == ["Chicago Bears", "Green Bay Packers"]
@@ -0,0 +1,120 @@
+import io
+import json
+import threading
+
+import pytest
+
+import import_worker
+from import_worker import JobScheduler, handle_line, make_emitter
+
+
+class Protocol:
+    """Feeds JSON lines to the worker as stdin would and collects its replies."""
+
+    def __init__(self, max_queue=8):
+        self.output = io.StringIO()
+        self.emit = make_emitter(self.output)
+        self.scheduler = JobScheduler(max_queue=max_queue)
+
+    def send(self, *jobs):
+        for job in jobs:
+            line = job if isinstance(job, str) else json.dumps(job)
+            handle_line(line + '\n', self.scheduler, self.emit)
+
+    def events(self):
+        self.scheduler.join()
+        return [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+
+def echo_import(file_path, rows=0, progress=None):
+    print(f"Importing {file_path}")
+    progress.summary(success=True, rows=rows, inserted=rows)
+    return True
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    def register(name, function):
+        monkeypatch.setitem(import_worker.JOBS, name, (None, function))
+    return register
+
+
+def test_a_job_answers_with_queued_started_logs_and_done(jobs):
+    jobs('echo', echo_import)
+    protocol = Protocol()
+    protocol.send({"id": "7", "type": "echo", "file": "teams.xlsx", "options": {"rows": 3}})
+
+    events = protocol.events()
+    names = [event["event"] for event in events]
+
+    assert all(event["id"] == "7" for event in events)
+    assert names[:3] == ["queued", "started", "log"]
+    assert names[-1] == "done"
+    assert "progress" in names
+    assert events[2]["line"] == "Importing teams.xlsx"
+    done = events[-1]
+    assert done["success"] is True
+    assert done["output"] == "Importing teams.xlsx\n"
+    assert done["summary"]["inserted"] == 3
+
+
+def test_ping_is_answered_without_queueing():
+    protocol = Protocol()
+    protocol.send({"id": "1", "type": "ping"})
+
+    assert protocol.events() == [{"id": "1", "event": "pong"}]
+
+
+def test_invalid_json_and_unknown_types_are_rejected():
+    protocol = Protocol()
+    protocol.send("{not json", {"id": "2", "type": "stadiums"})
+
+    first, second = protocol.events()
+    assert first["event"] == "rejected"
+    assert first["error"].startswith("Invalid JSON")
+    assert second == {"id": "2", "event": "rejected", "error": "Unknown import type: 'stadiums'"}
+
+
+def test_failing_jobs_report_done_without_success(jobs):
+    def broken(file_path):
+        raise ValueError("sheet is empty")
+
+    def exits(file_path):
+        raise SystemExit(1)
+
+    jobs('broken', broken)
+    jobs('exits', exits)
+    protocol = Protocol()
+    protocol.send({"id": "a", "type": "broken", "file": "x.xlsx"}, {"id": "b", "type": "exits", "file": "x.xlsx"})
+
+    done = {event["id"]: event for event in protocol.events() if event["event"] == "done"}
+    assert done["a"]["success"] is False
+    assert "Import worker error: sheet is empty" in done["a"]["output"]
+    assert "ValueError" in done["a"]["errors"]
+    assert done["b"]["success"] is False
+    assert done["b"]["summary"] is None
+
+
+def test_jobs_beyond_the_queue_limit_are_rejected(jobs):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(file_path):
+        started.set()
+        release.wait(5)
+        return True
+
+    jobs('blocking', blocking)
+    protocol = Protocol(max_queue=1)
+    protocol.send({"id": "running", "type": "blocking", "file": "x.xlsx"})
+    assert started.wait(5)
+    protocol.send({"id": "waiting", "type": "blocking", "file": "x.xlsx"},
+                  {"id": "overflow", "type": "blocking", "file": "x.xlsx"})
+    release.set()
+
+    events = protocol.events()
+    rejected = [event for event in events if event["event"] == "rejected"]
+    done = [event["id"] for event in events if event["event"] == "done"]
+    assert [event["id"] for event in rejected] == ["overflow"]
+    assert rejected[0]["error"] == "Import queue is full, try again later"
+    assert done == ["running", "waiting"]
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from optimal_trips import MAX_ITINERARY_SIZE, MAX_SAVED_ITINERARIES, collect_team_sets, solve_set
+
+
+def path_cost(dist, order):
+    return sum(dist[a, b] for a, b in zip(order, order[1:]))
+
+
+def brute_force(dist, members, start):
+    rest = [node for node in members if node != start]
+    return min(path_cost(dist, (start, *order)) for order in permutations(rest))
+
+
+@pytest.fixture
+def dist():
+    rng = np.random.default_rng(7)
+    points = rng.uniform(0, 1000, size=(8, 2))
+    return np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+
+
+def test_every_start_matches_brute_force(dist):
+    members = list(range(7))
+    trips = solve_set(members, dist)
+
+    for start in members:
+        total, order = trips[start]
+        assert order[0] == start
+        assert sorted(order) == members
+        assert total == pytest.approx(path_cost(dist, order))
+        assert total == pytest.approx(brute_force(dist, members, start))
+
+
+def test_best_start_is_the_shortest_trip(dist):
+    members = [1, 3, 4, 6]
+    trips = solve_set(members, dist)
+
+    assert set(trips) == {1, 3, 4, 6, None}
+    assert trips[None][0] == pytest.approx(min(brute_force(dist, members, start) for start in members))
+
+
+def test_unreachable_member_has_no_trip():
+    dist = np.array([
+        [0.0, 5.0, np.inf],
+        [5.0, 0.0, np.inf],
+        [np.inf, np.inf, 0.0],
+    ])
+
+    assert solve_set([0, 1, 2], dist) == {}
+
+
+def test_only_explicitly_saved_itineraries_within_the_limits_are_solved(db):
+    now = datetime.now(timezone.utc)
+    db['saved_itineraries'].insert_many([
+        {"teams": ["A", "B"], "lastRequestedAt": now},
+        {"teams": [f"T{i}" for i in range(MAX_ITINERARY_SIZE + 1)], "savedAt": now},
+    ] + [
+        {"teams": ["A", f"T{i}"], "savedAt": now - timedelta(minutes=i)}
+        for i in range(MAX_SAVED_ITINERARIES + 5)
+    ])
+
+    itineraries = [names for kind, _, names in collect_team_sets(db, []) if kind == 'itinerary']
+
+    assert ["A", "B"] not in itineraries
+    assert len(itineraries) == MAX_SAVED_ITINERARIES - 1
+    assert itineraries[0] == ["A", "T0"]
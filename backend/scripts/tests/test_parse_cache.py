@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+
+from parse_cache import ParseCache
+from validation import validate_frame
+
+
+def parsed_souvenirs(sheet, rows):
+    frame = pd.DataFrame(rows, columns=["Team Name", "Souvenir Name", "Price", "Category", "Is Traditional"])
+    records, rejections = validate_frame(frame, "souvenirs")
+    return {
+        "sheet": sheet,
+        "columns": list(frame.columns),
+        "missing": [],
+        "rows": len(frame),
+        "records": records,
+        "rejections": rejections,
+    }
+
+
+SOUVENIRS = [
+    ["Green Bay Packers", "Cheesehead", 19.99, "Apparel", "yes"],
+    ["Green Bay Packers", "Pennant", "", "Collectibles", ""],
+    ["Chicago Bears", "Foam Finger", 14.5, "Accessories", "no"],
+]
+
+
+def test_stored_sheets_round_trip_through_npz(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path))
+    parsed = parsed_souvenirs("Souvenirs", SOUVENIRS)
+    cache.store("abc123", "souvenirs", parsed)
+
+    loaded = cache.load("abc123", "souvenirs", "Souvenirs")
+
+    assert os.path.exists(cache.path_for("abc123", "souvenirs", "Souvenirs"))
+    assert loaded["records"] == parsed["records"]
+    assert loaded["rejections"] == [{"row": 2, "reason": "Missing or non-numeric Price"}]
+    assert loaded["columns"] == parsed["columns"]
+    assert loaded["rows"] == 3
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_a_changed_content_hash_misses(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path))
+    cache.store("abc123", "souvenirs", parsed_souvenirs("Souvenirs", SOUVENIRS))
+
+    assert cache.load("def456", "souvenirs", "Souvenirs") is None
+    assert cache.load("abc123", "souvenirs", "Other Sheet") is None
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_eviction_removes_the_least_recently_used_files(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path))
+    for sheet in ("A", "B", "C"):
+        cache.store("abc123", "souvenirs", parsed_souvenirs(sheet, SOUVENIRS))
+    paths = {sheet: cache.path_for("abc123", "souvenirs", sheet) for sheet in ("A", "B", "C")}
+    for age, sheet in enumerate(("A", "B", "C"), start=1):
+        os.utime(paths[sheet], (age * 1000, age * 1000))
+
+    # Reading A makes it the most recently used, leaving B the oldest
+    assert cache.load("abc123", "souvenirs", "A") is not None
+    cache.max_bytes = os.path.getsize(paths["A"]) + os.path.getsize(paths["C"])
+
+    assert cache.evict() == 1
+    assert sorted(sheet for sheet, path in paths.items() if os.path.exists(path)) == ["A", "C"]
@@ -0,0 +1,50 @@
+import pytest
+
+from purchase_rollups import fold_rollups
+
+
+def group(session_id, souvenir_id, quantity, revenue, stadium="MetLife Stadium", team="New York Jets"):
+    return {
+        "_id": {
+            "sessionId": session_id,
+            "souvenirId": souvenir_id,
+            "stadiumName": stadium,
+            "teamName": team,
+            "category": "apparel",
+        },
+        "souvenirName": f"Souvenir {souvenir_id}",
+        "quantity": quantity,
+        "revenue": revenue,
+    }
+
+
+def test_groups_count_towards_their_session_and_all_sessions():
+    rows = fold_rollups(
+        [group("s1", "cap", 2, 40.0), group("s2", "cap", 1, 20.0)],
+        [{"_id": "s1", "purchases": 1, "revenue": 40.0}, {"_id": "s2", "purchases": 1, "revenue": 20.0}],
+    )
+
+    assert rows[("s1", "souvenir", "cap")]["quantity"] == 2
+    assert rows[("s2", "souvenir", "cap")]["quantity"] == 1
+    assert rows[(None, "souvenir", "cap")]["quantity"] == 3
+    assert rows[(None, "souvenir", "cap")]["revenue"] == pytest.approx(60.0)
+    assert rows[(None, "stadium", "MetLife Stadium")]["revenue"] == pytest.approx(60.0)
+    assert rows[("s1", "souvenir", "cap")]["labels"]["souvenirName"] == "Souvenir cap"
+
+
+def test_total_row_takes_revenue_from_the_purchase_totals():
+    rows = fold_rollups(
+        [group("s1", "cap", 2, 40.0), group("s1", "flag", 1, 10.0, stadium="Gillette Stadium", team="New England Patriots")],
+        [{"_id": "s1", "purchases": 2, "revenue": 52.5}],
+    )
+
+    total = rows[("s1", "total", None)]
+    assert total["quantity"] == 3
+    assert total["revenue"] == pytest.approx(52.5)
+    assert total["purchases"] == 2
+    assert rows[(None, "total", None)]["purchases"] == 2
+    assert rows[("s1", "team", "New England Patriots")]["quantity"] == 1
+
+
+def test_empty_window_folds_to_nothing():
+    assert fold_rollups([], []) == {}
@@ -0,0 +1,57 @@
+from bson import ObjectId
+
+import restore_default_souvenirs
+from restore_default_souvenirs import DEFAULT_SOUVENIRS, plan_restoration
+
+
+def defaults():
+    return [dict(souvenir, _id=ObjectId()) for souvenir in DEFAULT_SOUVENIRS]
+
+
+def test_teams_with_every_default_need_no_update():
+    souvenirs = defaults()
+
+    updated, restored, added = plan_restoration(souvenirs)
+
+    assert updated == souvenirs
+    assert (restored, added) == ([], [])
+
+
+def test_changed_defaults_are_restored_and_keep_their_id():
+    souvenirs = defaults()
+    jersey = souvenirs[-1]
+    jersey.update(price=149.99, isTraditional=False)
+
+    updated, restored, added = plan_restoration(souvenirs)
+
+    assert restored == [
+        ("Team jersey", "price", 149.99, 199.99),
+        ("Team jersey", "isTraditional", False, True),
+    ]
+    assert added == []
+    assert updated[-1] == dict(DEFAULT_SOUVENIRS[-1], _id=jersey["_id"])
+
+
+def test_missing_defaults_are_added_and_custom_souvenirs_kept():
+    custom = {"_id": ObjectId(), "name": "Cheesehead", "price": 19.99, "category": "Apparel", "isTraditional": False}
+    souvenirs = [custom] + defaults()[:2]
+
+    updated, restored, added = plan_restoration(souvenirs)
+
+    assert restored == []
+    assert added == ["Team pennant", "Team picture", "Team jersey"]
+    assert updated[0] == custom
+    assert [s["name"] for s in updated[3:]] == added
+    assert all(s["_id"] not in {d["_id"] for d in DEFAULT_SOUVENIRS} for s in updated[3:])
+
+
+def test_dry_run_writes_nothing(db, monkeypatch):
+    monkeypatch.setattr(restore_default_souvenirs, "client", db.client)
+    monkeypatch.setattr(restore_default_souvenirs, "teams_collection", db['teams'])
+    db['teams'].insert_one({"teamName": "Green Bay Packers", "souvenirs": []})
+
+    assert restore_default_souvenirs.restore_default_souvenirs(dry_run=True)
+    assert db['teams'].find_one()["souvenirs"] == []
+
+    assert restore_default_souvenirs.restore_default_souvenirs()
+    assert [s["name"] for s in db['teams'].find_one()["souvenirs"]] == [s["name"] for s in DEFAULT_SOUVENIRS]
@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from validation import validate_frame
+
+
+def teams_sheet(**overrides):
+    row = {
+        "Team(s)": "Green Bay Packers",
+        "Conference": "National Football Conference",
+        "Division": "NFC North",
+        "Name": "Lambeau Field",
+        "Location": "Green Bay, Wisconsin",
+        "Capacity": 81441,
+        "Surface": "Grass",
+        "Roof Type": "Open",
+        "Opened": 1957,
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def souvenirs_sheet(rows):
+    return pd.DataFrame(rows, columns=["Team Name", "Souvenir Name", "Price", "Category"])
+
+
+def test_a_missing_required_column_raises_key_error():
+    with pytest.raises(KeyError, match="Name"):
+        validate_frame(teams_sheet().drop(columns=["Name"]), "teams")
+
+
+def test_rows_with_an_empty_required_field_are_rejected():
+    records, rejections = validate_frame(teams_sheet(**{"Team(s)": "   "}), "teams")
+
+    assert records == []
+    assert rejections == [{"row": 1, "reason": "Missing Team(s)"}]
+
+
+def test_numeric_text_is_coerced_and_blank_optional_cells_use_the_default():
+    sheet = pd.concat([
+        teams_sheet(Capacity="81441", Opened=1957),
+        teams_sheet(**{"Team(s)": "Chicago Bears", "Capacity": "", "Opened": None}),
+    ], ignore_index=True)
+
+    records, rejections = validate_frame(sheet, "teams")
+
+    assert rejections == []
+    assert [r["seatingCapacity"] for r in records] == [81441, 0]
+    assert [r["yearOpened"] for r in records] == [1957, 0]
+
+
+def test_unparseable_optional_numbers_are_rejected_not_defaulted():
+    records, rejections = validate_frame(teams_sheet(Capacity="70,000"), "teams")
+
+    assert records == []
+    assert rejections == [{"row": 1, "reason": "Invalid capacity '70,000'. Must be a number"}]
+
+
+def test_required_prices_must_be_positive_numbers():
+    sheet = souvenirs_sheet([
+        ["Green Bay Packers", "Cheesehead", "free", "Apparel"],
+        ["Green Bay Packers", "Pennant", -5, "Collectibles"],
+    ])
+
+    records, rejections = validate_frame(sheet, "souvenirs")
+
+    assert records == []
+    assert [r["reason"] for r in rejections] == [
+        "Missing or non-numeric Price",
+        "Price must be greater than 0",
+    ]
+
+
+def test_category_and_roof_type_are_matched_case_insensitively():
+    souvenirs, _ = validate_frame(
+        souvenirs_sheet([["Green Bay Packers", "Cheesehead", 19.99, "apparel"]]), "souvenirs")
+    teams, _ = validate_frame(teams_sheet(**{"Roof Type": "retractable"}), "teams")
+
+    assert souvenirs[0]["category"] == "Apparel"
+    assert teams[0]["roofType"] == "Retractable"
+
+
+def test_values_outside_the_enums_are_rejected():
+    _, souvenir_rejections = validate_frame(
+        souvenirs_sheet([["Green Bay Packers", "Cheesehead", 19.99, "Toys"]]), "souvenirs")
+    _, team_rejections = validate_frame(teams_sheet(**{"Roof Type": "Glass"}), "teams")
+
+    assert souvenir_rejections[0]["reason"].startswith("Invalid category 'Toys'")
+    assert team_rejections[0]["reason"].startswith("Invalid roof type 'Glass'")
+
+
+def test_rejections_report_the_one_based_data_row():
+    sheet = souvenirs_sheet([
+        ["Green Bay Packers", "Cheesehead", 19.99, "Apparel"],
+        ["Green Bay Packers", "", 9.99, "Apparel"],
+        ["Green Bay Packers", "Foam Finger", 14.99, "Accessories"],
+        ["", "Pennant", 4.99, "Collectibles"],
+    ])
+
+    records, rejections = validate_frame(sheet, "souvenirs")
+
+    assert [r["name"] for r in records] == ["Cheesehead", "Foam Finger"]
+    assert [r["row"] for r in rejections] == [2, 4]
@@ -0,0 +1,26 @@
+from openpyxl import Workbook
+
+from workbook_reader import iter_sheets, read_sheet
+
+
+def write_workbook(path):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = 'Distances'
+    worksheet.append(['Team Name', 'Distance'])
+    worksheet.append(['New York Jets', 215])
+    worksheet.append([None, None])
+    worksheet.append([None, None])
+    worksheet.append(['New England Patriots', 215])
+    worksheet.append(['Buffalo Bills', 300])
+    workbook.save(path)
+    return path
+
+
+def test_blank_rows_keep_their_sheet_position(tmp_path):
+    path = str(write_workbook(tmp_path / 'distances.xlsx'))
+
+    for stream in (True, False):
+        (_, _, frames), = iter_sheets(path, stream=stream, chunk_size=2)
+        assert [index for frame in frames for index in frame.index] == [0, 3, 4]
+    assert list(read_sheet(path, 'Distances')[1].index) == [0, 3, 4]
@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+
+VALID_CATEGORIES = ['Apparel', 'Accessories', 'Collectibles', 'Food & Beverage']
+VALID_ROOF_TYPES = ['Open', 'Dome', 'Retractable']
+TRUTHY_STRINGS = {'true', 'yes', 'y', '1', 'x'}
+
+# Column schema per import type. Each entry maps a spreadsheet column (matched
+# after stripping whitespace from the header) to a document field:
+#   kind      - 'str', 'float', 'int' or 'bool'
+#   required  - reject the row when the cleaned value is empty / not a number
+#   positive  - reject the row unless the number is > 0
+#   choices   - allowed values (matched case-insensitively, stored canonically)
+#   default   - value used when an optional cell is empty
+SCHEMAS = {
+    'teams': [
+        {'column': 'Team(s)', 'field': 'teamName', 'kind': 'str', 'required': True},
+        {'column': 'Conference', 'field': 'conference', 'kind': 'str', 'required': True},
+        {'column': 'Division', 'field': 'division', 'kind': 'str', 'required': True},
+        {'column': 'Name', 'field': 'stadiumName', 'kind': 'str', 'required': True},
+        {'column': 'Location', 'field': 'location', 'kind': 'str', 'default': ''},
+        {'column': 'Capacity', 'field': 'seatingCapacity', 'kind': 'int', 'default': 0},
+        {'column': 'Surface', 'field': 'surfaceType', 'kind': 'str', 'default': ''},
+        {'column': 'Roof Type', 'field': 'roofType', 'kind': 'str', 'default': '', 'choices': VALID_ROOF_TYPES},
+        {'column': 'Opened', 'field': 'yearOpened', 'kind': 'int', 'default': 0},
+    ],
+    'distances': [
+        {'column': 'Team Name', 'field': 'teamName', 'kind': 'str', 'default': '', 'optional_column': True},
+        {'column': 'Beginning Stadium', 'field': 'beginningStadium', 'kind': 'str', 'required': True},
+        {'column': 'Ending Stadium', 'field': 'endingStadium', 'kind': 'str', 'required': True},
+        {'column': 'Distance', 'field': 'distance', 'kind': 'float', 'required': True, 'positive': True},
+    ],
+    'souvenirs': [
+        {'column': 'Team Name', 'field': 'teamName', 'kind': 'str', 'required': True},
+        {'column': 'Souvenir Name', 'field': 'name', 'kind': 'str', 'required': True},
+        {'column': 'Price', 'field': 'price', 'kind': 'float', 'required': True, 'positive': True},
+        {'column': 'Category', 'field': 'category', 'kind': 'str', 'required': True, 'choices': VALID_CATEGORIES},
+        {'column': 'Is Traditional', 'field': 'isTraditional', 'kind': 'bool', 'default': False, 'optional_column': True},
+    ],
+}
+
+
+def required_columns(import_type):
+    return [spec['column'] for spec in SCHEMAS[import_type] if not spec.get('optional_column')]
+
+
+def missing_columns(columns, import_type):
+    present = {str(c).strip() for c in columns}
+    return [c for c in required_columns(import_type) if c not in present]
+
+
+def _clean_str(series):
+    # Strip each distinct value once; spreadsheet columns repeat heavily
+    codes, uniques = pd.factorize(series)
+    cleaned = np.array([str(value).strip() for value in uniques] + [''], dtype=object)
+    return pd.Series(cleaned[codes], index=series.index, dtype=object)
+
+
+def _canonicalize(values, choices):
+    canonical = {choice.casefold(): choice for choice in choices}
+    codes, uniques = pd.factorize(values)
+    mapped = np.array([canonical.get(value.casefold()) for value in uniques] + [None], dtype=object)
+    return pd.Series(mapped[codes], index=values.index, dtype=object)
+
+
+def _clean_bool(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_numeric_dtype(series):
+        return series.fillna(0) != 0
+    codes, uniques = pd.factorize(series)
+    truthy = np.array([str(value).strip().casefold() in TRUTHY_STRINGS for value in uniques] + [False])
+    return pd.Series(truthy[codes], index=series.index)
+
+
+def validate_frame(df, import_type):
+    """Clean and validate a sheet with whole-column operations.
+
+    Returns ``(records, rejections)`` where ``records`` is a list of documents
+    keyed by schema field name and ``rejections`` is a list of
+    ``{'row': n, 'reason': str}`` entries (``n`` is the 1-based data row).
+    Raises ``KeyError`` when a required column is missing from the sheet.
+    """
+    schema = SCHEMAS[import_type]
+    df = df.rename(columns=lambda c: str(c).strip())
+
+    missing = missing_columns(df.columns, import_type)
+    if missing:
+        raise KeyError(', '.join(missing))
+
+    clean = pd.DataFrame(index=df.index)
+    reasons = pd.Series(pd.NA, index=df.index, dtype='object')
+
+    def reject(mask, message):
+        nonlocal reasons
+        reasons = reasons.mask(reasons.isna() & mask, message)
+
+    for spec in schema:
+        field = spec['field']
+        column = spec['column']
+        kind = spec['kind']
+
+        if column not in df.columns:
+            clean[field] = spec.get('default')
+            continue
+
+        raw = df[column]
+        if kind == 'str':
+            values = _clean_str(raw)
+            if spec.get('required'):
+                reject(values == '', f"Missing {column}")
+            if spec.get('choices'):
+                mapped = _canonicalize(values, spec['choices'])
+                reject((values != '') & mapped.isna(),
+                       f"Invalid {column.lower()} '" + values + f"'. Must be one of: {', '.join(spec['choices'])}")
+                values = mapped.fillna(values)
+            clean[field] = values
+        elif kind in ('float', 'int'):
+            values = pd.to_numeric(raw, errors='coerce')
+            if spec.get('required'):
+                reject(values.isna(), f"Missing or non-numeric {column}")
+            elif not pd.api.types.is_numeric_dtype(raw):
+                # Only empty cells fall back to the default; text that fails
+                # to parse (e.g. '70,000') is rejected rather than zeroed
+                text = _clean_str(raw)
+                reject((text != '') & values.isna(),
+                       f"Invalid {column.lower()} '" + text + "'. Must be a number")
+            if spec.get('positive'):
+                reject(values.notna() & (values <= 0), f"{column} must be greater than 0")
+            values = values.fillna(spec.get('default', 0))
+            clean[field] = values.astype('int64') if kind == 'int' else values.astype('float64')
+        elif kind == 'bool':
+            clean[field] = _clean_bool(raw)
+
+    valid = reasons.isna()
+    fields = list(clean.columns)
+    columns = [clean.loc[valid, field].tolist() for field in fields]
+    records = [dict(zip(fields, row)) for row in zip(*columns)]
+    rejected = reasons.loc[~valid]
+    rejections = [
+        {'row': int(index) + 1, 'reason': reason}
+        for index, reason in zip(rejected.index, rejected.tolist())
+    ]
+    return records, rejections
+
+
+def iter_validated(frames, import_type, progress=None, prepare=None):
+    """Validate a stream of DataFrames, yielding ``(row_count, records, rejections)``.
+
+    With a ``progress`` reporter, reading each frame is timed as ``parse`` and
+    validating it as ``validate``. ``prepare`` (if given) is applied to each
+    raw frame before it is validated.
+    """
+    if progress is not None:
+        frames = progress.timed_iter('parse', frames)
+    for frame in frames:
+        if prepare is not None:
+            frame = prepare(frame)
+        if progress is None:
+            records, rejections = validate_frame(frame, import_type)
+        else:
+            with progress.phase('validate', rows=len(frame)):
+                records, rejections = validate_frame(frame, import_type)
+        yield len(frame), records, rejections
+
+
+def report_rejections(rejections, limit=20):
+    for rejection in rejections[:limit]:
+        print(f"⚠️ Skipping row {rejection['row']}: {rejection['reason']}", flush=True)
+    if len(rejections) > limit:
+        print(f"   ... and {len(rejections) - limit} more rejected rows", flush=True)
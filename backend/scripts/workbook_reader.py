@@ -0,0 +1,211 @@
+import os
+import pandas as pd
+from openpyxl import load_workbook
+from validation import SCHEMAS
+
+# Rows per DataFrame handed to validation when streaming
+DEFAULT_CHUNK_SIZE = 5000
+
+# CSV and Parquet files hold one table, imported as a single sheet of this name
+FLAT_FILE_SHEET = 'Sheet1'
+FLAT_FORMATS = {'.csv': 'csv', '.parquet': 'parquet'}
+
+
+def file_format(file_path):
+    return FLAT_FORMATS.get(os.path.splitext(file_path)[1].lower(), 'xlsx')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def _flat_header(file_path, fmt):
+    if fmt == 'csv':
+        return list(pd.read_csv(file_path, nrows=0).columns)
+    if _pyarrow() is None:
+        raise RuntimeError(f"Reading {file_path} needs pyarrow (pip install pyarrow)")
+    import pyarrow.parquet as pq
+    return list(pq.read_schema(file_path).names)
+
+
+def _column_plan(header, import_type):
+    """Return ``(usecols, dtypes)``: only the schema's columns, text columns read as str.
+
+    Numeric columns keep the reader's own typing so a stray non-numeric cell
+    is rejected row by row in validation instead of failing the whole file.
+    """
+    if import_type is None:
+        return None, None
+    kinds = {spec['column']: spec['kind'] for spec in SCHEMAS[import_type]}
+    usecols = [column for column in header if str(column).strip() in kinds]
+    dtypes = {column: str for column in usecols if kinds[str(column).strip()] == 'str'}
+    return usecols, dtypes
+
+
+def _read_flat_frame(file_path, fmt, usecols, dtypes):
+    if fmt == 'csv':
+        # pyarrow's multithreaded CSV parser when installed, pandas' C parser otherwise
+        engine = 'pyarrow' if _pyarrow() is not None else 'c'
+        return pd.read_csv(file_path, usecols=usecols, dtype=dtypes, engine=engine)
+    return pd.read_parquet(file_path, columns=usecols)
+
+
+def _stream_flat_frames(file_path, fmt, usecols, dtypes, chunk_size):
+    # Index keeps counting across chunks so rejection row numbers match the file
+    if fmt == 'csv':
+        with pd.read_csv(file_path, usecols=usecols, dtype=dtypes, chunksize=chunk_size) as reader:
+            for frame in reader:
+                yield frame.rename(columns=lambda c: str(c).strip())
+        return
+    import pyarrow.parquet as pq
+    offset = 0
+    for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=usecols):
+        frame = batch.to_pandas()
+        frame.index = range(offset, offset + len(frame))
+        offset += len(frame)
+        yield frame.rename(columns=lambda c: str(c).strip())
+
+
+def read_flat_file(file_path, import_type=None, stream=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Read a .csv or .parquet file as ``(columns, frames)``.
+
+    ``columns`` is the file's full header (for missing-column reports) while the
+    frames hold only the columns ``import_type``'s schema uses. In-memory mode
+    yields one DataFrame, streaming mode one per ``chunk_size`` rows.
+    """
+    fmt = file_format(file_path)
+    header = _flat_header(file_path, fmt)
+    columns = [str(column).strip() for column in header]
+    usecols, dtypes = _column_plan(header, import_type)
+    if stream:
+        return columns, _stream_flat_frames(file_path, fmt, usecols, dtypes, chunk_size)
+    frame = _read_flat_frame(file_path, fmt, usecols, dtypes)
+    return columns, iter([frame.rename(columns=lambda c: str(c).strip())])
+
+
+def _header_names(header_row):
+    return [
+        str(value).strip() if value is not None else f"Unnamed: {position}"
+        for position, value in enumerate(header_row)
+    ]
+
+
+def _data_rows(rows, width):
+    """Yield ``(position, values)`` for the non-blank rows after the header.
+
+    ``position`` counts blank rows too, so it is the row's index among the
+    sheet's data rows and rejection row numbers match the sheet.
+    """
+    for position, row in enumerate(rows):
+        if any(value is not None for value in row):
+            yield position, row[:width]
+
+
+def _stream_frames(rows, columns, chunk_size):
+    # Index keeps the sheet position across chunks
+    positions = []
+    chunk = []
+    for position, row in _data_rows(rows, len(columns)):
+        positions.append(position)
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield pd.DataFrame(chunk, columns=columns, index=positions)
+            positions = []
+            chunk = []
+    if chunk:
+        yield pd.DataFrame(chunk, columns=columns, index=positions)
+
+
+def iter_sheets_streaming(file_path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_names=None):
+    """Yield ``(sheet_name, columns, frames)`` using openpyxl's read-only mode.
+
+    Each sheet is parsed exactly once and ``frames`` lazily yields DataFrames
+    of at most ``chunk_size`` rows, so peak memory is bounded by the chunk size
+    rather than by the workbook size.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet_name in (workbook.sheetnames if sheet_names is None else sheet_names):
+            worksheet = workbook[sheet_name]
+            rows = worksheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                yield worksheet.title, [], iter(())
+                continue
+            columns = _header_names(header)
+            yield worksheet.title, columns, _stream_frames(rows, columns, chunk_size)
+    finally:
+        workbook.close()
+
+
+def iter_sheets_in_memory(file_path, sheet_names=None):
+    """Yield ``(sheet_name, columns, frames)`` with every sheet loaded by pandas.
+
+    The workbook is parsed once for all sheets; ``frames`` yields a single
+    DataFrame holding the whole sheet.
+    """
+    if sheet_names is not None and not sheet_names:
+        return
+    sheets = pd.read_excel(file_path, sheet_name=None if sheet_names is None else list(sheet_names))
+    for sheet_name, df in sheets.items():
+        # Blank rows are skipped as in streaming mode; the index keeps the sheet position
+        df = df.dropna(how='all').rename(columns=lambda c: str(c).strip())
+        yield sheet_name, list(df.columns), iter([df])
+
+
+def iter_flat_sheets(file_path, stream=False, chunk_size=DEFAULT_CHUNK_SIZE, sheet_names=None, import_type=None):
+    """Yield the single ``(sheet_name, columns, frames)`` of a .csv/.parquet file."""
+    if sheet_names is not None and FLAT_FILE_SHEET not in sheet_names:
+        return
+    columns, frames = read_flat_file(file_path, import_type, stream=stream, chunk_size=chunk_size)
+    yield FLAT_FILE_SHEET, columns, frames
+
+
+def list_sheet_names(file_path):
+    if file_format(file_path) != 'xlsx':
+        return [FLAT_FILE_SHEET]
+    workbook = load_workbook(file_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def read_sheet(file_path, sheet_name, import_type=None):
+    """Parse a single sheet in read-only mode, returning ``(columns, DataFrame)``."""
+    if file_format(file_path) != 'xlsx':
+        columns, frames = read_flat_file(file_path, import_type)
+        return columns, next(frames)
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return [], pd.DataFrame()
+        columns = _header_names(header)
+        data = list(_data_rows(rows, len(columns)))
+        return columns, pd.DataFrame([row for _, row in data], columns=columns,
+                                     index=[position for position, _ in data])
+    finally:
+        workbook.close()
+
+
+def read_frame(file_path, sheet_name, import_type=None):
+    """Load one whole sheet (or a whole .csv/.parquet file) with pandas."""
+    if file_format(file_path) != 'xlsx':
+        return read_sheet(file_path, sheet_name, import_type)[1]
+    return pd.read_excel(file_path, sheet_name=sheet_name)
+
+
+def iter_sheets(file_path, stream=False, chunk_size=DEFAULT_CHUNK_SIZE, sheet_names=None, import_type=None):
+    if file_format(file_path) != 'xlsx':
+        return iter_flat_sheets(file_path, stream=stream, chunk_size=chunk_size, sheet_names=sheet_names,
+                                import_type=import_type)
+    if stream:
+        return iter_sheets_streaming(file_path, chunk_size=chunk_size, sheet_names=sheet_names)
+    return iter_sheets_in_memory(file_path, sheet_names=sheet_names)
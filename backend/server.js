@@ -1,11 +1,37 @@
 require('dotenv').config();
 
 const app = require('./app');
+const { importWorker } = require('./utils/importWorker');
 
 const PORT = process.env.PORT || 3001;
+// Minutes between purchase rollup runs; 0 turns the schedule off
+const ROLLUP_INTERVAL_MINUTES = Number(process.env.PURCHASE_ROLLUP_INTERVAL_MINUTES ?? 5);
+
+/**
+ * Folds new completed purchases into purchase_rollups on a fixed interval,
+ * so the purchases summarizeSession reads one by one stay a short tail
+ * @returns {void}
+ */
+const schedulePurchaseRollups = () => {
+    if (!(ROLLUP_INTERVAL_MINUTES > 0)) {
+        return;
+    }
+    const runRollups = () => {
+        importWorker.run('purchase_rollups').then(result => {
+            if (!result.success) {
+                console.error('Purchase rollup run failed:', result.errors || result.output);
+            }
+        }).catch(error => {
+            console.error('Purchase rollup run failed:', error.message);
+        });
+    };
+    runRollups();
+    setInterval(runRollups, ROLLUP_INTERVAL_MINUTES * 60 * 1000).unref();
+};
 
 app.listen(PORT, () => {
     console.log(`Server is running on http://localhost:${PORT}`);
+    schedulePurchaseRollups();
 });
 
 module.exports = { port: PORT, server: app };
\ No newline at end of file
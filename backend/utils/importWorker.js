@@ -0,0 +1,188 @@
+/**
+ * @fileoverview Client for the long-lived Python import worker
+ * @module importWorker
+ */
+
+const { spawn } = require('child_process');
+const path = require('path');
+const fs = require('fs');
+const readline = require('readline');
+
+const SCRIPTS_DIR = path.join(__dirname, '..', 'scripts');
+
+/**
+ * Runs import jobs in one warm `import_worker.py` process instead of
+ * spawning a new interpreter per upload. The worker is started lazily,
+ * restarted if it exits, and queues jobs behind its own bounded scheduler.
+ *
+ * @class ImportWorker
+ */
+class ImportWorker {
+    /**
+     * Creates a new ImportWorker instance
+     * @param {Object} [options]
+     * @param {string} [options.scriptsDir] - Directory containing import_worker.py
+     * @param {number} [options.maxQueue] - Jobs allowed to wait before new ones are rejected
+     * @constructor
+     */
+    constructor({ scriptsDir = SCRIPTS_DIR, maxQueue = parseInt(process.env.IMPORT_WORKER_MAX_QUEUE || '8', 10) } = {}) {
+        /** @type {string} Directory containing the Python scripts */
+        this.scriptsDir = scriptsDir;
+        /** @type {number} Maximum number of queued jobs */
+        this.maxQueue = maxQueue;
+        /** @type {ChildProcess|null} Running worker process */
+        this.child = null;
+        /** @type {Promise|null} Resolves once the worker reports it is ready */
+        this.ready = null;
+        /** @type {Map<string, Object>} Pending jobs by id */
+        this.jobs = new Map();
+        /** @type {number} Counter used for job ids */
+        this.nextId = 1;
+    }
+
+    /**
+     * Path to the Python interpreter (the scripts venv if present)
+     * @returns {string}
+     * @private
+     */
+    _pythonCommand() {
+        const venvPython = path.join(this.scriptsDir, 'venv', 'bin', 'python3');
+        return fs.existsSync(venvPython) ? venvPython : 'python3';
+    }
+
+    /**
+     * Starts the worker process if it is not already running
+     * @returns {Promise<void>} Resolves when the worker is ready for jobs
+     */
+    start() {
+        if (this.ready) {
+            return this.ready;
+        }
+
+        const env = {
+            ...process.env,
+            MONGODB_URI: process.env.MONGODB_URI || 'mongodb://localhost:27017/'
+        };
+        const child = spawn(
+            this._pythonCommand(),
+            ['import_worker.py', '--max-queue', String(this.maxQueue)],
+            { cwd: this.scriptsDir, env, stdio: ['pipe', 'pipe', 'pipe'] }
+        );
+        this.child = child;
+
+        this.ready = new Promise((resolve, reject) => {
+            readline.createInterface({ input: child.stdout }).on('line', (line) => {
+                let event;
+                try {
+                    event = JSON.parse(line);
+                } catch (error) {
+                    console.error('Import worker sent invalid output:', line);
+                    return;
+                }
+                if (event.event === 'ready') {
+                    console.log(`Import worker ${event.pid} ready`);
+                    resolve();
+                    return;
+                }
+                this._handleEvent(event);
+            });
+
+            readline.createInterface({ input: child.stderr }).on('line', (line) => {
+                console.error('Import worker:', line);
+            });
+
+            child.on('error', (error) => {
+                if (this.child === child) {
+                    this._reset(error);
+                }
+                reject(error);
+            });
+
+            child.on('exit', (code, signal) => {
+                const error = new Error(`Import worker exited (${signal || code})`);
+                if (this.child === child) {
+                    this._reset(error);
+                }
+                reject(error);
+            });
+        });
+
+        return this.ready;
+    }
+
+    /**
+     * Runs one import job
+     * @param {string} type - Import type ('teams', 'distances', 'souvenirs', 'restore_souvenirs', 'purchase_rollups')
+     * @param {string} [filePath] - Path of the file to import
+     * @param {Object} [options] - Keyword options passed to the Python import function
+     * @returns {Promise<{success: boolean, output: string, errors: string, elapsed: number}>}
+     * @throws {Error} With code 'IMPORT_QUEUE_FULL' when the worker rejects the job
+     */
+    async run(type, filePath, options = {}) {
+        await this.start();
+
+        const id = String(this.nextId++);
+        return new Promise((resolve, reject) => {
+            this.jobs.set(id, { resolve, reject });
+            const job = { id, type, file: filePath, options };
+            this.child.stdin.write(JSON.stringify(job) + '\n');
+        });
+    }
+
+    /**
+     * Stops the worker after the jobs it already accepted have finished
+     * @returns {void}
+     */
+    stop() {
+        if (this.child) {
+            this.child.stdin.end();
+        }
+    }
+
+    /**
+     * Routes a worker event to the job it belongs to
+     * @param {Object} event - Parsed JSON event
+     * @returns {void}
+     * @private
+     */
+    _handleEvent(event) {
+        const job = this.jobs.get(event.id);
+        if (!job) {
+            return;
+        }
+
+        if (event.event === 'done') {
+            this.jobs.delete(event.id);
+            job.resolve(event);
+        } else if (event.event === 'rejected') {
+            this.jobs.delete(event.id);
+            const error = new Error(event.error);
+            error.code = event.error.includes('queue is full') ? 'IMPORT_QUEUE_FULL' : 'IMPORT_REJECTED';
+            job.reject(error);
+        }
+    }
+
+    /**
+     * Fails every pending job and allows the next run() to start a new worker
+     * @param {Error} error - Reason the worker stopped
+     * @returns {void}
+     * @private
+     */
+    _reset(error) {
+        this.child = null;
+        this.ready = null;
+        for (const job of this.jobs.values()) {
+            job.reject(error);
+        }
+        this.jobs.clear();
+    }
+}
+
+/** @type {ImportWorker} Shared worker used by the admin import endpoint */
+const importWorker = new ImportWorker();
+
+/**
+ * Exports the worker class and the shared instance
+ * @module
+ */
+module.exports = { ImportWorker, importWorker };
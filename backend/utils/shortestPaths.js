@@ -0,0 +1,187 @@
+/**
+ * @fileoverview Reader for the all-pairs shortest paths precomputed by scripts/shortest_paths.py
+ * @module shortestPaths
+ */
+
+const SHORTEST_PATHS_COLLECTION = 'shortest_paths';
+const META_ID = 'current';
+
+/**
+ * Reads the count and newest updatedAt of teams and distances, the same
+ * signature scripts/shortest_paths.py stores with the matrices
+ * @param {Db} db - Native MongoDB database handle
+ * @returns {Promise<Object>} Signature per collection
+ * @private
+ */
+const readGraphSignature = async (db) => {
+    const signature = {};
+    for (const name of ['teams', 'distances']) {
+        const collection = db.collection(name);
+        const [count, latest] = await Promise.all([
+            collection.countDocuments({}),
+            collection.findOne(
+                { updatedAt: { $exists: true } },
+                { projection: { updatedAt: 1 }, sort: { updatedAt: -1 } }
+            )
+        ]);
+        signature[name] = { count, updatedAt: latest ? latest.updatedAt : null };
+    }
+    return signature;
+};
+
+/**
+ * Whether two graph signatures describe the same teams and distances
+ * @param {Object} stored - Signature saved with the matrices
+ * @param {Object} live - Signature of the current collections
+ * @returns {boolean}
+ * @private
+ */
+const sameSignature = (stored, live) => ['teams', 'distances'].every(name => {
+    const a = stored[name];
+    const b = live[name];
+    if (!a || a.count !== b.count) {
+        return false;
+    }
+    const aTime = a.updatedAt ? new Date(a.updatedAt).getTime() : null;
+    const bTime = b.updatedAt ? new Date(b.updatedAt).getTime() : null;
+    return aTime === bTime;
+});
+
+/**
+ * Shortest paths from a set of source teams, answered from the precomputed
+ * matrices in the same shape as GraphService.runDijkstra()
+ *
+ * @class PrecomputedPaths
+ */
+class PrecomputedPaths {
+    /**
+     * Creates a new PrecomputedPaths instance
+     * @param {Object} meta - The `current` meta document (nodes, version)
+     * @param {Array<Object>} rows - One row per loaded source team
+     * @constructor
+     */
+    constructor(meta, rows) {
+        /** @type {Array<string>} Team names indexed by matrix position */
+        this.nodes = meta.nodes;
+        /** @type {Map<string, number>} Team name to matrix position */
+        this.nameToIndex = new Map(meta.nodes.map((name, index) => [name, index]));
+        /** @type {Map<string, Object>} Loaded rows by source team */
+        this.rows = new Map(rows.map(row => [row.source, row]));
+    }
+
+    /**
+     * Loads the rows of the given source teams, or returns null when there
+     * are no precomputed paths or the teams or distances changed since they
+     * were computed, in which case callers run Dijkstra themselves
+     * @param {Db} db - Native MongoDB database handle
+     * @param {Array<string>} sources - Teams paths will start from
+     * @returns {Promise<PrecomputedPaths|null>}
+     */
+    static async load(db, sources) {
+        const collection = db.collection(SHORTEST_PATHS_COLLECTION);
+        const [meta, live] = await Promise.all([
+            collection.findOne({ _id: META_ID }),
+            readGraphSignature(db)
+        ]);
+        if (!meta || !meta.graph || !sameSignature(meta.graph, live)) {
+            return null;
+        }
+
+        const rows = await collection
+            .find({ version: meta.version, source: { $in: [...new Set(sources)] } })
+            .toArray();
+        return new PrecomputedPaths(meta, rows);
+    }
+
+    /**
+     * Walks the predecessor row back from a target to the source
+     * @param {Object} row - Row of the source team
+     * @param {number} targetIndex - Matrix position of the target
+     * @returns {Array<string>} Team names from source to target, empty when unreachable
+     * @private
+     */
+    pathTo(row, targetIndex) {
+        const path = [targetIndex];
+        let current = targetIndex;
+        while (current !== row.index) {
+            current = row.predecessors[current];
+            if (current < 0 || path.length > this.nodes.length) {
+                return [];
+            }
+            path.push(current);
+        }
+        return path.reverse().map(index => this.nodes[index]);
+    }
+
+    /**
+     * Shortest paths from a loaded source team, shaped like GraphService.runDijkstra()
+     * @param {string} startTeamName - Name of the starting team (must be one of the loaded sources)
+     * @param {string|null} [endTeamName=null] - Optional end team name for single destination
+     * @returns {Object} Result object with distances, paths, discoveryEdges, visitOrder and totalDistance
+     * @throws {Error} If startTeamName is not found
+     */
+    runDijkstra(startTeamName, endTeamName = null) {
+        const row = this.rows.get(startTeamName);
+        if (!row) {
+            throw new Error(`Team "${startTeamName}" not found`);
+        }
+
+        const result = {
+            algorithm: 'DIJKSTRA',
+            startCity: startTeamName,
+            distances: {},
+            paths: {},
+            discoveryEdges: [],
+            visitOrder: [],
+            totalDistance: 0
+        };
+        // Along a shortest path, each edge is the difference of the distances to its ends
+        const edgeTo = (from, to) => ({
+            from,
+            to,
+            distance: Math.round((row.distances[this.nameToIndex.get(to)] - row.distances[this.nameToIndex.get(from)]) * 100) / 100
+        });
+
+        if (endTeamName) {
+            const endIndex = this.nameToIndex.get(endTeamName);
+            const distance = endIndex === undefined ? null : row.distances[endIndex];
+            if (distance !== null) {
+                const path = this.pathTo(row, endIndex);
+                result.path = path;
+                result.paths[endTeamName] = path;
+                result.distances[endTeamName] = distance;
+                result.visitOrder = [...path];
+                for (let i = 1; i < path.length; i++) {
+                    result.discoveryEdges.push(edgeTo(path[i - 1], path[i]));
+                }
+                result.totalDistance = distance;
+            }
+            return result;
+        }
+
+        const reachable = [];
+        row.distances.forEach((distance, index) => {
+            if (distance === null) {
+                return;
+            }
+            const name = this.nodes[index];
+            reachable.push({ name, distance });
+            result.distances[name] = distance;
+            result.paths[name] = this.pathTo(row, index);
+            const previous = row.predecessors[index];
+            if (previous >= 0) {
+                result.discoveryEdges.push(edgeTo(this.nodes[previous], name));
+            }
+        });
+        reachable.sort((a, b) => a.distance - b.distance);
+        result.visitOrder = reachable.map(node => node.name);
+        result.totalDistance = result.discoveryEdges.reduce((sum, edge) => sum + edge.distance, 0);
+        return result;
+    }
+}
+
+/**
+ * Exports the reader and the collection it reads
+ * @module
+ */
+module.exports = { PrecomputedPaths, SHORTEST_PATHS_COLLECTION };
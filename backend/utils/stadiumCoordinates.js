@@ -1,39 +1,40 @@
-// Stadium coordinates (SVG pixel coordinates from map)
-// These represent the visual positions of teams on the map
-// Used for A* heuristic calculation
+// Stadium coordinates
+// x/y: SVG pixel positions of teams on the map, used for A* heuristic calculation
+// lat/lng: geographic stadium locations, used by the Python importers for
+// great-circle distance checks (scripts/geo.py)
 const stadiumCoordinates = {
-    "Minnesota Vikings": { x: 718, y: 166 },
-    "Green Bay Packers": { x: 803, y: 175 },
-    "Chicago Bears": { x: 814, y: 247 },
-    "Indianapolis Colts": { x: 852, y: 269 },
-    "Detroit Lions": { x: 891, y: 203 },
-    "Cleveland Browns": { x: 920, y: 238 },
-    "Pittsburgh Steelers": { x: 965, y: 245 },
-    "Buffalo Bills": { x: 977, y: 187 },
-    "New England Patriots": { x: 1099, y: 172 },
-    "New York Giants": { x: 1054, y: 219 },
-    "Philadelphia Eagles": { x: 1036, y: 237 },
-    "New York Jets": { x: 1054, y: 219 },
-    "Baltimore Ravens": { x: 1014, y: 260 },
-    "Washington Commanders": { x: 1004, y: 285 },
-    "Carolina Panthers": { x: 967, y: 366 },
-    "Atlanta Falcons": { x: 897, y: 414 },
-    "Cincinnati Bengals": { x: 891, y: 285 },
-    "Tennessee Titans": { x: 837, y: 370 },
-    "Kansas City Chiefs": { x: 706, y: 299 },
-    "Dallas Cowboys": { x: 648, y: 448 },
-    "Houston Texans": { x: 680, y: 537 },
-    "New Orleans Saints": { x: 784, y: 522 },
-    "Tampa Bay Buccaneers": { x: 968, y: 548 },
-    "Jacksonville Jaguars": { x: 966, y: 502 },
-    "Miami Dolphins": { x: 1004, y: 600 },
-    "Arizona Cardinals": { x: 367, y: 406 },
-    "Los Angeles Chargers": { x: 252, y: 373 },
-    "San Francisco 49ers": { x: 199, y: 279 },
-    "Las Vegas Raiders": { x: 313, y: 334 },
-    "Los Angeles Rams": { x: 252, y: 373 },
-    "Seattle Seahawks": { x: 262, y: 52 },
-    "Denver Broncos": { x: 635, y: 455 },
+    "Minnesota Vikings": { x: 718, y: 166, lat: 44.9737, lng: -93.2575 },
+    "Green Bay Packers": { x: 803, y: 175, lat: 44.5013, lng: -88.0622 },
+    "Chicago Bears": { x: 814, y: 247, lat: 41.8623, lng: -87.6167 },
+    "Indianapolis Colts": { x: 852, y: 269, lat: 39.7601, lng: -86.1639 },
+    "Detroit Lions": { x: 891, y: 203, lat: 42.3400, lng: -83.0456 },
+    "Cleveland Browns": { x: 920, y: 238, lat: 41.5061, lng: -81.6995 },
+    "Pittsburgh Steelers": { x: 965, y: 245, lat: 40.4468, lng: -80.0158 },
+    "Buffalo Bills": { x: 977, y: 187, lat: 42.7738, lng: -78.7870 },
+    "New England Patriots": { x: 1099, y: 172, lat: 42.0909, lng: -71.2643 },
+    "New York Giants": { x: 1054, y: 219, lat: 40.8135, lng: -74.0745 },
+    "Philadelphia Eagles": { x: 1036, y: 237, lat: 39.9008, lng: -75.1675 },
+    "New York Jets": { x: 1054, y: 219, lat: 40.8135, lng: -74.0745 },
+    "Baltimore Ravens": { x: 1014, y: 260, lat: 39.2780, lng: -76.6227 },
+    "Washington Commanders": { x: 1004, y: 285, lat: 38.9077, lng: -76.8645 },
+    "Carolina Panthers": { x: 967, y: 366, lat: 35.2258, lng: -80.8528 },
+    "Atlanta Falcons": { x: 897, y: 414, lat: 33.7554, lng: -84.4008 },
+    "Cincinnati Bengals": { x: 891, y: 285, lat: 39.0955, lng: -84.5161 },
+    "Tennessee Titans": { x: 837, y: 370, lat: 36.1665, lng: -86.7713 },
+    "Kansas City Chiefs": { x: 706, y: 299, lat: 39.0489, lng: -94.4839 },
+    "Dallas Cowboys": { x: 648, y: 448, lat: 32.7473, lng: -97.0945 },
+    "Houston Texans": { x: 680, y: 537, lat: 29.6847, lng: -95.4107 },
+    "New Orleans Saints": { x: 784, y: 522, lat: 29.9511, lng: -90.0812 },
+    "Tampa Bay Buccaneers": { x: 968, y: 548, lat: 27.9759, lng: -82.5033 },
+    "Jacksonville Jaguars": { x: 966, y: 502, lat: 30.3239, lng: -81.6373 },
+    "Miami Dolphins": { x: 1004, y: 600, lat: 25.9580, lng: -80.2389 },
+    "Arizona Cardinals": { x: 367, y: 406, lat: 33.5276, lng: -112.2626 },
+    "Los Angeles Chargers": { x: 252, y: 373, lat: 33.9535, lng: -118.3392 },
+    "San Francisco 49ers": { x: 199, y: 279, lat: 37.4030, lng: -121.9700 },
+    "Las Vegas Raiders": { x: 313, y: 334, lat: 36.0909, lng: -115.1833 },
+    "Los Angeles Rams": { x: 252, y: 373, lat: 33.9535, lng: -118.3392 },
+    "Seattle Seahawks": { x: 262, y: 52, lat: 47.5952, lng: -122.3316 },
+    "Denver Broncos": { x: 635, y: 455, lat: 39.7439, lng: -105.0201 },
 };
 
 module.exports = { stadiumCoordinates };
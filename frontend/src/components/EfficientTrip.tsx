@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { useCalculateRecursiveRouteMutation } from "../store/apis/algorithmApi";
+import { useCalculateRecursiveRouteMutation, useSaveItineraryMutation } from "../store/apis/algorithmApi";
 import { useAddToCartMutation } from '../store/apis/purchaseApi';
 import { useGetAllTeamsQuery } from '../store/apis/teamsApi';
 import type { Team } from '../store/types/teamTypes';
@@ -17,6 +17,8 @@ function EfficientTrip() {
     const [routeError, setRouteError] = useState<string | null>(null);
     const [calculateRoute, { data: routeData, isLoading: isCalculating, reset }] =
         useCalculateRecursiveRouteMutation();
+    const [saveItinerary, { isLoading: isSaving, isSuccess: isSaved, reset: resetSave }] =
+        useSaveItineraryMutation();
 
     const [addToCart] = useAddToCartMutation();
     const [showCartNotification, setShowCartNotification] = useState(false);
@@ -63,6 +65,15 @@ function EfficientTrip() {
         }
     };
 
+    const handleSaveItinerary = async () => {
+        try {
+            await saveItinerary({ teamIds: addedTeams.map(team => team._id) }).unwrap();
+        } catch (error: any) {
+            const errorMessage = error.data?.error || 'Failed to save itinerary. Please try again.';
+            setRouteError(errorMessage);
+        }
+    };
+
     const handleAddToCart = async (souvenirId: string, quantity: number, event?: React.MouseEvent<HTMLButtonElement>) => {
         try {
             await addToCart({ souvenirId, quantity }).unwrap();
@@ -98,6 +109,7 @@ function EfficientTrip() {
         setAddedTeams([]);
         setRouteError(null);
         reset?.();
+        resetSave?.();
     };
 
     if (isLoading) {
@@ -222,7 +234,15 @@ function EfficientTrip() {
                         totalDistance={routeData.data.totalDistance}
                         teamCount={routeData.data.teamCount}
                     />
-                    <div className="mt-4">
+                    <div className="mt-4 flex flex-row gap-4">
+                        <Button
+                            ternary
+                            rounded
+                            onClick={handleSaveItinerary}
+                            disabled={isSaving || isSaved}
+                        >
+                            {isSaved ? 'ITINERARY SAVED' : 'SAVE ITINERARY'}
+                        </Button>
                         <Button
                             ternary
                             rounded
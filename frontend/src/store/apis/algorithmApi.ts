@@ -1,6 +1,6 @@
 import { createApi, fetchBaseQuery } from '@reduxjs/toolkit/query/react';
 import { API_BASE_URL } from '../../config/api';
-import type { AlgorithmData, CustomRouteRequest, CustomRouteResponse, RecursiveRouteResponse } from '../types/algorithmTypes';
+import type { AlgorithmData, CustomRouteRequest, CustomRouteResponse, RecursiveRouteResponse, SaveItineraryRequest, SaveItineraryResponse } from '../types/algorithmTypes';
 
 interface AlgorithmResponse {
     success: boolean;
@@ -57,8 +57,17 @@ export const algorithmApi = createApi({
                 body: body?.teamIds ? { teamIds: body.teamIds } : undefined,
             }),
             invalidatesTags: ['Algorithm'],
+        }),
+
+      //save itinerary endpoint (its optimal trip is precomputed after the next import)
+        saveItinerary: builder.mutation<SaveItineraryResponse, SaveItineraryRequest>({
+            query: (body) => ({
+                url: '/itineraries',
+                method: 'POST',
+                body,
+            }),
         })
     }),
 });
 
-export const { useGetAlgorithmDataQuery, useCalculateCustomRouteMutation, useCalculateRecursiveRouteMutation } = algorithmApi;
\ No newline at end of file
+export const { useGetAlgorithmDataQuery, useCalculateCustomRouteMutation, useCalculateRecursiveRouteMutation, useSaveItineraryMutation } = algorithmApi;
\ No newline at end of file
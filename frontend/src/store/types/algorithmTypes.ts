@@ -67,4 +67,17 @@ export interface RecursiveRouteData {
 export interface RecursiveRouteResponse {
     success: boolean;
     data: RecursiveRouteData; 
-}
\ No newline at end of file
+}
+
+export interface SaveItineraryRequest {
+    teamIds: string[];
+    name?: string;
+}
+
+export interface SaveItineraryResponse {
+    success: boolean;
+    data: {
+        setKey: string;
+        teams: string[];
+    };
+}